@@ -0,0 +1,77 @@
+"""Encode and decode time of every installed serializer on realistic payloads.
+
+Decodes a large `documents` listing page (nested signers, lists and events)
+and wraps it in `Document` models, and encodes the body of a template
+document creation.
+
+Run with `python -m benchmarks.bench_json` from the repository root.
+"""
+import json
+from timeit import default_timer as timer
+from typing import Dict
+
+from clicksign_api_wrapper.document import Document
+from clicksign_api_wrapper.serialization import (available_serializers,
+                                                 get_serializer)
+
+from .payloads import documents_payload
+
+
+def template_body(fields: int) -> Dict:
+    return {
+        'document': {
+            'path': '/contracts/2021/contract.docx',
+            'template': {
+                'data': {
+                    f'field_{index}': f'Value {index} with ação'
+                    for index in range(fields)
+                }
+            }
+        }
+    }
+
+
+def best_of(func, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = timer()
+        func()
+        samples.append(timer() - start)
+    return min(samples)
+
+
+def compare(documents: int = 1000, rounds: int = 20) -> Dict:
+    listing = json.dumps(documents_payload(documents)).encode('utf-8')
+    body = template_body(200)
+    results = {}
+    for name in available_serializers():
+        serializer = get_serializer(name)
+
+        def decode():
+            return [
+                Document(None, {'document': metadata})
+                for metadata in serializer.loads(listing)['documents']
+            ]
+
+        results[name] = {
+            'listing_bytes': len(listing),
+            'decode_ms': best_of(decode, rounds) * 1000,
+            'encode_ms': best_of(lambda: serializer.dumps(body), rounds * 50) *
+            1000,
+        }
+    return results
+
+
+def main(documents: int = 1000):
+    results = compare(documents)
+    baseline = results['json']
+    for name, result in results.items():
+        print(f'{name:>8}: decode {documents} documents in '
+              f'{result["decode_ms"]:.2f} ms '
+              f'(x{baseline["decode_ms"] / result["decode_ms"]:.1f}), '
+              f'encode a template body in {result["encode_ms"]:.3f} ms '
+              f'(x{baseline["encode_ms"] / result["encode_ms"]:.1f})')
+
+
+if __name__ == '__main__':
+    main()
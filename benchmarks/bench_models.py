@@ -0,0 +1,50 @@
+"""Construction time and memory of the models over a large `documents` payload.
+
+Compares the slotted models with the previous implementation, which copied
+every field onto the instance `__dict__` with `setattr`.
+
+Run with `python -m benchmarks.bench_models` from the repository root.
+"""
+import tracemalloc
+from timeit import default_timer as timer
+
+from clicksign_api_wrapper.document import Document
+
+from .payloads import documents_payload
+
+
+class SetattrDocument:
+    def __init__(self, click_sign, metadata):
+        self.metadata = metadata
+        self.key = None
+        for key, item in metadata["document"].items():
+            setattr(self, key, item)
+        self.click_sign = click_sign
+
+
+def build(model, documents):
+    return [model(None, {'document': metadata}) for metadata in documents]
+
+
+def measure(model, documents):
+    start = timer()
+    build(model, documents)
+    elapsed = timer() - start
+    tracemalloc.start()
+    objects = build(model, documents)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return elapsed, size
+
+
+def main(count: int = 20000):
+    documents = documents_payload(count)['documents']
+    for label, model in (('setattr', SetattrDocument), ('slots', Document)):
+        elapsed, size = measure(model, documents)
+        print(f'{label:>8}: {count} documents built in {elapsed * 1000:.1f} ms,'
+              f' {size / 1024 / 1024:.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
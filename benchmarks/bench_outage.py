@@ -0,0 +1,109 @@
+"""Worker threads during an outage, with and without adaptive timeouts and a circuit breaker.
+
+A pool of worker threads serves a mix of `check_token` calls (a healthy
+endpoint) and `get_document` calls while the stub makes `documents` hang.
+With one fixed timeout every `get_document` holds its thread for the whole
+hang, so the healthy calls queue up behind them. With adaptive timeouts the
+hanging calls give up after a few times the usual latency, and once the
+circuit opens they fail at once, keeping the threads free.
+
+Run with `python -m benchmarks.bench_outage` from the repository root.
+"""
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer as timer
+from typing import Dict
+
+from clicksign_api_wrapper.circuit_breaker import CircuitBreaker
+from clicksign_api_wrapper.clicksign import ClickSign
+from clicksign_api_wrapper.timeouts import EndpointTimeouts
+
+from .stub_server import StubServer
+
+
+def run(server: StubServer, client: ClickSign, workers: int,
+        warmup: float, duration: float, hang: float) -> Dict:
+    """Send calls from `workers` threads, starting an outage after `warmup` seconds.
+    """
+    lock = threading.Lock()
+    outcomes = Counter()
+    busy = Counter()
+    stop = threading.Event()
+
+    def work(index: int):
+        call = 0
+        while not stop.is_set():
+            call += 1
+            name, func = (('get_document', lambda: client.get_document('doc'))
+                          if (index + call) % 2 else
+                          ('check_token', client.check_token))
+            start = timer()
+            try:
+                func()
+                outcome = 'ok'
+            except Exception as error:
+                outcome = type(error).__name__
+            elapsed = timer() - start
+            with lock:
+                outcomes[name, outcome] += 1
+                busy[name] += elapsed
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index in range(workers):
+            executor.submit(work, index)
+        stop.wait(warmup)
+        with lock:
+            outcomes.clear()
+            busy.clear()
+        server.start_outage('documents', hang=hang)
+        stop.wait(duration)
+        with lock:
+            results = {
+                'outcomes': {
+                    f'{name} {outcome}': count
+                    for (name, outcome), count in sorted(outcomes.items())
+                },
+                'thread_seconds': {
+                    name: round(seconds, 2)
+                    for name, seconds in busy.items()
+                },
+            }
+        stop.set()
+        server.end_outages()
+    return results
+
+
+def main(workers: int = 8,
+         warmup: float = 1,
+         duration: float = 5,
+         hang: float = 3):
+    clients = {
+        'fixed timeout':
+        lambda: ClickSign('token', timeout=10, pool_maxsize=workers),
+        'adaptive + breaker':
+        lambda: ClickSign('token',
+                          pool_maxsize=workers,
+                          timeouts=EndpointTimeouts(adaptive=True,
+                                                    min_read=0.2),
+                          circuit_breaker=CircuitBreaker(recovery_time=1)),
+    }
+    with StubServer(latency=0.005) as server:
+        for label, build in clients.items():
+            with build() as client:
+                client._url = server.url
+                results = run(server, client, workers, warmup, duration,
+                              hang)
+            healthy = results['outcomes'].get('check_token ok', 0)
+            print(f'{label:>18}: {healthy / duration:.0f} healthy calls/s '
+                  f'during the outage')
+            print(f'{"":>18}  outcomes {results["outcomes"]}')
+            print(f'{"":>18}  thread seconds {results["thread_seconds"]}')
+            states = (client.circuit_breaker.states()
+                      if client.circuit_breaker is not None else {})
+            if states:
+                print(f'{"":>18}  circuits {states}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Per call latency with and without the pooled session.
+
+Run with `python -m benchmarks.bench_pool` from the repository root.
+"""
+import statistics
+from timeit import default_timer as timer
+
+from clicksign_api_wrapper.clicksign import ClickSign
+
+from .stub_server import StubServer
+
+
+def measure(client: ClickSign, calls: int):
+    latencies = []
+    for _ in range(calls):
+        start = timer()
+        client.check_token()
+        latencies.append(timer() - start)
+    return latencies
+
+
+def main(calls: int = 500):
+    with StubServer() as server:
+        for label, keep_alive in (('pooled', True), ('no keep-alive', False)):
+            with ClickSign('token', keep_alive=keep_alive) as client:
+                client._url = server.url
+                latencies = measure(client, calls)
+            print(f'{label:>14}: mean {statistics.mean(latencies) * 1000:.3f} ms'
+                  f'  median {statistics.median(latencies) * 1000:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Sustained throughput of N worker processes sharing one FileTokenBucket.
+
+Run with `python -m benchmarks.bench_rate_limit` from the repository root.
+"""
+import multiprocessing
+import os
+import tempfile
+from timeit import default_timer as timer
+
+from clicksign_api_wrapper.clicksign import ClickSign
+from clicksign_api_wrapper.rate_limit import FileTokenBucket
+
+from .stub_server import StubServer
+
+
+def worker(url: str, path: str, rate: float, duration: float, counts):
+    limiter = FileTokenBucket(path, rate, capacity=1)
+    with ClickSign('token', rate_limiter=limiter) as client:
+        client._url = url
+        done = 0
+        end = timer() + duration
+        while timer() < end:
+            client.check_token()
+            done += 1
+    counts.put(done)
+
+
+def main(processes: int = 4, rate: float = 100, duration: float = 5):
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bucket')
+        counts = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=worker,
+                                    args=(server.url, path, rate, duration,
+                                          counts)) for _ in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        total = sum(counts.get() for _ in workers)
+        for process in workers:
+            process.join()
+    print(f'{processes} processes, limit {rate:.0f} req/s: '
+          f'{total / duration:.1f} req/s sustained')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Synthetic ClickSign payloads shaped like the real API responses.
+"""
+from typing import Dict
+
+
+def signer_payload(index: int) -> Dict:
+    return {
+        'key': f'signer-{index:08d}',
+        'email': f'signer{index}@example.com',
+        'auths': ['email'],
+        'name': f'Signer {index}',
+        'documentation': '123.321.123-40',
+        'birthday': '1983-03-31',
+        'phone_number': None,
+        'has_documentation': True,
+        'created_at': '2021-03-04T10:58:30.123-03:00',
+    }
+
+
+def document_payload(index: int, signers: int = 2, events: int = 4) -> Dict:
+    key = f'document-{index:08d}'
+    return {
+        'key': key,
+        'path': f'/contracts/{index % 12 + 1:02d}/contract-{index}.docx',
+        'filename': f'contract-{index}.docx',
+        'uploaded_at': '2021-03-04T10:58:30.123-03:00',
+        'updated_at': '2021-03-04T11:02:10.456-03:00',
+        'finished_at': None,
+        'deadline_at': '2021-04-03T10:58:30.123-03:00',
+        'status': 'running',
+        'auto_close': True,
+        'locale': 'pt-BR',
+        'sequence_enabled': False,
+        'remind_interval': None,
+        'downloads': {
+            'original_file_url': f'https://example.com/{key}/original.pdf',
+            'signed_file_url': None,
+        },
+        'template': {
+            'key': 'template-0001',
+            'data': {
+                'name': f'Customer {index}'
+            }
+        },
+        'signers': [
+            signer_payload(index * signers + number)
+            for number in range(signers)
+        ],
+        'lists': [{
+            'key': f'list-{index}-{number}',
+            'request_signature_key': f'request-{index}-{number}',
+            'document_key': key,
+            'signer_key': f'signer-{index * signers + number:08d}',
+            'sign_as': 'sign',
+            'created_at': '2021-03-04T10:58:30.123-03:00',
+            'updated_at': '2021-03-04T10:58:30.123-03:00',
+        } for number in range(signers)],
+        'events': [{
+            'name': 'add_signer',
+            'data': {
+                'user': {
+                    'email': 'owner@example.com'
+                }
+            },
+            'occurred_at': '2021-03-04T10:58:30.123-03:00',
+        } for _ in range(events)],
+    }
+
+
+def documents_payload(count: int, page: int = 1) -> Dict:
+    return {
+        'documents': [document_payload(index) for index in range(count)],
+        'page_infos': {
+            'current_page': page,
+            'next_page': None,
+        },
+    }
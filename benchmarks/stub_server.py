@@ -0,0 +1,391 @@
+"""Local stub of the ClickSign v1 API used by the benchmarks.
+
+It answers every endpoint the client uses (`accounts`, `documents` listing
+and upload, `templates/{key}`, `templates/{key}/documents`, `signers`,
+`lists`, `batches`, `sign`, `documents/{key}/finish` and
+`documents/{key}/cancel`) with payloads shaped like the real ones, and serves the document files with `Range`
+support. POSTs with an already seen `Idempotency-Key` get the first response
+again. Latency, error rate and payload sizes are configurable, and outages of
+some endpoints can be started and ended at any time.
+"""
+import base64
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .payloads import document_payload, signer_payload
+
+ROUTES = []
+
+
+def route(method: str, pattern: str):
+    def register(func):
+        ROUTES.append((method, re.compile(f'^/api/v1/{pattern}$'), func))
+        return func
+
+    return register
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Buffer headers and body into a single write per response
+    wbufsize = -1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload, headers: dict = None):
+        if isinstance(payload, bytes):
+            body, content_type = payload, 'application/octet-stream'
+        else:
+            body = json.dumps(payload).encode('utf-8')
+            content_type = 'application/json'
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        try:
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, Ex.: its read timeout expired
+            self.close_connection = True
+
+    def _injected_failure(self) -> bool:
+        """Answer with the next queued failure status or a random error, if any.
+        """
+        server = self.server
+        with server.lock:
+            if server.failures:
+                status = server.failures.pop(0)
+            elif server.error_rate and random.random() < server.error_rate:
+                status = random.choice(server.error_statuses)
+            else:
+                return False
+        headers = {}
+        if status in (429, 503) and server.retry_after is not None:
+            headers['Retry-After'] = str(server.retry_after)
+        self._send(status, {'errors': ['injected failure']}, headers)
+        return True
+
+    def _outage(self, path: str) -> bool:
+        """Hang and/or fail the requests to the paths of an ongoing outage.
+        """
+        for pattern, hang, status in list(self.server.outages):
+            if pattern.search(path):
+                if hang:
+                    time.sleep(hang)
+                if status is not None:
+                    self._send(status, {'errors': ['simulated outage']})
+                    return True
+        return False
+
+    def _body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _dispatch(self):
+        url = urlsplit(self.path)
+        body = self._body()
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency +
+                       random.uniform(0, self.server.latency_jitter))
+        if self._outage(url.path):
+            return
+        if self._injected_failure():
+            return
+        for method, pattern, func in ROUTES:
+            match = pattern.match(url.path)
+            if match and method == self.command:
+                query = {
+                    name: values[-1]
+                    for name, values in parse_qs(url.query).items()
+                }
+                # Passed with the query so routes keep the same signature
+                query['range'] = self.headers.get('Range')
+                idempotency_key = self.headers.get('Idempotency-Key')
+                with self.server.lock:
+                    replay = self.server.idempotent.get(idempotency_key)
+                if replay is not None:
+                    self._send(*replay)
+                    return
+                status, payload, *headers = func(self.server, body, query,
+                                                 *match.groups())
+                if self.command == 'POST':
+                    with self.server.lock:
+                        self.server.mutations += 1
+                        if idempotency_key:
+                            self.server.idempotent[idempotency_key] = (
+                                status, payload)
+                self._send(status, payload, *headers)
+                return
+        self._send(404, {'errors': ['not found']})
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+
+@route('GET', 'accounts')
+def account(server, body, query):
+    return 200, {'account': {'key': 'stub-account'}}
+
+
+@route('GET', 'documents')
+def list_documents(server, body, query):
+    page = int(query.get('page', 1))
+    pages = max(1, -(-server.documents // server.page_size))
+    first = (page - 1) * server.page_size
+    last = min(server.documents, first + server.page_size)
+    documents = [
+        document_payload(index, server.signers, server.events)
+        for index in range(first, last)
+    ]
+    return 200, {
+        'documents': documents,
+        'page_infos': {
+            'current_page': page,
+            'next_page': page + 1 if page < pages else None,
+        },
+    }
+
+
+@route('POST', 'documents')
+def upload_document(server, body, query):
+    content = body['document'].pop('content_base64')
+    header, encoded = content.split(',', 1)
+    document = document_payload(next(server.counter), signers=0, events=1)
+    document.update(body['document'],
+                    filename=body['document']['path'].rsplit('/', 1)[-1])
+    document['size'] = len(base64.b64decode(encoded, validate=True))
+    return 201, {'document': document}
+
+
+@route('GET', 'documents/([^/]+)')
+def get_document(server, body, query, key):
+    document = document_payload(0, server.signers, server.events)
+    document['key'] = key
+    document['downloads'] = {
+        f'{kind}_file_url': f'{server.base_url}files/{key}/{kind}'
+        for kind in ('original', 'signed', 'ziped')
+    }
+    return 200, {'document': document}
+
+
+@route('PATCH', 'documents/([^/]+)')
+def config_document(server, body, query, key):
+    document = document_payload(0, server.signers, server.events)
+    document.update(body, key=key)
+    return 200, {'document': document}
+
+
+@route('PATCH', 'documents/([^/]+)/(finish|cancel)')
+def change_document_status(server, body, query, key, action):
+    document = document_payload(0, server.signers, server.events)
+    document.update(key=key,
+                    status='closed' if action == 'finish' else 'canceled')
+    return 200, {'document': document}
+
+
+@route('DELETE', 'documents/([^/]+)')
+def delete_document(server, body, query, key):
+    return 200, {}
+
+
+def file_content(key: str, kind: str, size: int) -> bytes:
+    pattern = hashlib.sha256(f'{key}/{kind}'.encode('utf-8')).digest()
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+
+@route('GET', 'files/([^/]+)/([a-z]+)')
+def download_file(server, body, query, key, kind):
+    """A document file, with an MD5 `ETag` and `Range` support like S3."""
+    content = file_content(key, kind, server.file_size)
+    headers = {
+        'ETag': '"' + hashlib.md5(content).hexdigest() + '"',
+        'Accept-Ranges': 'bytes'
+    }
+    match = re.match(r'^bytes=(\d+)-$', query.get('range') or '')
+    if not match:
+        return 200, content, headers
+    start = int(match.group(1))
+    if start >= len(content):
+        return 416, {'errors': ['range not satisfiable']}
+    headers['Content-Range'] = f'bytes {start}-{len(content) - 1}/{len(content)}'
+    return 206, content[start:], headers
+
+
+@route('GET', 'templates/([^/]+)')
+def get_template(server, body, query, template_key):
+    return 200, {
+        'template': {
+            'key': template_key,
+            'name': 'Contract',
+            'fields': ['name', 'cpf', 'amount']
+        }
+    }
+
+
+@route('POST', 'templates/([^/]+)/documents')
+def create_document(server, body, query, template_key):
+    index = next(server.counter)
+    document = document_payload(index, signers=0, events=1)
+    document.update(path=body['document']['path'],
+                    template={
+                        'key': template_key,
+                        'data': body['document']['template']['data']
+                    })
+    return 201, {'document': document}
+
+
+@route('POST', 'signers')
+def create_signer(server, body, query):
+    signer = signer_payload(next(server.counter))
+    signer.update(
+        {name: value
+         for name, value in body['signer'].items() if value is not None})
+    return 201, {'signer': signer}
+
+
+@route('GET', 'signers/([^/]+)')
+def get_signer(server, body, query, key):
+    signer = signer_payload(0)
+    signer['key'] = key
+    return 200, {'signer': signer}
+
+
+@route('POST', 'lists')
+def add_signer(server, body, query):
+    index = next(server.counter)
+    item = dict(body['list'],
+                key=f'list-{index:08d}',
+                request_signature_key=f'request-{index:08d}')
+    return 201, {'list': item}
+
+
+@route('DELETE', 'lists/([^/]+)')
+def remove_signer(server, body, query, key):
+    return 200, {}
+
+
+@route('POST', 'batches')
+def create_batch(server, body, query):
+    batch = dict(body['batch'], key=f'batch-{next(server.counter):08d}')
+    return 201, {'batch': batch}
+
+
+@route('POST', 'sign')
+def sign(server, body, query):
+    return 200, {}
+
+
+class StubServer:
+    """Run the stub in a background thread.
+
+    Use it as a context manager, `url` is the base url to pass to the client.
+    The first requests are answered with the statuses in `failures`, in order.
+    """
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 failures: list = None,
+                 retry_after: float = None,
+                 latency: float = 0,
+                 latency_jitter: float = 0,
+                 error_rate: float = 0,
+                 error_statuses: tuple = (500, 502, 503),
+                 documents: int = 100,
+                 page_size: int = 20,
+                 signers: int = 2,
+                 events: int = 4,
+                 file_size: int = 256 * 1024):
+        """Class constructor
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to '127.0.0.1'.
+            port (int, optional): Port to listen on, `0` picks a free one. Defaults to 0.
+            failures (list, optional): Statuses returned, in order, to the first requests. Defaults to None.
+            retry_after (float, optional): `Retry-After` sent with 429 and 503. Defaults to None.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+            latency_jitter (float, optional): Max random seconds added on top of `latency`. Defaults to 0.
+            error_rate (float, optional): Fraction of requests answered with one of `error_statuses`. Defaults to 0.
+            error_statuses (tuple, optional): Statuses used for random errors. Defaults to (500, 502, 503).
+            documents (int, optional): Documents in the `documents` listing. Defaults to 100.
+            page_size (int, optional): Documents per listing page. Defaults to 20.
+            signers (int, optional): Signers and lists per document. Defaults to 2.
+            events (int, optional): Events per document. Defaults to 4.
+            file_size (int, optional): Size of the downloadable document files. Defaults to 256 * 1024.
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.counter = itertools.count(1)
+        self.httpd.requests = 0
+        self.httpd.mutations = 0
+        self.httpd.idempotent = {}
+        self.httpd.failures = list(failures or [])
+        self.httpd.outages = []
+        self.httpd.retry_after = retry_after
+        self.httpd.latency = latency
+        self.httpd.latency_jitter = latency_jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.error_statuses = tuple(error_statuses)
+        self.httpd.documents = documents
+        self.httpd.page_size = page_size
+        self.httpd.signers = signers
+        self.httpd.events = events
+        self.httpd.file_size = file_size
+        self.httpd.base_url = self.url
+        # A short poll interval makes `__exit__` return at once
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       kwargs={'poll_interval': 0.05},
+                                       daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/api/v1/'
+
+    @property
+    def requests(self) -> int:
+        """Number of requests received so far.
+        """
+        return self.httpd.requests
+
+    @property
+    def mutations(self) -> int:
+        """Number of POSTs applied, a replayed `Idempotency-Key` is not counted.
+        """
+        return self.httpd.mutations
+
+    def start_outage(self, path: str, hang: float = 0, status: int = None):
+        """Simulate an outage of the endpoints whose path matches a regular expression.
+
+        Args:
+            path (str): Regular expression searched in the request path, Ex.: "documents"
+            hang (float, optional): Seconds each matching request hangs before it is answered. Defaults to 0.
+            status (int, optional): Status of the answer, `None` to answer normally after hanging. Defaults to None.
+        """
+        self.httpd.outages.append((re.compile(path), hang, status))
+
+    def end_outages(self):
+        self.httpd.outages = []
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,188 @@
+"""Offline benchmark suite running the client against the local stub server.
+
+Covers per call latency of every endpoint, the onboarding flow end to end,
+parsing a large `documents` listing, concurrent throughput and the JSON
+serializers. Results are
+printed and written as JSON so they can be compared across releases.
+
+Run with `python -m benchmarks.suite --output results.json` from the
+repository root.
+"""
+import argparse
+import importlib.metadata
+import json
+import platform
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer as timer
+from typing import Callable, Dict, List
+
+from clicksign_api_wrapper.clicksign import ClickSign
+from clicksign_api_wrapper.onboarding import ContractSpec, SignerSpec
+from clicksign_api_wrapper.signer import SignatureAsTypes, SignatureAuthTypes
+
+from . import bench_json
+from .stub_server import StubServer
+
+
+def client_for(server: StubServer, **kwargs) -> ClickSign:
+    client = ClickSign('token', **kwargs)
+    client._url = server.url
+    return client
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        'count': count,
+        'mean_ms': statistics.mean(samples) * 1000,
+        'p50_ms': samples[count * 50 // 100] * 1000,
+        'p90_ms': samples[min(count - 1, count * 90 // 100)] * 1000,
+        'p99_ms': samples[min(count - 1, count * 99 // 100)] * 1000,
+        'max_ms': samples[-1] * 1000,
+    }
+
+
+def time_calls(func: Callable, calls: int) -> List[float]:
+    samples = []
+    for _ in range(calls):
+        start = timer()
+        func()
+        samples.append(timer() - start)
+    return samples
+
+
+def bench_per_call(server: StubServer, calls: int) -> Dict:
+    signer_fields = dict(auths=SignatureAuthTypes.EMAIL,
+                         name='Signer',
+                         email='signer@example.com')
+    with client_for(server) as client:
+        document = client.create_new_doc_from_template('template', 'doc', {})
+        signer = client.create_new_signer(**signer_fields)
+        operations = {
+            'check_token': client.check_token,
+            'get_document': lambda: client.get_document(document.key),
+            'get_signer': lambda: client.get_signer(signer.key),
+            'create_new_doc_from_template':
+            lambda: client.create_new_doc_from_template(
+                'template', 'doc', {'name': 'Customer'}),
+            'create_new_signer':
+            lambda: client.create_new_signer(**signer_fields),
+            'add_signer_to_document': lambda: client.add_signer_to_document(
+                document.key, signer.key, SignatureAsTypes.SIGN),
+            'config_doc':
+            lambda: client.config_doc(document.key, locale='pt-BR'),
+            'finalize_doc': lambda: client.finalize_doc(document.key),
+            'create_new_batch': lambda: client.create_new_batch(
+                [document.key], signer.key),
+            'sign_via_api': lambda: client.sign_via_api('request', 'secret'),
+        }
+        return {
+            name: latency_stats(time_calls(operation, calls))
+            for name, operation in operations.items()
+        }
+
+
+def bench_onboarding(server: StubServer, contracts: int,
+                     concurrency: int) -> Dict:
+    specs = [
+        ContractSpec('template',
+                     f'contracts/{index}',
+                     {'name': f'Customer {index}'}, [
+                         SignerSpec(SignatureAsTypes.PARTY,
+                                    auths=SignatureAuthTypes.EMAIL,
+                                    email=f'customer{index}@example.com'),
+                         SignerSpec(SignatureAsTypes.WITNESS,
+                                    auths=SignatureAuthTypes.EMAIL,
+                                    email='witness@example.com'),
+                     ],
+                     config={'locale': 'pt-BR'}) for index in range(contracts)
+    ]
+    with client_for(server, pool_maxsize=concurrency) as client:
+        report = client.onboard_contracts(specs, concurrency=concurrency)
+    return {
+        'contracts': contracts,
+        'concurrency': concurrency,
+        'failed': len(report.failed),
+        'requests': report.requests,
+        'elapsed_s': report.elapsed,
+        'contracts_per_s': report.contracts_per_second,
+        'requests_per_s': report.requests_per_second,
+    }
+
+
+def bench_listing(server: StubServer) -> Dict:
+    with client_for(server) as client:
+        start = timer()
+        count = sum(1 for _ in client.iter_documents(prefetch=True))
+        elapsed = timer() - start
+    return {
+        'documents': count,
+        'elapsed_s': elapsed,
+        'documents_per_s': count / elapsed,
+    }
+
+
+def bench_throughput(server: StubServer, calls: int, workers: int) -> Dict:
+    with client_for(server, pool_maxsize=workers) as client:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = timer()
+            samples = list(
+                executor.map(lambda _: time_calls(client.check_token, 1)[0],
+                             range(calls)))
+            elapsed = timer() - start
+    return {
+        'workers': workers,
+        'requests_per_s': calls / elapsed,
+        'latency': latency_stats(samples),
+    }
+
+
+def package_version() -> str:
+    try:
+        return importlib.metadata.version('clicksign_api_wrapper')
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def main(argv: List[str] = None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--latency',
+                        type=float,
+                        default=0.0,
+                        help='seconds of simulated server latency')
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--contracts', type=int, default=200)
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    results = {
+        'version': package_version(),
+        'python': platform.python_version(),
+        'stub_latency_s': args.latency,
+    }
+    with StubServer(latency=args.latency) as server:
+        results['per_call'] = bench_per_call(server, args.calls)
+        results['onboarding'] = bench_onboarding(server, args.contracts,
+                                                 args.concurrency)
+        results['throughput'] = bench_throughput(server, args.calls * 5,
+                                                 args.concurrency)
+    with StubServer(latency=args.latency,
+                    documents=args.documents,
+                    page_size=100) as server:
+        results['listing'] = bench_listing(server)
+    results['serializers'] = bench_json.compare()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    return results
+
+
+if __name__ == '__main__':
+    main()
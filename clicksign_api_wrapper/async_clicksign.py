@@ -0,0 +1,394 @@
+from __future__ import annotations
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import (Any, AsyncIterator, Callable, Dict, Iterable, Iterator,
+                    List, Set, Tuple, Union)
+
+from .batch import Batch
+from .bulk import BulkReport, Checkpoint
+from .clicksign import ApiEnv, ClickSign
+from .document import Document
+from .download import DownloadDest, DownloadKinds, DownloadResult
+from .list_class import ListClass
+from .onboarding import ContractSpec, OnboardingReport
+from .signer import SignatureAsTypes, SignatureAuthTypes, Signer
+from .template import Template
+from .upload import UploadReport, UploadSource
+
+# End of a sync iterator pulled by `AsyncClickSign.__iterate`
+_END = object()
+
+
+class AsyncClickSign:
+    """Asyncio version of `ClickSign`.
+
+    Every method mirrors the `ClickSign` method with the same name and runs it
+    in a worker thread, so endpoints, bodies, returned objects and raised
+    exceptions are exactly the same as in the sync client. The methods that
+    return an iterator in the sync client (`iter_documents`, `finalize_docs`,
+    ...) return an async iterator. The returned `Document`/`Signer` objects
+    are bound to the underlying sync client available as `click_sign`.
+    """
+    def __init__(self,
+                 token: str,
+                 api_env=ApiEnv.SANDBOX,
+                 timeout: float = 10,
+                 max_concurrency: int = 100,
+                 click_sign: ClickSign = None,
+                 executor: ThreadPoolExecutor = None,
+                 **options):
+        """Class constructor
+
+        Args:
+            token (str): Your ClickSign token
+            api_env ([type], optional): Set the environment as ApiEnv.SANDBOX or ApiEnv.PROD. Defaults to ApiEnv.SANDBOX.
+            timeout (float, optional): Set a time out in seconds for all api requests. Defaults to 10.
+            max_concurrency (int, optional): Max number of requests in flight at once. Defaults to 100.
+            click_sign (ClickSign, optional): Wrap an existing sync client instead of creating a new one. It is not closed by `close()`. Defaults to None.
+            executor (ThreadPoolExecutor, optional): Run the calls in these shared worker threads instead of creating `max_concurrency` new ones. It is not shut down by `close()`. Defaults to None.
+            options: The other `ClickSign` options of the new client, Ex.: `retry`, `rate_limiter`, `cache`, `hooks`, `journal`, `timeouts`, `circuit_breaker`
+
+        Raises:
+            TypeError: `options` given with an existing `click_sign`
+        """
+        if click_sign is not None and options:
+            raise TypeError(
+                f'{sorted(options)} only apply to a new client, set them on '
+                'the click_sign passed')
+        self._owns_client = click_sign is None
+        self.click_sign = click_sign or ClickSign(token,
+                                                  api_env=api_env,
+                                                  timeout=timeout,
+                                                  pool_maxsize=max_concurrency,
+                                                  **options)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='AsyncClickSign')
+        self._lock = threading.Lock()
+        self._pending: Set[Future] = set()
+        self._closed = False
+
+    async def __aenter__(self) -> AsyncClickSign:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Waiting for the calls in flight must not block the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self):
+        """Stop the worker threads and close the pooled connections.
+
+        Calls not started yet are cancelled, the ones in flight are waited for
+        so their connections are not closed under them.
+        """
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.click_sign.close()
+
+    def __submit(self, func: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('AsyncClickSign is closed')
+            # Keeps the caller `idempotency_token` in the worker thread
+            context = contextvars.copy_context()
+            future = self._executor.submit(
+                context.run, functools.partial(func, *args, **kwargs))
+            self._pending.add(future)
+        future.add_done_callback(self.__forget)
+        return future
+
+    async def __run(self, func: Callable, *args, **kwargs):
+        """Run a sync client method in the worker threads.
+
+        Args:
+            func (Callable): The `ClickSign` bound method
+
+        Returns:
+            The method result
+        """
+        return await asyncio.wrap_future(self.__submit(func, *args, **kwargs))
+
+    async def __iterate(self, iterator: Iterator) -> AsyncIterator:
+        """Pull the items of a sync client iterator in the worker threads.
+        """
+        future = None
+        try:
+            while True:
+                future = self.__submit(next, iterator, _END)
+                item = await asyncio.wrap_future(future)
+                if item is _END:
+                    return
+                yield item
+        finally:
+            # Stop the iterator once its item in flight is pulled, Ex.: when
+            # the caller breaks out of the loop
+            if future is None:
+                iterator.close()
+            else:
+                future.add_done_callback(lambda _: iterator.close())
+
+    def __forget(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    async def check_token(self) -> Dict:
+        """See `ClickSign.check_token`.
+        """
+        return await self.__run(self.click_sign.check_token)
+
+    async def create_new_batch(self,
+                               docs_list: List[str],
+                               signer_key: str,
+                               summary: bool = True) -> Batch:
+        """See `ClickSign.create_new_batch`.
+        """
+        return await self.__run(self.click_sign.create_new_batch, docs_list,
+                                signer_key, summary)
+
+    async def list_documents(self) -> List[Document]:
+        """See `ClickSign.list_documents`.
+        """
+        return await self.__run(self.click_sign.list_documents)
+
+    def iter_documents(self,
+                       status: str = None,
+                       folder: str = None,
+                       created_after: Union[str, datetime] = None,
+                       created_before: Union[str, datetime] = None,
+                       prefetch: bool = False) -> AsyncIterator[Document]:
+        """See `ClickSign.iter_documents`, use it with `async for`.
+        """
+        return self.__iterate(
+            self.click_sign.iter_documents(status, folder, created_after,
+                                           created_before, prefetch))
+
+    async def get_document(self, document_key: str) -> Document:
+        """See `ClickSign.get_document`.
+        """
+        return await self.__run(self.click_sign.get_document, document_key)
+
+    async def sign_via_api(self, request_signature_key: str,
+                           secret: str) -> bool:
+        """See `ClickSign.sign_via_api`.
+        """
+        return await self.__run(self.click_sign.sign_via_api,
+                                request_signature_key, secret)
+
+    async def sign_many_via_api(self,
+                                request_signature_keys: Iterable[str],
+                                secret: str,
+                                concurrency: int = 10) -> BulkReport:
+        """See `ClickSign.sign_many_via_api`.
+        """
+        return await self.__run(self.click_sign.sign_many_via_api,
+                                request_signature_keys, secret, concurrency)
+
+    async def onboard_contracts(self,
+                                specs: Iterable[ContractSpec],
+                                concurrency: int = 10,
+                                batch_signers: bool = False
+                                ) -> OnboardingReport:
+        """See `ClickSign.onboard_contracts`.
+        """
+        return await self.__run(self.click_sign.onboard_contracts, specs,
+                                concurrency, batch_signers)
+
+    async def wait_until_signed(self,
+                                document_keys: List[str],
+                                timeout: float = None) -> Dict[str, Document]:
+        """See `ClickSign.wait_until_signed`.
+        """
+        return await self.click_sign.watcher.wait_async(document_keys, timeout)
+
+    #region ### Document Methods ###
+    async def create_new_doc_from_template(self, template_key: str,
+                                           doc_path: str,
+                                           data: Dict) -> Document:
+        """See `ClickSign.create_new_doc_from_template`.
+        """
+        return await self.__run(self.click_sign.create_new_doc_from_template,
+                                template_key, doc_path, data)
+
+    async def get_template(self, template_key: str) -> Dict:
+        """See `ClickSign.get_template`.
+        """
+        return await self.__run(self.click_sign.get_template, template_key)
+
+    async def template(self,
+                       template_key: str,
+                       path: Union[str, Callable[[Dict], str]],
+                       fields: Iterable = None) -> Template:
+        """See `ClickSign.template`. The Template is bound to the sync client, run `render` in a thread.
+        """
+        return await self.__run(self.click_sign.template, template_key, path,
+                                fields)
+
+    async def upload_document(self,
+                              source: UploadSource,
+                              doc_path: str,
+                              mimetype: str = 'application/pdf',
+                              **options) -> Document:
+        """See `ClickSign.upload_document`.
+        """
+        return await self.__run(self.click_sign.upload_document, source,
+                                doc_path, mimetype, **options)
+
+    async def upload_documents(self,
+                               uploads: Dict[str, UploadSource],
+                               concurrency: int = 4,
+                               mimetype: str = 'application/pdf',
+                               **options) -> UploadReport:
+        """See `ClickSign.upload_documents`.
+        """
+        return await self.__run(self.click_sign.upload_documents, uploads,
+                                concurrency, mimetype, **options)
+
+    async def config_doc(self, document_key: str, **kwargs) -> Document:
+        """See `ClickSign.config_doc`.
+        """
+        return await self.__run(self.click_sign.config_doc, document_key,
+                                **kwargs)
+
+    async def finalize_doc(self, document_key: str) -> Document:
+        """See `ClickSign.finalize_doc`.
+        """
+        return await self.__run(self.click_sign.finalize_doc, document_key)
+
+    async def cancel_doc(self, document_key: str) -> Document:
+        """See `ClickSign.cancel_doc`.
+        """
+        return await self.__run(self.click_sign.cancel_doc, document_key)
+
+    async def delete_doc(self, document_key: str) -> bool:
+        """See `ClickSign.delete_doc`.
+        """
+        return await self.__run(self.click_sign.delete_doc, document_key)
+
+    async def download_document(self,
+                                document: Union[Document, str],
+                                kind: str = DownloadKinds.SIGNED,
+                                dest: DownloadDest = None) -> DownloadResult:
+        """See `ClickSign.download_document`.
+        """
+        return await self.__run(self.click_sign.download_document, document,
+                                kind, dest)
+
+    async def download_many(self,
+                            documents: Iterable[Union[Document, str]],
+                            dest_dir: str,
+                            kind: str = DownloadKinds.SIGNED,
+                            concurrency: int = 4) -> BulkReport:
+        """See `ClickSign.download_many`.
+        """
+        return await self.__run(self.click_sign.download_many, documents,
+                                dest_dir, kind, concurrency)
+
+    def finalize_docs(self,
+                      document_keys: Iterable[str],
+                      concurrency: int = 10,
+                      rate: float = None,
+                      checkpoint: Checkpoint = None,
+                      dry_run: bool = False
+                      ) -> AsyncIterator[Tuple[str, Any]]:
+        """See `ClickSign.finalize_docs`, use it with `async for`.
+        """
+        return self.__iterate(
+            self.click_sign.finalize_docs(document_keys, concurrency, rate,
+                                          checkpoint, dry_run))
+
+    def cancel_docs(self,
+                    document_keys: Iterable[str],
+                    concurrency: int = 10,
+                    rate: float = None,
+                    checkpoint: Checkpoint = None,
+                    dry_run: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        """See `ClickSign.cancel_docs`, use it with `async for`.
+        """
+        return self.__iterate(
+            self.click_sign.cancel_docs(document_keys, concurrency, rate,
+                                        checkpoint, dry_run))
+
+    def delete_docs(self,
+                    document_keys: Iterable[str],
+                    concurrency: int = 10,
+                    rate: float = None,
+                    checkpoint: Checkpoint = None,
+                    dry_run: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        """See `ClickSign.delete_docs`, use it with `async for`.
+        """
+        return self.__iterate(
+            self.click_sign.delete_docs(document_keys, concurrency, rate,
+                                        checkpoint, dry_run))
+
+    def config_docs(self,
+                    document_keys: Iterable[str],
+                    concurrency: int = 10,
+                    rate: float = None,
+                    checkpoint: Checkpoint = None,
+                    dry_run: bool = False,
+                    **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+        """See `ClickSign.config_docs`, use it with `async for`.
+        """
+        return self.__iterate(
+            self.click_sign.config_docs(document_keys, concurrency, rate,
+                                        checkpoint, dry_run, **kwargs))
+
+    #endregion ### Document Methods ###
+
+    #region ### Signer Methods ###
+    async def create_new_signer(self,
+                                auths: SignatureAuthTypes,
+                                name: str = None,
+                                email: str = None,
+                                phone_number: str = None,
+                                documentation: str = None,
+                                birthday: str = None,
+                                has_documentation: bool = True,
+                                delivery: str = None) -> Signer:
+        """See `ClickSign.create_new_signer`.
+        """
+        return await self.__run(self.click_sign.create_new_signer,
+                                auths,
+                                name=name,
+                                email=email,
+                                phone_number=phone_number,
+                                documentation=documentation,
+                                birthday=birthday,
+                                has_documentation=has_documentation,
+                                delivery=delivery)
+
+    async def get_signer(self, signer_key: str) -> Signer:
+        """See `ClickSign.get_signer`.
+        """
+        return await self.__run(self.click_sign.get_signer, signer_key)
+
+    #endregion ### Signer Methods ###
+
+    #region ### List Class Methods ###
+    async def add_signer_to_document(self, document_key: str,
+                                     signer_key: str,
+                                     sign_as: SignatureAsTypes) -> ListClass:
+        """See `ClickSign.add_signer_to_document`.
+        """
+        return await self.__run(self.click_sign.add_signer_to_document,
+                                document_key, signer_key, sign_as)
+
+    async def remove_signer_from_document(self, list_key: str) -> bool:
+        """See `ClickSign.remove_signer_from_document`.
+        """
+        return await self.__run(self.click_sign.remove_signer_from_document,
+                                list_key)
+
+    #endregion ### List Class Methods ###
@@ -1,6 +1,18 @@
-class Batch:
-    def __init__(self, metadata):
-        self.metadata = metadata
+from typing import Dict, List
 
-        for key, item in metadata["batch"].items():
-            setattr(self, key, item)
\ No newline at end of file
+from .model import Field, Model
+
+
+class Batch(Model):
+    __slots__ = ()
+    root = 'batch'
+
+    key: str = Field()
+    signer_key: str = Field()
+    document_keys: List[str] = Field()
+    summary: bool = Field()
+    created_at: str = Field()
+    updated_at: str = Field()
+
+    def __init__(self, metadata: Dict):
+        super().__init__(metadata)
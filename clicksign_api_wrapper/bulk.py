@@ -0,0 +1,186 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from timeit import default_timer as timer
+from typing import Any, Callable, Dict, Iterable, Iterator, Set, Tuple
+
+from .rate_limit import TokenBucket
+
+# End of the keys, `None` can be a key
+_END = object()
+
+
+class BulkReport:
+    """Per key results of a bulk operation.
+
+    `results` maps each key to the value returned for it, or to the exception
+    raised while processing it.
+    """
+    def __init__(self, results: Dict[str, Any], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> Dict[str, Any]:
+        return {
+            key: result
+            for key, result in self.results.items()
+            if not isinstance(result, Exception)
+        }
+
+    @property
+    def failed(self) -> Dict[str, Exception]:
+        return {
+            key: result
+            for key, result in self.results.items()
+            if isinstance(result, Exception)
+        }
+
+    @property
+    def per_second(self) -> float:
+        """Keys processed per second.
+        """
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+
+class Checkpoint:
+    """Keys already processed by a bulk operation, skipped when it is run again.
+
+    This one lives in memory, use `FileCheckpoint` to resume after a crash.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def add(self, key: str):
+        with self._lock:
+            self._done.add(key)
+
+    def close(self):
+        pass
+
+
+class FileCheckpoint(Checkpoint):
+    """Checkpoint kept in a text file, one processed key per line.
+
+    Each key is written as soon as it succeeds, so a run interrupted at any
+    point resumes from the keys that were not done.
+    """
+    def __init__(self, path: str):
+        """Class constructor
+
+        Args:
+            path (str): The checkpoint file, created if missing
+        """
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self._done.update(line.rstrip('\n') for line in file
+                                  if line.endswith('\n'))
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def add(self, key: str):
+        with self._lock:
+            self._done.add(key)
+            self._file.write(key + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class DryRun:
+    """What a bulk operation would do to one key, returned instead of calling the API.
+    """
+    __slots__ = ('action', 'key', 'options')
+
+    def __init__(self, action: str, key: str, options: Dict = None):
+        self.action = action
+        self.key = key
+        self.options = options or {}
+
+    def __repr__(self) -> str:
+        return f'DryRun({self.action!r}, key={self.key!r}, options={self.options!r})'
+
+
+def iter_bulk(func: Callable[[str], Any],
+              keys: Iterable[str],
+              concurrency: int = 10,
+              rate: float = None,
+              checkpoint: Checkpoint = None) -> Iterator[Tuple[str, Any]]:
+    """Call `func` for every key in parallel, yielding each result as it completes.
+
+    Keys are read lazily, at most `2 * concurrency` are in flight, so a
+    generator of millions of keys is processed in constant memory.
+
+    Args:
+        func (Callable[[str], Any]): Processes one key
+        keys (Iterable[str]): The keys to process
+        concurrency (int, optional): Max number of calls in flight. Defaults to 10.
+        rate (float, optional): Max calls started per second, `None` for no limit. Defaults to None.
+        checkpoint (Checkpoint, optional): Keys in it are skipped, keys that succeed are added to it. Defaults to None.
+
+    Yields:
+        Tuple[str, Any]: Each key with its result, or the exception it raised, in completion order
+    """
+    limiter = TokenBucket(rate, 1) if rate else None
+
+    def call(key: str) -> Any:
+        if limiter is not None:
+            limiter.acquire()
+        result = func(key)
+        if checkpoint is not None:
+            # Recorded even if the caller stops iterating before this result
+            checkpoint.add(key)
+        return result
+
+    keys = iter(keys)
+    max_pending = 2 * concurrency
+    pending = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    key = next(keys, _END)
+                    if key is _END:
+                        exhausted = True
+                    elif checkpoint is None or key not in checkpoint:
+                        pending[executor.submit(call, key)] = key
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    error = future.exception()
+                    yield key, future.result() if error is None else error
+        finally:
+            # The caller stopped early, do not start the queued keys
+            for future in pending:
+                future.cancel()
+
+
+def run_bulk(func: Callable[[str], Any],
+             keys: Iterable[str],
+             concurrency: int = 10) -> BulkReport:
+    """Call `func` for every key in parallel, collecting results and errors.
+
+    Args:
+        func (Callable[[str], Any]): Processes one key
+        keys (Iterable[str]): The keys to process
+        concurrency (int, optional): Max number of calls in flight. Defaults to 10.
+
+    Returns:
+        BulkReport: The result or error of each key
+    """
+    start = timer()
+    results = dict(iter_bulk(func, keys, concurrency))
+    return BulkReport(results, timer() - start)
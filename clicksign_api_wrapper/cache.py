@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+
+class CacheBackend:
+    """Storage used by `ClientCache`. Subclass it to share the cache between processes.
+    """
+    def get(self, key: str) -> Any:
+        """Return the stored value or `None` when it is missing or expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for `ttl` seconds.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove a value, if present.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every value.
+        """
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Thread safe in-memory backend with TTL expiry and LRU eviction.
+    """
+    def __init__(self, maxsize: int = 1024):
+        """Class constructor
+
+        Args:
+            maxsize (int, optional): Max number of entries, the least recently used are evicted first. Defaults to 1024.
+        """
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ClientCache:
+    """Read-through cache of API responses for a `ClickSign` client.
+
+    Each resource (`accounts`, `documents`, `signers`) has its own TTL, a
+    resource without TTL is never cached. The cached values are the raw
+    response dicts, so any backend able to store JSON can be used.
+    """
+    DEFAULT_TTL = {'accounts': 3600, 'documents': 30, 'signers': 300}
+
+    def __init__(self,
+                 backend: CacheBackend = None,
+                 ttl: Dict[str, float] = None,
+                 namespace: str = ''):
+        """Class constructor
+
+        Args:
+            backend (CacheBackend, optional): Where the responses are stored. Defaults to MemoryCache().
+            ttl (Dict[str, float], optional): Seconds to keep each resource. Defaults to DEFAULT_TTL.
+            namespace (str, optional): Prefix of every key, to share one backend between tokens. Defaults to ''.
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = dict(self.DEFAULT_TTL if ttl is None else ttl)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._generations = Counter()
+        # Fetches in flight, flagged when their key is invalidated meanwhile
+        self._fetching: Dict[Tuple[str, Hashable], List[List[bool]]] = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def __key(self, resource: str, key: Hashable) -> str:
+        generation = self._generations[resource]
+        return f'{self.namespace}{resource}:{generation}:{key}'
+
+    def __fetched(self, resource: str, key: Hashable, stale: List[bool]):
+        fetching = self._fetching[resource, key]
+        fetching.remove(stale)
+        if not fetching:
+            del self._fetching[resource, key]
+
+    def get_or_fetch(self, resource: str, key: Hashable,
+                     fetch: Callable[[], Any]) -> Any:
+        """Return the cached value or call `fetch` and cache its result.
+
+        Args:
+            resource (str): The resource type, Ex.: "documents"
+            key (Hashable): The resource key
+            fetch (Callable[[], Any]): Gets the value from the API
+
+        Returns:
+            Any: The cached or fetched value
+        """
+        ttl = self.ttl.get(resource)
+        if not ttl:
+            return fetch()
+        cache_key = self.__key(resource, key)
+        value = self.backend.get(cache_key)
+        with self._lock:
+            if value is None:
+                self.misses[resource] += 1
+            else:
+                self.hits[resource] += 1
+        if value is None:
+            stale = [False]
+            with self._lock:
+                self._fetching.setdefault((resource, key), []).append(stale)
+            try:
+                value = fetch()
+            except BaseException:
+                with self._lock:
+                    self.__fetched(resource, key, stale)
+                raise
+            # Under the lock of `invalidate`, so an invalidation either flags
+            # this fetch as outdated or deletes the value stored here
+            with self._lock:
+                self.__fetched(resource, key, stale)
+                if not stale[0]:
+                    self.backend.set(cache_key, value, ttl)
+        return value
+
+    def invalidate(self, resource: str, key: Hashable = None):
+        """Drop a cached value, or every value of the resource when `key` is None.
+
+        Args:
+            resource (str): The resource type, Ex.: "documents"
+            key (Hashable, optional): The resource key. Defaults to None.
+        """
+        with self._lock:
+            for (fetched, fetched_key), fetching in self._fetching.items():
+                if fetched == resource and key in (None, fetched_key):
+                    for stale in fetching:
+                        stale[0] = True
+            if key is None:
+                # Old entries become unreachable and are evicted by the backend
+                self._generations[resource] += 1
+            else:
+                self.backend.delete(self.__key(resource, key))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit and miss counters per resource.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Ex.: `{"documents": {"hits": 3, "misses": 1}}`
+        """
+        with self._lock:
+            return {
+                resource: {
+                    'hits': self.hits[resource],
+                    'misses': self.misses[resource]
+                }
+                for resource in set(self.hits) | set(self.misses)
+            }
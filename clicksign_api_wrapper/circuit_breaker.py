@@ -0,0 +1,190 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Tuple
+
+from requests.exceptions import ConnectionError, Timeout
+
+from .exceptions import CircuitOpen
+
+
+class CircuitState:
+    """States of an endpoint circuit:
+    - CLOSED: Requests are sent
+    - OPEN: Requests fail at once with `CircuitOpen`
+    - HALF_OPEN: A few probe requests are sent to check if the endpoint recovered
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class _Circuit:
+    __slots__ = ('state', 'failures', 'opened_at', 'probes', 'opened',
+                 'rejected')
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: float = None
+        self.probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """Fail fast on the endpoints that keep failing, instead of waiting for their timeouts.
+
+    Each endpoint (Ex.: "GET documents/{key}") has its own circuit. After
+    `failure_threshold` consecutive failures (timeouts, connection errors and
+    5xx responses) the circuit opens and its requests raise `CircuitOpen`
+    without being sent. After `recovery_time` seconds, up to
+    `half_open_probes` requests are let through: the first success closes the
+    circuit, a failure opens it again. 4xx responses mean the endpoint is up
+    and count as successes. While the circuit is not closed only the answers
+    of its probes count, a late success of a request sent before it opened
+    does not close it.
+
+    Share one breaker between the clients of the same API, Ex.: in a
+    `ClickSignPool`, so they all stop calling a failing endpoint.
+    """
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_time: float = 30,
+                 half_open_probes: int = 1,
+                 statuses: Iterable[int] = (500, 502, 503, 504),
+                 clock: Callable[[], float] = time.monotonic):
+        """Class constructor
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open a circuit. Defaults to 5.
+            recovery_time (float, optional): Seconds a circuit stays open before the probes. Defaults to 30.
+            half_open_probes (int, optional): Max probe requests in flight while half open. Defaults to 1.
+            statuses (Iterable[int], optional): HTTP statuses counted as failures. Defaults to (500, 502, 503, 504).
+            clock (Callable[[], float], optional): Monotonic time function. Defaults to time.monotonic.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_probes = half_open_probes
+        self.statuses = frozenset(statuses)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def is_failure(self, error: Exception) -> bool:
+        """Check if an error means the endpoint is failing.
+        """
+        if error is None:
+            return False
+        status = getattr(error, 'status_code', None)
+        if status is not None:
+            return status in self.statuses
+        return isinstance(error, (ConnectionError, Timeout))
+
+    def before(self, endpoint: str) -> Tuple[str, int]:
+        """Let a request through, or fail fast.
+
+        Args:
+            endpoint (str): The endpoint name, Ex.: "GET documents/{key}"
+
+        Raises:
+            CircuitOpen: The circuit is open, or half open with all its probes in flight
+
+        Returns:
+            Tuple[str, int]: The new state when it changed, else `None`, and the probe to pass to `record`, `None` when the circuit is closed
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None:
+                circuit = self._circuits[endpoint] = _Circuit()
+            if circuit.state == CircuitState.CLOSED:
+                return None, None
+            changed = None
+            if circuit.state == CircuitState.OPEN:
+                retry_in = circuit.opened_at + self.recovery_time - self.clock()
+                if retry_in > 0:
+                    circuit.rejected += 1
+                    raise CircuitOpen(endpoint, retry_in)
+                circuit.state = changed = CircuitState.HALF_OPEN
+                circuit.probes = 0
+            if circuit.probes >= self.half_open_probes:
+                circuit.rejected += 1
+                raise CircuitOpen(endpoint, 0.0)
+            circuit.probes += 1
+            # Each opening of the circuit has its own round of probes
+            return changed, circuit.opened
+
+    def record(self,
+               endpoint: str,
+               error: Exception = None,
+               probe: int = None) -> str:
+        """Record the outcome of a request let through by `before`.
+
+        Args:
+            endpoint (str): The endpoint name
+            error (Exception, optional): The error raised by the request, `None` on success. Defaults to None.
+            probe (int, optional): The probe returned by `before`. Defaults to None.
+
+        Returns:
+            str: The new state when it changed, else `None`
+        """
+        failed = self.is_failure(error)
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None:
+                circuit = self._circuits[endpoint] = _Circuit()
+            if circuit.state != CircuitState.CLOSED:
+                # A request sent before the circuit opened, or a probe of a
+                # previous opening, says nothing about the endpoint now
+                if (circuit.state == CircuitState.OPEN
+                        or probe != circuit.opened):
+                    return None
+                circuit.probes -= 1
+            if not failed:
+                circuit.failures = 0
+                if circuit.state == CircuitState.CLOSED:
+                    return None
+                circuit.state = CircuitState.CLOSED
+                return CircuitState.CLOSED
+            circuit.failures += 1
+            if (circuit.state == CircuitState.HALF_OPEN
+                    or circuit.failures >= self.failure_threshold):
+                circuit.opened += 1
+                circuit.state = CircuitState.OPEN
+                circuit.opened_at = self.clock()
+                return CircuitState.OPEN
+            return None
+
+    def state(self, endpoint: str) -> str:
+        """The current state of an endpoint, see CircuitState.
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            return circuit.state if circuit is not None else CircuitState.CLOSED
+
+    def states(self) -> Dict[str, Dict]:
+        """State and counters of every endpoint seen, Ex.: `{"GET documents": {"state": "open", ...}}`.
+        """
+        now = self.clock()
+        with self._lock:
+            return {
+                endpoint: {
+                    'state': circuit.state,
+                    'failures': circuit.failures,
+                    'opened': circuit.opened,
+                    'rejected': circuit.rejected,
+                    'retry_in': (max(
+                        0.0, circuit.opened_at + self.recovery_time - now)
+                                 if circuit.state == CircuitState.OPEN else
+                                 0.0),
+                }
+                for endpoint, circuit in self._circuits.items()
+            }
+
+    def reset(self, endpoint: str = None):
+        """Close a circuit, or every circuit.
+        """
+        with self._lock:
+            if endpoint is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(endpoint, None)
@@ -1,9 +1,39 @@
+from __future__ import annotations
 from .batch import Batch
+from .bulk import BulkReport, Checkpoint, DryRun, iter_bulk, run_bulk
+from .cache import ClientCache
+from .circuit_breaker import CircuitBreaker
 from .document import Document
-from .exceptions import Forbidden, UnProcessableEntity, make_response
+from .download import (CHUNK_SIZE, DownloadDest, DownloadKinds,
+                       DownloadResult, DownloadTarget, download_filename,
+                       download_url)
+from .exceptions import (DownloadNotAvailable, Forbidden,
+                         UnProcessableEntity, make_response)
+from .idempotency import IdempotencyJournal
+from .instrumentation import Hook, RequestEvent, notify
 from .list_class import ListClass
+from .onboarding import ContractSpec, OnboardingReport, onboard_contracts
+from .pagination import document_filter, iter_pages
+from .rate_limit import TokenBucket
+from .retry import RetryPolicy
+from .serialization import JSONSerializer, decode_response, get_serializer
 from .signer import SignatureAuthTypes, Signer, SignatureAsTypes
-from typing import Dict, List
+from .signer_registry import SignerRegistry
+from .template import Template, template_doc_path
+from .timeouts import EndpointTimeouts
+from .upload import (Base64JSONBody, UploadReport, UploadSource,
+                     document_body)
+from .watcher import DocumentWatcher
+from datetime import datetime
+import hashlib
+import hmac
+import os
+from timeit import default_timer as timer
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Tuple,
+                    Union)
+
+import requests
+from requests.adapters import HTTPAdapter
 
 
 class ApiEnv():
@@ -22,17 +52,101 @@ class ClickSign:
     def __init__(self,
                  token: str,
                  api_env=ApiEnv.SANDBOX,
-                 timeout: float = 10):
+                 timeout: float = 10,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 keep_alive: bool = True,
+                 session: requests.Session = None,
+                 retry: RetryPolicy = None,
+                 rate_limiter: TokenBucket = None,
+                 cache: ClientCache = None,
+                 hooks: List[Hook] = None,
+                 journal: IdempotencyJournal = None,
+                 signer_registry: SignerRegistry = None,
+                 serializer: JSONSerializer = None,
+                 timeouts: EndpointTimeouts = None,
+                 circuit_breaker: CircuitBreaker = None):
         """Class constructor
 
         Args:
             token (str): Your ClickSign token
             api_env ([type], optional): Set the environment as ApiEnv.SANDBOX or ApiEnv.PROD. Defaults to ApiEnv.SANDBOX.
             timeout (float, optional): Set a time out in seconds for all api requests. Defaults to 10.
+            pool_connections (int, optional): Number of host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Max number of connections kept open per host. Defaults to 10.
+            keep_alive (bool, optional): Reuse connections between requests. Set `False` to close the connection after each request. Defaults to True.
+            session (requests.Session, optional): Use an existing session (and its connection pool) instead of creating a new one. The session is not closed by `close()`. Defaults to None.
+            retry (RetryPolicy, optional): How transient failures (429, 5xx, connection errors) are retried. Pass `RetryPolicy(max_attempts=1)` to disable retries. Defaults to RetryPolicy().
+            rate_limiter (TokenBucket, optional): Wait for this limiter before each request. Share one `TokenBucket` between clients of the same token, or use a `FileTokenBucket` to share it between processes. Defaults to None.
+            cache (ClientCache, optional): Cache the GET responses of accounts, documents and signers. Defaults to None.
+            hooks (List[Hook], optional): Notified of every request, retry and cache lookup. Defaults to None.
+            journal (IdempotencyJournal, optional): Send POSTs with an `Idempotency-Key`. Inside an `idempotency_token` block, replay their recorded result when the same request is sent again under the same token. With it, POSTs can be safely retried: `RetryPolicy(methods=IDEMPOTENT_METHODS | {'POST'})`. Defaults to None.
+            signer_registry (SignerRegistry, optional): `create_new_signer` returns the signer already created with the same email, phone, CPF and auths instead of creating a duplicate. Defaults to None.
+            serializer (JSONSerializer, optional): Encodes the request bodies and decodes the responses. Defaults to the fastest installed one, see `get_serializer`.
+            timeouts (EndpointTimeouts, optional): Connect and read timeouts of each endpoint, fixed or adaptive, used instead of `timeout`. Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): Fail fast with `CircuitOpen` on the endpoints that keep failing. Its state is in `circuit_breaker.states()`. Defaults to None.
         """
         self.query_string = {'access_token': token}
         self.timeout = timeout
         self._url = self.PROD_URL if api_env == ApiEnv.PROD else self.SANDBOX_URL
+        self._owns_session = session is None
+        self.session = session or self.new_session(
+            pool_connections, pool_maxsize, keep_alive)
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.hooks: List[Hook] = list(hooks or [])
+        self.journal = journal
+        self.signer_registry = signer_registry
+        self.serializer = serializer or get_serializer()
+        self.timeouts = timeouts
+        self.circuit_breaker = circuit_breaker
+        self.__watcher: DocumentWatcher = None
+
+    def __enter__(self) -> ClickSign:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close all pooled connections of this client and stop the document watcher.
+        """
+        if self.__watcher is not None:
+            self.__watcher.close()
+        if self._owns_session:
+            self.session.close()
+
+    @staticmethod
+    def new_session(pool_connections: int, pool_maxsize: int,
+                    keep_alive: bool) -> requests.Session:
+        """Create a session with a pooled HTTP adapter.
+
+        Args:
+            pool_connections (int): Number of host connection pools to cache.
+            pool_maxsize (int): Max number of connections kept open per host.
+            keep_alive (bool): Reuse connections between requests.
+
+        Returns:
+            requests.Session: The configured session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def __decode(self, resp: requests.Response) -> Dict:
+        """Decode a response body with the client serializer.
+        """
+        return decode_response(resp, self.serializer)
+
+    def __circuit_changed(self, endpoint: str, state: str):
+        if state is not None and self.hooks:
+            notify(self.hooks, 'on_circuit_change', endpoint, state)
 
     def __url(self, url: str) -> str:
         """Helper function to format API endpoints.
@@ -46,6 +160,149 @@ class ClickSign:
         url = f'{self._url}{url}'
         return url
 
+    def __request(self,
+                  method: str,
+                  endpoint: str,
+                  key: str = None,
+                  json: Dict = None,
+                  params: Dict = None,
+                  data: Base64JSONBody = None) -> requests.Response:
+        """Send a request to the API through the client session, retrying transient failures.
+
+        Args:
+            method (str): The HTTP method
+            endpoint (str): The service that you want to access in the API, as a template. Ex.: "documents/{key}"
+            key (str, optional): The resource key to fill the template. Defaults to None.
+            json (Dict, optional): The request body. Defaults to None.
+            params (Dict, optional): Query string parameters besides the token. Defaults to None.
+            data (Base64JSONBody, optional): A streamed JSON body, used instead of `json`. Defaults to None.
+
+        Returns:
+            requests.Response: The checked response
+        """
+        path = endpoint.format(key=key)
+        url = self.__url(path)
+        query_string = self.query_string
+        if params:
+            query_string = {**query_string, **params}
+        headers = {'Content-Type': 'application/json'} if data else {}
+        attempt = 0
+        event = None
+
+        def call():
+            timeout = self.timeout
+            if self.timeouts is not None:
+                timeout = self.timeouts.timeout(method, endpoint)
+            return make_response(method=method,
+                                 url=url,
+                                 json=json,
+                                 params=query_string,
+                                 timeout=timeout,
+                                 session=self.session,
+                                 data=data,
+                                 headers=headers or None,
+                                 serializer=self.serializer)
+
+        def guarded_call():
+            breaker = self.circuit_breaker
+            if breaker is None and self.timeouts is None:
+                return call()
+            name = f'{method} {endpoint}'
+            probe = None
+            if breaker is not None:
+                changed, probe = breaker.before(name)
+                self.__circuit_changed(name, changed)
+            start = timer()
+            error = None
+            try:
+                return call()
+            except Exception as raised:
+                error = raised
+                raise
+            finally:
+                # A connection error says nothing about the response time
+                timed_out = isinstance(error, requests.exceptions.ReadTimeout)
+                answered = error is None or hasattr(error, 'status_code')
+                if self.timeouts is not None and (answered or timed_out):
+                    self.timeouts.observe(method, endpoint, timer() - start,
+                                          timed_out)
+                if breaker is not None:
+                    self.__circuit_changed(name,
+                                           breaker.record(name, error, probe))
+
+        def send():
+            nonlocal attempt, event
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if data is not None:
+                data.seek(0)
+            if not self.hooks:
+                return guarded_call()
+
+            event = RequestEvent(method, endpoint, url, attempt)
+            notify(self.hooks, 'on_request_start', event)
+            start = timer()
+            try:
+                resp = guarded_call()
+            except Exception as error:
+                event.error = error
+                event.status = getattr(error, 'status_code', None)
+                raise
+            else:
+                event.status = resp.status_code
+                event.bytes_sent = len(data if data is not None else resp.
+                                       request.body or b'')
+                event.bytes_received = len(resp.content)
+                return resp
+            finally:
+                event.duration = timer() - start
+                notify(self.hooks, 'on_request_end', event)
+
+        def on_retry(error: Exception, delay: float):
+            if self.hooks:
+                notify(self.hooks, 'on_retry', event, delay)
+
+        def send_with_retries(extra_headers: Dict[str, str] = None):
+            if extra_headers:
+                headers.update(extra_headers)
+            return self.retry.call(method, send, on_retry)
+
+        if (self.journal is not None and data is None
+                and method in self.journal.methods):
+            return self.journal.run(self.query_string['access_token'],
+                                    method, path, json, send_with_retries)
+        return send_with_retries()
+
+    def __cached(self, resource: str, key: str, endpoint: str) -> Dict:
+        """GET a resource through the cache, when there is one.
+
+        Args:
+            resource (str): The cache resource type, Ex.: "documents"
+            key (str): The resource key
+            endpoint (str): The service that you want to access in the API, as a template. Ex.: "documents/{key}"
+
+        Returns:
+            Dict: The response body
+        """
+        fetched = False
+
+        def fetch() -> Dict:
+            nonlocal fetched
+            fetched = True
+            return self.__decode(self.__request("GET", endpoint, key=key))
+
+        if self.cache is None:
+            return fetch()
+        metadata = self.cache.get_or_fetch(resource, key, fetch)
+        if self.hooks:
+            notify(self.hooks, 'on_cache', resource, not fetched)
+        return metadata
+
+    def __invalidate(self, resource: str, key: str = None):
+        if self.cache is not None:
+            self.cache.invalidate(resource, key)
+
     def check_token(self) -> Dict:
         """Check if the token that was used to initialize the service is valid.
 
@@ -60,11 +317,7 @@ class ClickSign:
         Returns:
             Dict: Some data about the account, that is related with the provide token
         """
-        resp = make_response("GET",
-                             url=self.__url('accounts'),
-                             params=self.query_string,
-                             timeout=self.timeout)
-        return resp.json()
+        return self.__cached('accounts', 'account', 'accounts')
 
     def create_new_batch(self,
                          docs_list: List[str],
@@ -97,16 +350,12 @@ class ClickSign:
             }
         }
 
-        resp = make_response("POST",
-                             url=self.__url('batches'),
-                             json=body,
-                             params=self.query_string,
-                             timeout=self.timeout)
-        metadata = resp.json()
+        resp = self.__request("POST", 'batches', json=body)
+        metadata = self.__decode(resp)
         return Batch(metadata)
 
     def list_documents(self) -> List[Document]:
-        """Get all Documents
+        """Get the first page of Documents. Use `iter_documents` to walk all of them.
 
         Raises:
             BadRequest: Bad request, check your request
@@ -117,17 +366,53 @@ class ClickSign:
             UnknownServerError: Internal server error
         
         Returns:
-            List[Document]: All Documents
+            List[Document]: The Documents of the first page
         """
-        resp = make_response(method="GET",
-                             url=self.__url(f'documents'),
-                             params=self.query_string,
-                             timeout=self.timeout)
-        list_of_metadata = resp.json()['documents']
+        resp = self.__request("GET", 'documents')
+        list_of_metadata = self.__decode(resp)['documents']
         return list(
             map(lambda metadata: Document(self, {'document': metadata}),
                 list_of_metadata))
 
+    def iter_documents(self,
+                       status: str = None,
+                       folder: str = None,
+                       created_after: Union[str, datetime] = None,
+                       created_before: Union[str, datetime] = None,
+                       prefetch: bool = False) -> Iterator[Document]:
+        """Iterate over all Documents, following the pagination lazily.
+
+        Only one page (two with `prefetch`) is kept in memory at a time. The filters are applied to each page as it arrives.
+
+        Args:
+            status (str, optional): Only documents with this status (running, closed, canceled). Defaults to None.
+            folder (str, optional): Only documents inside this folder, Ex.: "/contracts/2021". Defaults to None.
+            created_after (Union[str, datetime], optional): Only documents uploaded at or after this date, UTC when it has no offset. Defaults to None.
+            created_before (Union[str, datetime], optional): Only documents uploaded before this date, UTC when it has no offset. Defaults to None.
+            prefetch (bool, optional): Fetch the next page in background while the current one is consumed. Defaults to False.
+
+        Raises:
+            BadRequest: Bad request, check your request
+            Unauthorized: Invalid token
+            Forbidden: You do not have permition to this resource. 
+            NotFound: Resource not found. Check the endpoint
+            UnProcessableEntity: The server was unable to process the request
+            UnknownServerError: Internal server error
+
+        Yields:
+            Document: Each Document that matches the filters
+        """
+        keep = document_filter(status, folder, created_after, created_before)
+
+        def fetch_page(page: int) -> Dict:
+            return self.__decode(
+                self.__request("GET", 'documents', params={'page': page}))
+
+        for body in iter_pages(fetch_page, prefetch):
+            for metadata in body['documents']:
+                if keep(metadata):
+                    yield Document(self, {'document': metadata})
+
     def get_document(self, document_key: str) -> Document:
         """Get one document.
 
@@ -145,32 +430,27 @@ class ClickSign:
         Returns:
             Document: The required Document
         """
-        resp = make_response(method="GET",
-                             url=self.__url(f'documents/{document_key}'),
-                             params=self.query_string,
-                             timeout=self.timeout)
-        metadata = resp.json()
-
+        metadata = self.__cached('documents', document_key,
+                                 'documents/{key}')
         return Document(self, metadata)
 
-    def __generate_body_for_sign_via_api(self, request_signature_key: str,
-                                         secret: str) -> Dict:
+    def __generate_body_for_sign_via_api(
+            self, request_signature_key: str,
+            secret: Union[str, hmac.HMAC]) -> Dict:
         """Encrypt of the resquest_signature_key with the signer secret
 
         Args:
             request_signature_key (str): The request signature key
-            secret (str): Signer secret provide by ClickSign
+            secret (Union[str, hmac.HMAC]): Signer secret provide by ClickSign, or an HMAC already keyed with it
 
         Returns:
             Dict: The botd to send in request 
         """
-        import hashlib
-        import hmac
-
-        message = bytes(request_signature_key, 'utf-8')
-        key = bytes(secret, 'utf-8')
+        if not isinstance(secret, hmac.HMAC):
+            secret = hmac.new(bytes(secret, 'utf-8'), digestmod=hashlib.sha256)
         # Hash the request_signature_key with the sign secrect provide by ClickSign
-        hash = hmac.new(key, message, hashlib.sha256)
+        hash = secret.copy()
+        hash.update(bytes(request_signature_key, 'utf-8'))
         body = {
             "request_signature_key": request_signature_key,
             "secret_hmac_sha256": hash.hexdigest()
@@ -198,14 +478,119 @@ class ClickSign:
 
         body = self.__generate_body_for_sign_via_api(request_signature_key,
                                                      secret)
-        resp = make_response(method="POST",
-                             url=self.__url(f'sign'),
-                             json=body,
-                             params=self.query_string,
-                             timeout=self.timeout)
+        resp = self.__request("POST", 'sign', json=body)
         return True
 
+    def sign_many_via_api(self,
+                          request_signature_keys: Iterable[str],
+                          secret: str,
+                          concurrency: int = 10) -> BulkReport:
+        """Sign many request signature keys of the same signer via api.
+
+        The secret is keyed once and all bodies are computed before the requests are sent in parallel.
+
+        Args:
+            request_signature_keys (Iterable[str]): The request signature keys
+            secret (str): Signer secret provide by ClickSign
+            concurrency (int, optional): Max number of requests in flight. Set `pool_maxsize` to at least this value. Defaults to 10.
+
+        Returns:
+            BulkReport: `True` or the raised exception for each key, and the signatures per second in `per_second`
+        """
+        keyed_secret = hmac.new(bytes(secret, 'utf-8'),
+                                digestmod=hashlib.sha256)
+        bodies = {
+            key: self.__generate_body_for_sign_via_api(key, keyed_secret)
+            for key in request_signature_keys
+        }
+
+        def sign(request_signature_key: str) -> bool:
+            self.__request("POST", 'sign', json=bodies[request_signature_key])
+            return True
+
+        return run_bulk(sign, bodies, concurrency)
+
+    def onboard_contracts(self,
+                          specs: Iterable[ContractSpec],
+                          concurrency: int = 10,
+                          batch_signers: bool = False) -> OnboardingReport:
+        """Set up many contracts at once: create the documents and signers, add the signers to the documents and configure them.
+
+        Independent calls run in parallel and a failing contract does not stop the others.
+
+        Args:
+            specs (Iterable[ContractSpec]): The contracts to set up.
+            concurrency (int, optional): Max number of requests in flight. Set `pool_maxsize` to at least this value. Defaults to 10.
+            batch_signers (bool, optional): Create a batch for each signer that was added to more than one of the new documents. Defaults to False.
+
+        Returns:
+            OnboardingReport: Results and failures of each contract and the throughput of the run.
+        """
+        return onboard_contracts(self, specs, concurrency, batch_signers)
+
+    @property
+    def watcher(self) -> DocumentWatcher:
+        """The watcher shared by every `wait_until_signed` call, created on first use.
+        """
+        if self.__watcher is None:
+            self.__watcher = DocumentWatcher(self)
+        return self.__watcher
+
+    def wait_until_signed(self,
+                          document_keys: Iterable[str],
+                          timeout: float = None) -> Dict[str, Document]:
+        """Block until every document is finished (closed) or canceled.
+
+        Waits on the same document from many threads share one poll, see `DocumentWatcher`.
+
+        Args:
+            document_keys (Iterable[str]): The keys of the documents to wait for
+            timeout (float, optional): Seconds to wait before giving up. Defaults to None.
+
+        Raises:
+            TimeoutError: A document could not be fetched before the timeout
+
+        Returns:
+            Dict[str, Document]: The last seen Document of each key, check its `status` after a timeout
+        """
+        return self.watcher.wait(document_keys, timeout)
+
     #region ### Document Methods ###
+    def get_template(self, template_key: str) -> Dict:
+        """Get the metadata of a template, used by `Template` to load its fields.
+
+        Args:
+            template_key (str): The template key
+
+        Raises:
+            BadRequest: Bad request, check your request
+            Unauthorized: Invalid token
+            Forbidden: You do not have permition to this resource. 
+            NotFound: Resource not found. Check the endpoint
+            UnknownServerError: Internal server error
+
+        Returns:
+            Dict: The template metadata, Ex.: `{"key": ..., "name": ..., "fields": [...]}`
+        """
+        resp = self.__request("GET", 'templates/{key}', key=template_key)
+        return self.__decode(resp).get('template', {})
+
+    def template(self,
+                 template_key: str,
+                 path: Union[str, Callable[[Dict], str]],
+                 fields: Iterable = None) -> Template:
+        """Prepare a template to create many documents from validated rows, see `Template`.
+
+        Args:
+            template_key (str): The template key used as base document
+            path (Union[str, Callable[[Dict], str]]): The doc path of each row, a pattern like "contracts/{name}" or a function of the row
+            fields (Iterable, optional): The template fields, names or `TemplateField`. Defaults to the fields in `get_template`.
+
+        Returns:
+            Template: The template, ready for `Template.render`
+        """
+        return Template(self, template_key, path, fields)
+
     def create_new_doc_from_template(self, template_key: str, doc_path: str,
                                      data: Dict) -> Document:
         """Create a new document from a template.
@@ -228,21 +613,216 @@ class ClickSign:
         """
 
         # Add / to begin of doc_path and .docx to the end
-        doc_path = doc_path if doc_path.startswith("/") else f'/{doc_path}'
-        doc_path = doc_path if doc_path.endswith(
-            ".docx") else f'{doc_path}.docx'
+        doc_path = template_doc_path(doc_path)
 
         body = {'document': {'path': doc_path, 'template': {'data': data}}}
 
-        resp = make_response(
-            method="POST",
-            url=self.__url(f'templates/{template_key}/documents'),
-            json=body,
-            params=self.query_string,
-            timeout=self.timeout)
-        metadata = resp.json()
+        resp = self.__request("POST",
+                              'templates/{key}/documents',
+                              key=template_key,
+                              json=body)
+        metadata = self.__decode(resp)
+        return Document(self, metadata)
+
+    def upload_document(self,
+                        source: UploadSource,
+                        doc_path: str,
+                        mimetype: str = 'application/pdf',
+                        deadline_at: str = None,
+                        auto_close: bool = None,
+                        locale: str = None,
+                        sequence_enabled: bool = None,
+                        remind_interval: int = None) -> Document:
+        """Upload a new document, streaming the file as base64 in chunks.
+
+        The file is never fully loaded in memory, so large scanned PDFs can be sent with constant memory use.
+
+        Args:
+            source (UploadSource): A file path, a seekable binary file object or a bytes-like object (Ex.: `mmap`)
+            doc_path (str): The new document path (folder location and file name with extension)
+            mimetype (str, optional): The file mimetype. Defaults to 'application/pdf'.
+            deadline_at (str, optional): Signature deadline. Defaults to None.
+            auto_close (bool, optional): Finalize the document after the last signature. Defaults to None.
+            locale (str, optional): Document locale. Defaults to None.
+            sequence_enabled (bool, optional): Sign in the signers order. Defaults to None.
+            remind_interval (int, optional): Days between reminders. Defaults to None.
+
+        Raises:
+            BadRequest: Bad request, check your request
+            Unauthorized: Invalid token
+            Forbidden: You do not have permition to this resource. 
+            NotFound: Resource not found. Check the endpoint
+            UnProcessableEntity: The server was unable to process the request
+            UnknownServerError: Internal server error
+
+        Returns:
+            Document: The uploaded Document
+        """
+        doc_path = doc_path if doc_path.startswith("/") else f'/{doc_path}'
+        body = document_body(source,
+                             doc_path,
+                             mimetype,
+                             deadline_at=deadline_at,
+                             auto_close=auto_close,
+                             locale=locale,
+                             sequence_enabled=sequence_enabled,
+                             remind_interval=remind_interval)
+        return self.__upload(body)
+
+    def __upload(self, body: Base64JSONBody) -> Document:
+        """Send a streamed document body and close its source.
+        """
+        try:
+            resp = self.__request("POST", 'documents', data=body)
+        finally:
+            body.close()
+        metadata = self.__decode(resp)
         return Document(self, metadata)
 
+    def upload_documents(self,
+                         uploads: Dict[str, UploadSource],
+                         concurrency: int = 4,
+                         mimetype: str = 'application/pdf',
+                         **options) -> UploadReport:
+        """Upload many documents in parallel, see `upload_document`.
+
+        Args:
+            uploads (Dict[str, UploadSource]): The source of each document path
+            concurrency (int, optional): Max number of uploads in flight. Set `pool_maxsize` to at least this value. Defaults to 4.
+            mimetype (str, optional): The files mimetype. Defaults to 'application/pdf'.
+            options: Pass those vars as kwargs [deadline_at, auto_close, locale, sequence_enabled, remind_interval] to set them on every document
+
+        Returns:
+            UploadReport: The Document or the raised exception for each path, and the upload throughput
+        """
+        sizes = {}
+
+        def upload(doc_path: str) -> Document:
+            path = doc_path if doc_path.startswith("/") else f'/{doc_path}'
+            body = document_body(uploads[doc_path], path, mimetype, **options)
+            sizes[doc_path] = len(body)
+            return self.__upload(body)
+
+        report = run_bulk(upload, uploads, concurrency)
+        return UploadReport(report.results, report.elapsed,
+                            sum(sizes.values()))
+
+    def download_document(self,
+                          document: Union[Document, str],
+                          kind: str = DownloadKinds.SIGNED,
+                          dest: DownloadDest = None,
+                          chunk_size: int = CHUNK_SIZE) -> DownloadResult:
+        """Download one of the document files, streaming it in chunks.
+
+        A download to a path is written to `<path>.part` first and resumed from it by the retries and by the next
+        calls. The MD5 `ETag` of the file storage is verified when present. When the file url is missing or expired
+        the document is fetched again for a new one.
+
+        Args:
+            document (Union[Document, str]): The document, or its key
+            kind (str, optional): One of DownloadKinds. Defaults to DownloadKinds.SIGNED.
+            dest (DownloadDest): A file path or a writable binary object (Ex.: an object store writer)
+            chunk_size (int, optional): Bytes read at a time. Defaults to CHUNK_SIZE.
+
+        Raises:
+            DownloadNotAvailable: The document has no file of this kind yet
+            ChecksumMismatch: The downloaded file does not match its `ETag`
+
+        Returns:
+            DownloadResult: The size and SHA256 of the file
+        """
+        if dest is None:
+            raise ValueError('Provide a path or a writable object in dest')
+        if isinstance(document, str):
+            document = self.get_document(document)
+        url = download_url(document, kind)
+        if url is None:
+            document = self.__refresh_document(document.key)
+            url = download_url(document, kind)
+        if url is None:
+            raise DownloadNotAvailable(document.key, kind)
+
+        target = DownloadTarget(dest, chunk_size)
+        try:
+            try:
+                return self.__download(url, target)
+            except Forbidden:
+                # The file urls are signed and expire, get fresh ones
+                document = self.__refresh_document(document.key)
+                return self.__download(download_url(document, kind), target)
+        finally:
+            target.close()
+
+    def __refresh_document(self, document_key: str) -> Document:
+        self.__invalidate('documents', document_key)
+        return self.get_document(document_key)
+
+    def __download(self, url: str, target: DownloadTarget) -> DownloadResult:
+        """Stream a file to the target, resuming from the written bytes on each retry.
+        """
+        def get() -> requests.Response:
+            return make_response(method="GET",
+                                 url=url,
+                                 params=None,
+                                 timeout=self.timeout,
+                                 session=self.session,
+                                 headers=target.headers(),
+                                 stream=True)
+
+        def send() -> DownloadResult:
+            resp = get()
+            if resp.status_code == 416:
+                # Nothing left to send from that offset, download it again
+                resp.close()
+                target.restart()
+                resp = get()
+            with resp:
+                resp.raise_for_status()
+                target.begin(resp.status_code, resp.headers)
+                try:
+                    for chunk in resp.iter_content(target.chunk_size):
+                        target.write(chunk)
+                except requests.exceptions.ChunkedEncodingError as error:
+                    # The connection dropped mid body, retry from what was written
+                    raise requests.exceptions.ConnectionError(error) from error
+            return target.finish()
+
+        return self.retry.call("GET", send)
+
+    def download_many(self,
+                      documents: Iterable[Union[Document, str]],
+                      dest_dir: str,
+                      kind: str = DownloadKinds.SIGNED,
+                      concurrency: int = 4) -> BulkReport:
+        """Download a file of many documents in parallel, see `download_document`.
+
+        Each file is saved as `<dest_dir>/<document key>-<kind><extension>`, so running it again resumes the partial
+        downloads.
+
+        Args:
+            documents (Iterable[Union[Document, str]]): The documents, or their keys
+            dest_dir (str): The directory to save the files in, created if missing
+            kind (str, optional): One of DownloadKinds. Defaults to DownloadKinds.SIGNED.
+            concurrency (int, optional): Max number of downloads in flight. Defaults to 4.
+
+        Returns:
+            BulkReport: The DownloadResult or the raised exception for each document key
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        by_key = {
+            document if isinstance(document, str) else document.key: document
+            for document in documents
+        }
+
+        def download(document_key: str) -> DownloadResult:
+            document = by_key[document_key]
+            if isinstance(document, str):
+                document = self.get_document(document)
+            dest = os.path.join(dest_dir, download_filename(document, kind))
+            return self.download_document(document, kind, dest)
+
+        return run_bulk(download, by_key, concurrency)
+
     def config_doc(self, document_key: str, **kwargs) -> Document:
         """Use the configure a document.
 
@@ -261,12 +841,12 @@ class ClickSign:
         Returns:
             Document: The Document with the new configuration. 
         """
-        resp = make_response(method="PATCH",
-                             url=self.__url(f'documents/{document_key}'),
-                             json=locals().get('kwargs'),
-                             params=self.query_string,
-                             timeout=self.timeout)
-        metadata = resp.json()
+        resp = self.__request("PATCH",
+                              'documents/{key}',
+                              key=document_key,
+                              json=locals().get('kwargs'))
+        self.__invalidate('documents', document_key)
+        metadata = self.__decode(resp)
 
         return Document(self, metadata)
 
@@ -287,12 +867,11 @@ class ClickSign:
         Returns:
             Document: The Document that was finalized 
         """
-        resp = make_response(
-            method="PATCH",
-            url=self.__url(f'documents/{document_key}/finish'),
-            params=self.query_string,
-            timeout=self.timeout)
-        metadata = resp.json()
+        resp = self.__request("PATCH",
+                              'documents/{key}/finish',
+                              key=document_key)
+        self.__invalidate('documents', document_key)
+        metadata = self.__decode(resp)
         return Document(self, metadata)
 
     def cancel_doc(self, document_key: str) -> Document:
@@ -312,12 +891,11 @@ class ClickSign:
         Returns:
             Document: The Document that was cancelled
         """
-        resp = make_response(
-            method="PATCH",
-            url=self.__url(f'documents/{document_key}/cancel'),
-            params=self.query_string,
-            timeout=self.timeout)
-        metadata = resp.json()
+        resp = self.__request("PATCH",
+                              'documents/{key}/cancel',
+                              key=document_key)
+        self.__invalidate('documents', document_key)
+        metadata = self.__decode(resp)
         return Document(self, metadata)
 
     def delete_doc(self, document_key: str) -> bool:
@@ -337,14 +915,99 @@ class ClickSign:
         Returns:
             bool: The result of the operation
         """
-        resp = make_response(method="DELETE",
-                             url=self.__url(f'documents/{document_key}'),
-                             params=self.query_string,
-                             timeout=self.timeout)
+        resp = self.__request("DELETE", 'documents/{key}', key=document_key)
+        self.__invalidate('documents', document_key)
         metadata = None
         document_key = None
         return True
 
+    def __bulk_docs(self, action: str, func: Callable[[str], Any],
+                    document_keys: Iterable[str], concurrency: int,
+                    rate: float, checkpoint: Checkpoint, dry_run: bool,
+                    options: Dict = None) -> Iterator[Tuple[str, Any]]:
+        """Run a document method over many keys, see `finalize_docs`.
+        """
+        if dry_run:
+            for key in document_keys:
+                if checkpoint is None or key not in checkpoint:
+                    yield key, DryRun(action, key, options)
+            return
+        yield from iter_bulk(func, document_keys, concurrency, rate,
+                             checkpoint)
+
+    def finalize_docs(self,
+                      document_keys: Iterable[str],
+                      concurrency: int = 10,
+                      rate: float = None,
+                      checkpoint: Checkpoint = None,
+                      dry_run: bool = False) -> Iterator[Tuple[str, Any]]:
+        """Finalize many documents in parallel, yielding each result as it completes.
+
+        Nothing is sent until the result is iterated. Keys are read lazily, so a generator of any size can be passed.
+        With a `FileCheckpoint`, an interrupted run skips the documents already finalized when started again.
+
+        Args:
+            document_keys (Iterable[str]): The keys of the documents
+            concurrency (int, optional): Max number of requests in flight. Set `pool_maxsize` to at least this value. Defaults to 10.
+            rate (float, optional): Max requests started per second by this operation, on top of the client `rate_limiter`. Defaults to None.
+            checkpoint (Checkpoint, optional): Skip the keys in it and add the finalized ones. Defaults to None.
+            dry_run (bool, optional): Only yield a `DryRun` for each key that would be finalized, without any request. Defaults to False.
+
+        Yields:
+            Tuple[str, Any]: Each key with its Document, or the raised exception
+        """
+        return self.__bulk_docs('finalize', self.finalize_doc, document_keys,
+                                concurrency, rate, checkpoint, dry_run)
+
+    def cancel_docs(self,
+                    document_keys: Iterable[str],
+                    concurrency: int = 10,
+                    rate: float = None,
+                    checkpoint: Checkpoint = None,
+                    dry_run: bool = False) -> Iterator[Tuple[str, Any]]:
+        """Cancel many documents in parallel, see `finalize_docs`.
+
+        Yields:
+            Tuple[str, Any]: Each key with its Document, or the raised exception
+        """
+        return self.__bulk_docs('cancel', self.cancel_doc, document_keys,
+                                concurrency, rate, checkpoint, dry_run)
+
+    def delete_docs(self,
+                    document_keys: Iterable[str],
+                    concurrency: int = 10,
+                    rate: float = None,
+                    checkpoint: Checkpoint = None,
+                    dry_run: bool = False) -> Iterator[Tuple[str, Any]]:
+        """Delete many documents in parallel, see `finalize_docs`.
+
+        Yields:
+            Tuple[str, Any]: Each key with `True`, or the raised exception
+        """
+        return self.__bulk_docs('delete', self.delete_doc, document_keys,
+                                concurrency, rate, checkpoint, dry_run)
+
+    def config_docs(self,
+                    document_keys: Iterable[str],
+                    concurrency: int = 10,
+                    rate: float = None,
+                    checkpoint: Checkpoint = None,
+                    dry_run: bool = False,
+                    **kwargs) -> Iterator[Tuple[str, Any]]:
+        """Apply the same configuration to many documents in parallel, see `finalize_docs`.
+
+        Args:
+            kwargs: Pass those vars as kwargs [deadline_at, auto_close, locale, sequence_enabled, remind_interval]
+
+        Yields:
+            Tuple[str, Any]: Each key with its Document, or the raised exception
+        """
+        def config(document_key: str) -> Document:
+            return self.config_doc(document_key, **kwargs)
+
+        return self.__bulk_docs('config', config, document_keys, concurrency,
+                                rate, checkpoint, dry_run, kwargs)
+
     #endregion ### Document Methods ###
 
     #region ### Signer Methods ###
@@ -378,7 +1041,7 @@ class ClickSign:
             UnknownServerError: Internal server error
         
         Returns:
-            Signer: The created Signer
+            Signer: The created Signer, or the existing one when a `signer_registry` knows it
         """
         body = {
             'signer': {
@@ -394,12 +1057,18 @@ class ClickSign:
         if delivery:
             body['signer']['delivery'] = delivery
 
-        resp = make_response(method="POST",
-                             url=self.__url('signers'),
-                             json=body,
-                             params=self.query_string,
-                             timeout=self.timeout)
-        metadata = resp.json()
+        if self.signer_registry is not None:
+
+            def create() -> Dict:
+                resp = self.__request("POST", 'signers', json=body)
+                return self.__decode(resp)['signer']
+
+            signer = self.signer_registry.get_or_create(
+                self.query_string['access_token'], body['signer'], create)
+            return Signer(self, {'signer': signer})
+
+        resp = self.__request("POST", 'signers', json=body)
+        metadata = self.__decode(resp)
         return Signer(self, metadata)
 
     def get_signer(self, signer_key: str) -> Signer:
@@ -419,11 +1088,7 @@ class ClickSign:
         Returns:
             Signer: The requests signer
         """
-        resp = make_response(method="GET",
-                             url=self.__url(f'signers/{signer_key}'),
-                             params=self.query_string,
-                             timeout=self.timeout)
-        metadata = resp.json()
+        metadata = self.__cached('signers', signer_key, 'signers/{key}')
         return Signer(self, metadata)
 
     #endregion ### Signer Methods ###
@@ -456,13 +1121,10 @@ class ClickSign:
                 "sign_as": sign_as
             }
         }
-        resp = make_response(method="POST",
-                             url=self.__url('lists'),
-                             json=body,
-                             params=self.query_string,
-                             timeout=self.timeout)
+        resp = self.__request("POST", 'lists', json=body)
+        self.__invalidate('documents', document_key)
 
-        metadata = resp.json()
+        metadata = self.__decode(resp)
         return ListClass(metadata)
 
     def remove_signer_from_document(self, list_key: str) -> bool:
@@ -482,10 +1144,9 @@ class ClickSign:
         Returns:
             bool: The result of the operation
         """
-        resp = make_response(method="DELETE",
-                             url=self.__url(f'lists/{list_key}'),
-                             params=self.query_string,
-                             timeout=self.timeout)
+        resp = self.__request("DELETE", 'lists/{key}', key=list_key)
+        # The list key does not tell which document changed
+        self.__invalidate('documents')
         return True
 
     #endregion ### List Class Methods ###
\ No newline at end of file
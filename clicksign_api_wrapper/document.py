@@ -1,18 +1,90 @@
 from __future__ import annotations
 from typing import Dict, List, Union
+from .download import DownloadDest, DownloadKinds, DownloadResult
+from .model import Field, Model
 from .signer import SignatureAsTypes, Signer
 from .list_class import ListClass
 
 
-class Document:
-    def __init__(self, click_sign: 'ClickSign', metadata):
-        self.metadata = metadata
-        self.key = None
+class Document(Model):
+    __slots__ = ('click_sign', '_signers', '_lists')
+    root = 'document'
 
-        for key, item in metadata["document"].items():
-            setattr(self, key, item)
+    key: str = Field()
+    path: str = Field()
+    filename: str = Field()
+    status: str = Field()
+    uploaded_at: str = Field()
+    updated_at: str = Field()
+    finished_at: str = Field()
+    deadline_at: str = Field()
+    auto_close: bool = Field()
+    locale: str = Field()
+    sequence_enabled: bool = Field()
+    remind_interval: int = Field()
+    downloads: Dict = Field()
+    template: Dict = Field()
+    events: List[Dict] = Field()
 
+    def __init__(self, click_sign: 'ClickSign', metadata: Dict):
+        super().__init__(metadata)
         self.click_sign = click_sign
+        self._signers = None
+        self._lists = None
+
+    @property
+    def signers(self) -> List[Signer]:
+        """The signers of the document, loaded on first access.
+
+        They come from the document data when it includes them, else they are
+        fetched from the `signer_key` of each list. Use `prefetch_related` to
+        load them for many documents at once.
+        """
+        if self._signers is None:
+            if self._data.get('signers') is None:
+                self.__load()
+            embedded = self._data.get('signers')
+            if embedded is not None:
+                self._signers = [
+                    Signer(self.click_sign, {'signer': signer})
+                    for signer in embedded
+                ]
+            else:
+                self._signers = [
+                    Signer(self.click_sign,
+                           signer_key=item.signer_key).load()
+                    for item in self.lists
+                ]
+        return self._signers
+
+    @property
+    def lists(self) -> List[ListClass]:
+        """The lists (signer to document relations) of the document, loaded on first access.
+        """
+        if self._lists is None:
+            if self._data.get('lists') is None:
+                self.__load()
+            self._lists = [
+                ListClass({'list': item})
+                for item in self._data.get('lists') or ()
+            ]
+        return self._lists
+
+    def __load(self):
+        """Fetch the whole document when it was built from a partial payload, Ex.: a listing.
+        """
+        if self.click_sign is None or self.key is None:
+            return
+        if self._data.get('lists') is None:
+            self._replace(self.click_sign.get_document(self.key).metadata)
+
+    def _replace(self, metadata: Dict):
+        super()._replace(metadata)
+        self._signers = None
+        self._lists = None
+
+    def _set_signers(self, signers: List[Signer]):
+        self._signers = signers
 
     def config_doc(self, **kwargs) -> Dict:
         """
@@ -29,10 +101,17 @@ class Document:
     def delete(self) -> bool:
         return self.click_sign.delete_doc(self.key)
 
+    def download(self,
+                 kind: str = DownloadKinds.SIGNED,
+                 dest: DownloadDest = None) -> DownloadResult:
+        """Stream one of the document files to a path or a writable object, see `ClickSign.download_document`.
+        """
+        return self.click_sign.download_document(self, kind, dest)
+
     def add_signer(self, signer: Union[Signer, str],
                    sign_as: SignatureAsTypes) -> ListClass:
         if isinstance(signer, str):
-            signer = Signer(self, signer_key=signer)
+            signer = Signer(self.click_sign, signer_key=signer)
         return self.click_sign.add_signer_to_document(document_key=self.key,
                                                       signer_key=signer.key,
                                                       sign_as=sign_as)
@@ -0,0 +1,202 @@
+import hashlib
+import io
+import os
+import re
+from typing import BinaryIO, Dict, Mapping, Union
+
+from .exceptions import ChecksumMismatch
+
+#: Bytes read from the response and written to the destination at a time.
+CHUNK_SIZE = 64 * 1024
+
+# S3 ETags are the MD5 of the content, unless the file was a multipart upload
+_MD5_ETAG = re.compile(r'^"?([0-9a-fA-F]{32})"?$')
+
+DownloadDest = Union[str, os.PathLike, BinaryIO]
+
+
+class DownloadKinds():
+    """Files of a document:
+
+    - ORIGINAL: The uploaded file
+    - SIGNED: The signed PDF, available once the document is closed
+    - ZIPED: The original and signed files in a zip
+    """
+    ORIGINAL = "original"
+    SIGNED = "signed"
+    ZIPED = "ziped"
+
+
+DOWNLOAD_FIELDS = {
+    DownloadKinds.ORIGINAL: 'original_file_url',
+    DownloadKinds.SIGNED: 'signed_file_url',
+    DownloadKinds.ZIPED: 'ziped_file_url',
+}
+
+
+def download_url(document: 'Document', kind: str) -> str:
+    """The url of one of the document files, `None` if it is not available yet.
+
+    Raises:
+        ValueError: Unknown kind
+    """
+    if kind not in DOWNLOAD_FIELDS:
+        raise ValueError(
+            f'Unknown download kind {kind!r}, use one of {list(DOWNLOAD_FIELDS)}'
+        )
+    return (document.downloads or {}).get(DOWNLOAD_FIELDS[kind])
+
+
+def download_filename(document: 'Document', kind: str) -> str:
+    """A file name unique to the document and kind, stable across calls so partial downloads are resumed.
+    """
+    if kind == DownloadKinds.ZIPED:
+        extension = '.zip'
+    elif kind == DownloadKinds.SIGNED:
+        extension = '.pdf'
+    else:
+        extension = os.path.splitext(document.filename or '')[1]
+    return f'{document.key}-{kind}{extension}'
+
+
+class DownloadResult:
+    """A downloaded document file.
+    """
+    __slots__ = ('dest', 'size', 'sha256', 'resumed_from')
+
+    def __init__(self, dest: DownloadDest, size: int, sha256: str,
+                 resumed_from: int):
+        self.dest = dest
+        self.size = size
+        self.sha256 = sha256
+        self.resumed_from = resumed_from
+
+    def __repr__(self) -> str:
+        return f'DownloadResult(dest={self.dest!r}, size={self.size})'
+
+
+class DownloadTarget:
+    """Where a download is written, and how much of it was written already.
+
+    A path is written to `<path>.part` and renamed when complete, so a
+    download interrupted in a previous run is resumed from the bytes on disk.
+    Any other destination is a writable binary sink (a file, an object store
+    writer...), resumed only by the retries of the same call.
+
+    The content is hashed while it is written: SHA256 for the result and MD5
+    to check the `ETag` sent by the file storage.
+    """
+    def __init__(self, dest: DownloadDest, chunk_size: int = CHUNK_SIZE):
+        """Class constructor
+
+        Args:
+            dest (DownloadDest): A file path or a writable binary object
+            chunk_size (int, optional): Bytes read from the response at a time. Defaults to CHUNK_SIZE.
+        """
+        self.dest = dest
+        self.chunk_size = chunk_size
+        self.etag: str = None
+        self.written = 0
+        self._sha256 = hashlib.sha256()
+        self._md5 = hashlib.md5()
+        self._file: BinaryIO = None
+        self._start: int = None
+        if isinstance(dest, (str, os.PathLike)):
+            self.part_path = os.fspath(dest) + '.part'
+            if os.path.exists(self.part_path):
+                self.__hash_part()
+        else:
+            self.part_path = None
+            try:
+                self._start = dest.tell()
+            except (AttributeError, OSError):
+                pass
+        self.resumed_from = self.written
+
+    def __hash_part(self):
+        with open(self.part_path, 'rb') as part:
+            for chunk in iter(lambda: part.read(self.chunk_size), b''):
+                self._sha256.update(chunk)
+                self._md5.update(chunk)
+                self.written += len(chunk)
+
+    def headers(self) -> Dict[str, str]:
+        """The headers asking for the missing bytes only.
+        """
+        if not self.written:
+            return {}
+        headers = {'Range': f'bytes={self.written}-'}
+        if self.etag:
+            # The whole file is sent again if it changed since the first attempt
+            headers['If-Range'] = self.etag
+        return headers
+
+    def restart(self):
+        """Drop what was written.
+
+        Raises:
+            io.UnsupportedOperation: The destination can not be rewound
+        """
+        if self.written:
+            if self.part_path is not None:
+                self.__open().truncate(0)
+            elif self._start is not None:
+                self.dest.seek(self._start)
+                self.dest.truncate()
+            else:
+                raise io.UnsupportedOperation(
+                    'The file changed and the destination can not be rewound')
+        self.written = 0
+        self._sha256 = hashlib.sha256()
+        self._md5 = hashlib.md5()
+        self.resumed_from = 0
+
+    def begin(self, status_code: int, headers: Mapping[str, str]):
+        """Prepare to write the body of a response.
+
+        Args:
+            status_code (int): 206 when the missing bytes are sent, else the whole file is sent
+            headers (Mapping[str, str]): The response headers
+        """
+        if status_code != 206:
+            self.restart()
+            self.etag = headers.get('ETag')
+        elif self.etag is None:
+            self.etag = headers.get('ETag')
+        self.__open()
+
+    def __open(self) -> BinaryIO:
+        if self.part_path is None:
+            return self.dest
+        if self._file is None:
+            self._file = open(self.part_path, 'ab')
+        return self._file
+
+    def write(self, chunk: bytes):
+        self.__open().write(chunk)
+        self._sha256.update(chunk)
+        self._md5.update(chunk)
+        self.written += len(chunk)
+
+    def finish(self) -> DownloadResult:
+        """Check the content against the `ETag` and move the file in place.
+
+        Raises:
+            ChecksumMismatch: The content does not match the `ETag`, the partial file is removed
+        """
+        self.close()
+        match = _MD5_ETAG.match(self.etag or '')
+        if match and match.group(1).lower() != self._md5.hexdigest():
+            if self.part_path is not None:
+                os.remove(self.part_path)
+            raise ChecksumMismatch(match.group(1).lower(),
+                                   self._md5.hexdigest())
+        if self.part_path is not None:
+            os.replace(self.part_path, self.dest)
+        return DownloadResult(self.dest, self.written,
+                              self._sha256.hexdigest(), self.resumed_from)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,8 +1,31 @@
 import requests
+from email.utils import parsedate_to_datetime
 from requests.exceptions import RequestException
+from time import time
 from typing import Dict
 
 
+def parse_retry_after(value: str) -> float:
+    """Parse a `Retry-After` header, given in seconds or as an HTTP date.
+
+    Args:
+        value (str): The header value
+
+    Returns:
+        float: Seconds to wait or `None` if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
 def check_response(request_func):
     """ Verify the resquest response, checking for errors. 
 
@@ -16,19 +39,17 @@ def check_response(request_func):
         NotFound: Resource not found. Check the endpoint
         UnProcessableEntity: The server was unable to process the request
         UnknownServerError: Internal server error
+        TooManyRequests: Too many requests, rate limit reached
+        BadGateway: Bad gateway
+        ServiceUnavailable: Service temporarily unavailable
+        GatewayTimeout: Gateway timeout
 
     Returns:
         Dict: The response 
     """
     def wrapper(*args, **kwargs):
-        from timeit import default_timer as timer
         try:
-            start = timer()
             resp = request_func(*args, **kwargs)
-            end = timer()
-            print(
-                f'The request to ClickSign api lasted {(end - start):.3f} seconds'
-            )
         except RequestException:
             raise
 
@@ -42,23 +63,53 @@ def check_response(request_func):
             raise NotFound()
         elif resp.status_code == 422:
             raise UnProcessableEntity(resp.json().get('errors'))
+        elif resp.status_code == 429:
+            raise TooManyRequests(
+                parse_retry_after(resp.headers.get('Retry-After')))
         elif resp.status_code == 500:
             raise UnknownServerError()
+        elif resp.status_code == 502:
+            raise BadGateway()
+        elif resp.status_code == 503:
+            raise ServiceUnavailable(
+                parse_retry_after(resp.headers.get('Retry-After')))
+        elif resp.status_code == 504:
+            raise GatewayTimeout()
         return resp
 
     return wrapper
 
 
 @check_response
-def make_response(method, url, params, timeout, json=None):
-    return requests.request(method=method,
-                            url=url,
-                            json=json,
-                            params=params,
-                            timeout=timeout)
+def make_response(method,
+                  url,
+                  params,
+                  timeout,
+                  json=None,
+                  session=None,
+                  data=None,
+                  headers=None,
+                  stream=False,
+                  serializer=None):
+    requester = session if session is not None else requests
+    if json is not None and serializer is not None:
+        # Encode the body here instead of letting requests use the stdlib json
+        data = serializer.dumps(json)
+        headers = {**(headers or {}), 'Content-Type': 'application/json'}
+        json = None
+    return requester.request(method=method,
+                             url=url,
+                             json=json,
+                             data=data,
+                             headers=headers,
+                             params=params,
+                             timeout=timeout,
+                             stream=stream)
 
 
 class Forbidden(Exception):
+    status_code = 403
+
     def __init__(self):
         pass
 
@@ -67,6 +118,8 @@ class Forbidden(Exception):
 
 
 class Unauthorized(Exception):
+    status_code = 401
+
     def __init__(self):
         pass
 
@@ -75,6 +128,8 @@ class Unauthorized(Exception):
 
 
 class BadRequest(Exception):
+    status_code = 400
+
     def __init__(self):
         pass
 
@@ -83,6 +138,8 @@ class BadRequest(Exception):
 
 
 class UnProcessableEntity(Exception):
+    status_code = 422
+
     def __init__(self, error):
         self.error = error
 
@@ -91,6 +148,8 @@ class UnProcessableEntity(Exception):
 
 
 class NotFound(Exception):
+    status_code = 404
+
     def __init__(self):
         pass
 
@@ -99,8 +158,111 @@ class NotFound(Exception):
 
 
 class UnknownServerError(Exception):
+    status_code = 500
+
     def __init__(self):
         pass
 
     def __str__(self):
         return 'ClickSign API Error: UnknownServerError! The server was not able to process the request. Internal server error.'
+
+
+class TooManyRequests(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: float = None):
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return 'ClickSign API Error: TooManyRequests! The rate limit of your token was reached.'
+
+
+class BadGateway(Exception):
+    status_code = 502
+
+    def __init__(self):
+        pass
+
+    def __str__(self):
+        return 'ClickSign API Error: BadGateway! The server received an invalid response from the upstream server.'
+
+
+class ServiceUnavailable(Exception):
+    status_code = 503
+
+    def __init__(self, retry_after: float = None):
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return 'ClickSign API Error: ServiceUnavailable! The server is temporarily unable to handle the request.'
+
+
+class GatewayTimeout(Exception):
+    status_code = 504
+
+    def __init__(self):
+        pass
+
+    def __str__(self):
+        return 'ClickSign API Error: GatewayTimeout! The upstream server did not respond in time.'
+
+
+class InvalidSignature(Exception):
+    def __init__(self):
+        pass
+
+    def __str__(self):
+        return 'ClickSign Webhook Error: InvalidSignature! The Content-Hmac header does not match the request body.'
+
+
+class InvalidPayload(ValueError):
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __str__(self):
+        return f'ClickSign Webhook Error: InvalidPayload! The request body is not a webhook delivery: {self.reason}.'
+
+
+class DownloadNotAvailable(Exception):
+    def __init__(self, document_key: str, kind: str):
+        self.document_key = document_key
+        self.kind = kind
+
+    def __str__(self):
+        return f'ClickSign Download Error: DownloadNotAvailable! The {self.kind} file of the document {self.document_key} is not available yet.'
+
+
+class ChecksumMismatch(Exception):
+    def __init__(self, expected: str, actual: str):
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self):
+        return f'ClickSign Download Error: ChecksumMismatch! Expected MD5 {self.expected} but the downloaded file has {self.actual}.'
+
+
+class InvalidRow(Exception):
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+
+    def __str__(self):
+        return f'ClickSign Template Error: InvalidRow! The row was not sent, the errors were: {self.errors}.'
+
+
+class QueuedCallFailed(Exception):
+    def __init__(self, job_id: int, method: str, error: str):
+        self.job_id = job_id
+        self.method = method
+        self.error = error
+
+    def __str__(self):
+        return f'ClickSign Queue Error: QueuedCallFailed! The queued call {self.job_id} to {self.method} failed with: {self.error}.'
+
+
+class CircuitOpen(Exception):
+    def __init__(self, endpoint: str, retry_in: float):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+    def __str__(self):
+        return f'ClickSign API Error: CircuitOpen! {self.endpoint} keeps failing, the request was not sent. Try again in {self.retry_in:.1f}s.'
@@ -0,0 +1,365 @@
+import contextlib
+import contextvars
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+import requests
+
+PENDING = 'pending'
+DONE = 'done'
+
+_TOKEN = contextvars.ContextVar('clicksign_idempotency_token', default=None)
+
+
+@contextlib.contextmanager
+def idempotency_token(token: str) -> Iterator[str]:
+    """Mark the requests sent inside the block as one operation of the caller.
+
+    With an `IdempotencyJournal`, a request sent again under the same token
+    (Ex.: after a crash, by a queue retry) replays the recorded response
+    instead of applying the mutation twice. Use a token that identifies the
+    operation in your system, Ex.: `f"onboarding:{customer_id}"`.
+
+    Ex.: `with idempotency_token("order-42"): client.create_new_signer(...)`
+
+    Args:
+        token (str): The operation id, chosen by the caller
+    """
+    reset = _TOKEN.set(token)
+    try:
+        yield token
+    finally:
+        _TOKEN.reset(reset)
+
+
+def current_idempotency_token() -> Optional[str]:
+    """The token of the enclosing `idempotency_token` block, or `None`.
+    """
+    return _TOKEN.get()
+
+
+class JournalEntry:
+    """A mutation recorded by a `JournalBackend`.
+
+    A `pending` entry was sent but its outcome is unknown (in flight, timed
+    out or interrupted), a `done` entry holds the response to replay.
+    """
+    __slots__ = ('fingerprint', 'idempotency_key', 'state', 'status_code',
+                 'body', 'created_at')
+
+    def __init__(self,
+                 fingerprint: str,
+                 idempotency_key: str,
+                 state: str,
+                 created_at: float,
+                 status_code: int = None,
+                 body: bytes = None):
+        self.fingerprint = fingerprint
+        self.idempotency_key = idempotency_key
+        self.state = state
+        self.created_at = created_at
+        self.status_code = status_code
+        self.body = body
+
+    def response(self) -> requests.Response:
+        """Rebuild the recorded response.
+        """
+        resp = requests.Response()
+        resp.status_code = self.status_code
+        resp._content = self.body
+        resp.headers['Content-Type'] = 'application/json'
+        return resp
+
+    def __repr__(self) -> str:
+        return f'JournalEntry(state={self.state!r}, key={self.idempotency_key!r})'
+
+
+class JournalBackend:
+    """Storage used by `IdempotencyJournal`. Subclass it to keep the journal elsewhere.
+    """
+    def claim(self, fingerprint: str, idempotency_key: str,
+              expires_before: float) -> JournalEntry:
+        """Atomically return the entry of a fingerprint, or record a new pending one.
+
+        Args:
+            fingerprint (str): The request fingerprint
+            idempotency_key (str): The key of the new entry
+            expires_before (float): Entries created before this time are replaced
+
+        Returns:
+            JournalEntry: The existing entry, or the new one
+        """
+        raise NotImplementedError
+
+    def complete(self, fingerprint: str, status_code: int, body: bytes):
+        """Record the response of a pending entry.
+        """
+        raise NotImplementedError
+
+    def release(self, fingerprint: str):
+        """Remove an entry, the next identical request is sent again.
+        """
+        raise NotImplementedError
+
+    def purge(self, expires_before: float):
+        """Remove the entries created before `expires_before`.
+        """
+        raise NotImplementedError
+
+
+class MemoryJournal(JournalBackend):
+    """Thread safe in-memory backend, lost when the process exits.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, JournalEntry] = {}
+
+    def claim(self, fingerprint: str, idempotency_key: str,
+              expires_before: float) -> JournalEntry:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None or entry.created_at < expires_before:
+                entry = self._entries[fingerprint] = JournalEntry(
+                    fingerprint, idempotency_key, PENDING, time.time())
+            return entry
+
+    def complete(self, fingerprint: str, status_code: int, body: bytes):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                entry.state = DONE
+                entry.status_code = status_code
+                entry.body = body
+
+    def release(self, fingerprint: str):
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+
+    def purge(self, expires_before: float):
+        with self._lock:
+            for fingerprint in [
+                    fingerprint
+                    for fingerprint, entry in self._entries.items()
+                    if entry.created_at < expires_before
+            ]:
+                del self._entries[fingerprint]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteJournal(JournalBackend):
+    """Backend stored in a SQLite file, it survives restarts and can be shared by processes.
+
+    A pending entry left by a crashed run is sent again with the same
+    idempotency key.
+    """
+    def __init__(self, path: str, timeout: float = 30):
+        """Class constructor
+
+        Args:
+            path (str): The database file, created if missing
+            timeout (float, optional): Seconds to wait for a lock held by another process. Defaults to 30.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path,
+                                   timeout=timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS mutations ('
+                         'fingerprint TEXT PRIMARY KEY, '
+                         'idempotency_key TEXT NOT NULL, '
+                         'state TEXT NOT NULL, '
+                         'status_code INTEGER, '
+                         'body BLOB, '
+                         'created_at REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS mutations_created_at '
+                         'ON mutations (created_at)')
+
+    def claim(self, fingerprint: str, idempotency_key: str,
+              expires_before: float) -> JournalEntry:
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute(
+                    'SELECT idempotency_key, state, created_at, status_code, '
+                    'body FROM mutations WHERE fingerprint = ?',
+                    (fingerprint, )).fetchone()
+                if row is not None and row[2] >= expires_before:
+                    return JournalEntry(fingerprint, *row)
+                entry = JournalEntry(fingerprint, idempotency_key, PENDING,
+                                     time.time())
+                self._db.execute(
+                    'INSERT OR REPLACE INTO mutations (fingerprint, '
+                    'idempotency_key, state, created_at) VALUES (?, ?, ?, ?)',
+                    (fingerprint, idempotency_key, PENDING, entry.created_at))
+                return entry
+            finally:
+                self._db.execute('COMMIT')
+
+    def complete(self, fingerprint: str, status_code: int, body: bytes):
+        with self._lock:
+            self._db.execute(
+                'UPDATE mutations SET state = ?, status_code = ?, body = ? '
+                'WHERE fingerprint = ?',
+                (DONE, status_code, body, fingerprint))
+
+    def release(self, fingerprint: str):
+        with self._lock:
+            self._db.execute('DELETE FROM mutations WHERE fingerprint = ?',
+                             (fingerprint, ))
+
+    def purge(self, expires_before: float):
+        with self._lock:
+            self._db.execute('DELETE FROM mutations WHERE created_at < ?',
+                             (expires_before, ))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def request_fingerprint(scope: str,
+                        method: str,
+                        path: str,
+                        body: Optional[Dict],
+                        token: str = None) -> str:
+    """Identify a logical request, whatever the order of the body keys.
+
+    Args:
+        scope (str): Separates the accounts sharing a journal, Ex.: the token
+        method (str): The HTTP method
+        path (str): The endpoint, Ex.: "signers"
+        body (Optional[Dict]): The JSON body
+        token (str, optional): The caller operation id, see `idempotency_token`. Defaults to None.
+
+    Returns:
+        str: SHA256 hex digest
+    """
+    canonical = json.dumps([scope, token, method.upper(), path, body],
+                           sort_keys=True,
+                           separators=(',', ':'),
+                           default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def is_ambiguous(error: Exception) -> bool:
+    """Tell if the server may have applied a request that failed.
+
+    4xx errors (including 429) were rejected, timeouts, connection errors
+    and 5xx errors may have been applied.
+    """
+    status_code = getattr(error, 'status_code', None)
+    return status_code is None or status_code >= 500
+
+
+class IdempotencyJournal:
+    """Journal of mutating requests, to replay their results instead of sending them twice.
+
+    Each request gets an `Idempotency-Key` header, kept for every retry of
+    the call. Requests are only recorded inside an `idempotency_token` block:
+    the same request (same token, method, endpoint and body) sent again under
+    the same token returns the recorded response without calling the API for
+    `ttl` seconds, and identical ones sent concurrently from one process are
+    merged into a single call. Outside a block nothing is deduplicated, so
+    repeating a request on purpose (Ex.: adding back a removed signer) always
+    reaches the API.
+
+    When the outcome is ambiguous (timeout, connection error, 5xx) the entry
+    stays pending and the next identical request is sent with the same key.
+    When the request was rejected (4xx) the entry is removed.
+    """
+    def __init__(self,
+                 backend: JournalBackend = None,
+                 ttl: float = 86400,
+                 methods: Iterable[str] = ('POST', )):
+        """Class constructor
+
+        Args:
+            backend (JournalBackend, optional): Where the entries are stored. Defaults to MemoryJournal().
+            ttl (float, optional): Seconds during which a recorded response is replayed. Defaults to 86400.
+            methods (Iterable[str], optional): The HTTP methods recorded. Defaults to ('POST', ).
+        """
+        self.backend = backend if backend is not None else MemoryJournal()
+        self.ttl = ttl
+        self.methods = frozenset(method.upper() for method in methods)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._purged_at = 0.0
+        self.sent = 0
+        self.replayed = 0
+
+    def __expires_before(self) -> float:
+        now = time.time()
+        expires_before = now - self.ttl
+        if now - self._purged_at > 60:
+            self._purged_at = now
+            self.backend.purge(expires_before)
+        return expires_before
+
+    def run(self,
+            scope: str,
+            method: str,
+            path: str,
+            body: Optional[Dict],
+            send: Callable[[Dict[str, str]], requests.Response],
+            token: str = None) -> requests.Response:
+        """Replay the recorded response of a request, or send it and record it.
+
+        Args:
+            scope (str): Separates the accounts sharing a journal, Ex.: the token
+            method (str): The HTTP method
+            path (str): The endpoint, Ex.: "signers"
+            body (Optional[Dict]): The JSON body
+            send (Callable[[Dict[str, str]], requests.Response]): Sends the request with the given extra headers
+            token (str, optional): The caller operation id, the request is only recorded with one. Defaults to the `idempotency_token` in effect.
+
+        Returns:
+            requests.Response: The checked response
+        """
+        if token is None:
+            token = current_idempotency_token()
+        if token is None:
+            with self._lock:
+                self.sent += 1
+            return send({'Idempotency-Key': uuid.uuid4().hex})
+
+        fingerprint = request_fingerprint(scope, method, path, body, token)
+        while True:
+            with self._lock:
+                done = self._in_flight.get(fingerprint)
+                if done is None:
+                    done = self._in_flight[fingerprint] = threading.Event()
+                    break
+            # The same request is being sent by another thread
+            done.wait()
+
+        try:
+            entry = self.backend.claim(fingerprint,
+                                       uuid.uuid4().hex,
+                                       self.__expires_before())
+            if entry.state == DONE:
+                with self._lock:
+                    self.replayed += 1
+                return entry.response()
+            with self._lock:
+                self.sent += 1
+            try:
+                resp = send({'Idempotency-Key': entry.idempotency_key})
+            except Exception as error:
+                if not is_ambiguous(error):
+                    self.backend.release(fingerprint)
+                raise
+            self.backend.complete(fingerprint, resp.status_code, resp.content)
+            return resp
+        finally:
+            with self._lock:
+                del self._in_flight[fingerprint]
+            done.set()
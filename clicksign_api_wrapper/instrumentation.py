@@ -0,0 +1,205 @@
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, List
+
+
+class RequestEvent:
+    """One attempt of a request to the API, passed to every `Hook`.
+
+    `endpoint` is the url template, Ex.: "documents/{key}", so requests to
+    different resources of the same kind can be aggregated.
+    """
+    __slots__ = ('method', 'endpoint', 'url', 'attempt', 'status', 'duration',
+                 'bytes_sent', 'bytes_received', 'error', 'context')
+
+    def __init__(self, method: str, endpoint: str, url: str, attempt: int):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.attempt = attempt
+        self.status: int = None
+        self.duration: float = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error: Exception = None
+        #: Free storage for hooks, Ex.: the span of a tracing hook.
+        self.context: Dict[str, Any] = {}
+
+    @property
+    def name(self) -> str:
+        return f'{self.method} {self.endpoint}'
+
+
+class Hook:
+    """Base class of the instrumentation hooks, override the events you need.
+
+    Hooks are called synchronously in the thread that sends the request, so
+    they should be fast and must not raise.
+    """
+    def on_request_start(self, event: RequestEvent):
+        pass
+
+    def on_request_end(self, event: RequestEvent):
+        pass
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        pass
+
+    def on_cache(self, resource: str, hit: bool):
+        pass
+
+    def on_circuit_change(self, endpoint: str, state: str):
+        pass
+
+
+class LoggingHook(Hook):
+    """Log every request with the standard `logging` module.
+    """
+    def __init__(self,
+                 logger: logging.Logger = None,
+                 level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger('clicksign_api_wrapper')
+        self.level = level
+
+    def on_request_end(self, event: RequestEvent):
+        if event.error is not None and event.status is None:
+            self.logger.warning('ClickSign %s failed after %.3fs: %r',
+                                event.name, event.duration, event.error)
+            return
+        self.logger.log(self.level,
+                        'ClickSign %s -> %s in %.3fs (%d B out, %d B in)',
+                        event.name, event.status, event.duration,
+                        event.bytes_sent, event.bytes_received)
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        self.logger.warning(
+            'ClickSign %s attempt %d failed (%s), retrying in %.2fs',
+            event.name, event.attempt, event.status
+            or type(event.error).__name__, delay)
+
+    def on_cache(self, resource: str, hit: bool):
+        self.logger.log(self.level, 'ClickSign cache %s for %s',
+                        'hit' if hit else 'miss', resource)
+
+    def on_circuit_change(self, endpoint: str, state: str):
+        self.logger.warning('ClickSign %s circuit is now %s', endpoint, state)
+
+
+class LatencyRecorder(Hook):
+    """Keep the latest request durations per endpoint in memory to get percentiles.
+    """
+    def __init__(self, max_samples: int = 10000):
+        """Class constructor
+
+        Args:
+            max_samples (int, optional): Durations kept per endpoint, the oldest are dropped first. Defaults to 10000.
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.durations: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=self.max_samples))
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.retries = Counter()
+        self.cache_hits = Counter()
+        self.cache_misses = Counter()
+
+    def on_request_end(self, event: RequestEvent):
+        with self._lock:
+            self.durations[event.name].append(event.duration)
+            self.statuses[event.name][event.status] += 1
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        with self._lock:
+            self.retries[event.name] += 1
+
+    def on_cache(self, resource: str, hit: bool):
+        with self._lock:
+            (self.cache_hits if hit else self.cache_misses)[resource] += 1
+
+    def percentile(self, endpoint: str, percent: float) -> float:
+        """Duration percentile of an endpoint.
+
+        Args:
+            endpoint (str): Method and url template, Ex.: "GET documents/{key}"
+            percent (float): The percentile, between 0 and 100
+
+        Returns:
+            float: Duration in seconds, or `None` without samples
+        """
+        with self._lock:
+            samples = sorted(self.durations.get(endpoint, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, mean, p50, p90, p99 and max duration per endpoint.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The statistics by endpoint
+        """
+        with self._lock:
+            samples_by_endpoint = {
+                endpoint: sorted(samples)
+                for endpoint, samples in self.durations.items()
+            }
+        summary = {}
+        for endpoint, samples in samples_by_endpoint.items():
+            if not samples:
+                continue
+            count = len(samples)
+            summary[endpoint] = {
+                'count': count,
+                'mean': sum(samples) / count,
+                'p50': samples[min(count - 1, count * 50 // 100)],
+                'p90': samples[min(count - 1, count * 90 // 100)],
+                'p99': samples[min(count - 1, count * 99 // 100)],
+                'max': samples[-1],
+            }
+        return summary
+
+
+class TracingHook(Hook):
+    """Wrap every request attempt in an OpenTelemetry-style span.
+
+    `tracer` only needs `start_span(name, attributes=...)` returning a span
+    with `set_attribute(key, value)` and `end()`, so an OpenTelemetry tracer
+    can be passed without this package depending on it.
+    """
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def on_request_start(self, event: RequestEvent):
+        event.context['span'] = self.tracer.start_span(
+            f'ClickSign {event.name}',
+            attributes={
+                'http.method': event.method,
+                'http.route': event.endpoint,
+                'clicksign.attempt': event.attempt,
+            })
+
+    def on_request_end(self, event: RequestEvent):
+        span = event.context.pop('span', None)
+        if span is None:
+            return
+        if event.status is not None:
+            span.set_attribute('http.status_code', event.status)
+        span.set_attribute('http.request_content_length', event.bytes_sent)
+        span.set_attribute('http.response_content_length',
+                           event.bytes_received)
+        if event.error is not None:
+            span.set_attribute('error.type', type(event.error).__name__)
+        span.end()
+
+
+def notify(hooks: List[Hook], event_name: str, *args):
+    """Call an event on every hook.
+
+    Args:
+        hooks (List[Hook]): The installed hooks
+        event_name (str): The `Hook` method name, Ex.: "on_request_end"
+    """
+    for hook in hooks:
+        getattr(hook, event_name)(*args)
@@ -1,6 +1,22 @@
-class ListClass:
-    def __init__(self, metadata):
-        self.metadata = metadata
+from typing import Dict
 
-        for key, item in metadata["list"].items():
-            setattr(self, key, item)
\ No newline at end of file
+from .model import Field, Model
+
+
+class ListClass(Model):
+    __slots__ = ()
+    root = 'list'
+
+    key: str = Field()
+    request_signature_key: str = Field()
+    document_key: str = Field()
+    signer_key: str = Field()
+    sign_as: str = Field()
+    group: int = Field()
+    message: str = Field()
+    url: str = Field()
+    created_at: str = Field()
+    updated_at: str = Field()
+
+    def __init__(self, metadata: Dict):
+        super().__init__(metadata)
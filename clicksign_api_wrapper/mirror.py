@@ -0,0 +1,387 @@
+from __future__ import annotations
+import json
+import posixpath
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from timeit import default_timer as timer
+from typing import Dict, Iterable, List, Tuple, Union
+
+from .document import Document
+from .pagination import _as_datetime
+from .signer import Signer
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS documents ('
+    'key TEXT PRIMARY KEY, path TEXT, folder TEXT, status TEXT, '
+    'deadline_at REAL, updated_at TEXT, payload TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS signers ('
+    'key TEXT PRIMARY KEY, email TEXT, payload TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS lists ('
+    'key TEXT PRIMARY KEY, document_key TEXT NOT NULL, '
+    'signer_key TEXT NOT NULL, sign_as TEXT)',
+    'CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value)',
+    'CREATE INDEX IF NOT EXISTS documents_status ON documents (status)',
+    'CREATE INDEX IF NOT EXISTS documents_deadline_at '
+    'ON documents (deadline_at)',
+    'CREATE INDEX IF NOT EXISTS documents_folder ON documents (folder)',
+    'CREATE INDEX IF NOT EXISTS signers_email ON signers (email)',
+    'CREATE INDEX IF NOT EXISTS lists_signer_key ON lists (signer_key)',
+    'CREATE INDEX IF NOT EXISTS lists_document_key ON lists (document_key)',
+)
+
+
+def _timestamp(value: Union[str, datetime]) -> float:
+    """Dates are stored as UTC timestamps, the API strings have mixed offsets.
+    """
+    if not value:
+        return None
+    return _as_datetime(value).timestamp()
+
+
+def _folder(path: str) -> str:
+    return posixpath.dirname(path or '') or '/'
+
+
+class SyncResult:
+    """Counters of one `DocumentMirror.sync` run.
+    """
+    __slots__ = ('seen', 'changed', 'removed', 'elapsed', 'errors')
+
+    def __init__(self,
+                 seen: int,
+                 changed: int,
+                 removed: int,
+                 elapsed: float,
+                 errors: Dict[str, Exception] = None):
+        self.seen = seen
+        self.changed = changed
+        self.removed = removed
+        self.elapsed = elapsed
+        self.errors = errors or {}
+
+    def __repr__(self) -> str:
+        return (f'SyncResult(seen={self.seen}, changed={self.changed}, '
+                f'removed={self.removed}, errors={len(self.errors)})')
+
+
+class DocumentMirror:
+    """Local SQLite copy of the documents, signers and lists of an account.
+
+    `sync` walks the document listing and only stores the documents whose
+    `updated_at` changed since the last sync, fetching their details (signers
+    and lists) when the listing does not include them. Queries run on the
+    local copy, are indexed, and return `Document`/`Signer` objects bound to
+    the client.
+    """
+    def __init__(self,
+                 click_sign: 'ClickSign',
+                 path: str,
+                 concurrency: int = 4,
+                 timeout: float = 30):
+        """Class constructor
+
+        Args:
+            click_sign (ClickSign): The client used to sync and bound to the returned objects
+            path (str): The database file, created if missing. Use ":memory:" for a mirror that is not kept.
+            concurrency (int, optional): Max number of `get_document` requests in flight during a sync. Defaults to 4.
+            timeout (float, optional): Seconds to wait for a lock held by another process. Defaults to 30.
+        """
+        self.click_sign = click_sign
+        self.path = path
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path,
+                                   timeout=timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> DocumentMirror:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    #region ### Sync ###
+    @property
+    def last_synced_at(self) -> float:
+        """Unix time of the end of the last complete sync, `None` before the first one.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM sync_state WHERE name = 'last_synced_at'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def __known_updates(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(
+                self._db.execute('SELECT key, updated_at FROM documents'))
+
+    def __details(
+            self,
+            metadata: List[Dict]) -> Tuple[List[Dict], Dict[str, Exception]]:
+        """Complete the listed documents that have no signers and lists.
+
+        Returns:
+            Tuple[List[Dict], Dict[str, Exception]]: The completed documents, and the error of each key that could not be fetched
+        """
+        missing = [item['key'] for item in metadata if 'signers' not in item]
+        if not missing:
+            return metadata, {}
+        cache = getattr(self.click_sign, 'cache', None)
+
+        def get_document(key: str) -> Union[Dict, Exception]:
+            if cache is not None:
+                cache.invalidate('documents', key)
+            try:
+                return self.click_sign.get_document(key).metadata['document']
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            details = dict(zip(missing, executor.map(get_document, missing)))
+        errors = {
+            key: detail
+            for key, detail in details.items()
+            if isinstance(detail, Exception)
+        }
+        return [
+            details.get(item['key'], item)
+            for item in metadata if item['key'] not in errors
+        ], errors
+
+    def __store(self, documents: List[Dict]):
+        document_rows = []
+        signer_rows = []
+        list_rows = []
+        for document in documents:
+            document_rows.append(
+                (document['key'], document.get('path'),
+                 _folder(document.get('path')), document.get('status'),
+                 _timestamp(document.get('deadline_at')),
+                 document.get('updated_at'), json.dumps(document)))
+            for signer in document.get('signers') or ():
+                signer_rows.append(
+                    (signer['key'], signer.get('email'), json.dumps(signer)))
+            for item in document.get('lists') or ():
+                list_rows.append((item['key'], document['key'],
+                                  item.get('signer_key'), item.get('sign_as')))
+        keys = [(document['key'], ) for document in documents]
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO documents VALUES '
+                    '(?, ?, ?, ?, ?, ?, ?)', document_rows)
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO signers VALUES (?, ?, ?)',
+                    signer_rows)
+                # Lists removed from the document must go away too
+                self._db.executemany(
+                    'DELETE FROM lists WHERE document_key = ?', keys)
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO lists VALUES (?, ?, ?, ?)',
+                    list_rows)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+
+    def __remove(self, keys: Iterable[str]) -> int:
+        rows = [(key, ) for key in keys]
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.executemany(
+                    'DELETE FROM lists WHERE document_key = ?', rows)
+                self._db.executemany('DELETE FROM documents WHERE key = ?',
+                                     rows)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+        return len(rows)
+
+    def sync(self, batch_size: int = 100, prefetch: bool = True) -> SyncResult:
+        """Bring the mirror up to date with the account.
+
+        Documents whose `updated_at` did not change are skipped, documents no
+        longer listed are removed. Changes are committed every `batch_size`
+        documents, so an interrupted sync keeps its progress.
+
+        Args:
+            batch_size (int, optional): Changed documents written per transaction. Defaults to 100.
+            prefetch (bool, optional): Fetch the next listing page while the current one is processed. Defaults to True.
+
+        Returns:
+            SyncResult: How many documents were seen, changed and removed, and the documents that could not be fetched
+        """
+        start = timer()
+        known = self.__known_updates()
+        seen = set()
+        changed = 0
+        errors: Dict[str, Exception] = {}
+        pending: List[Dict] = []
+
+        def flush():
+            nonlocal changed
+            if pending:
+                # The documents that failed keep their old state, so the next
+                # sync fetches them again
+                documents, failed = self.__details(pending)
+                self.__store(documents)
+                changed += len(documents)
+                errors.update(failed)
+                pending.clear()
+
+        for document in self.click_sign.iter_documents(prefetch=prefetch):
+            metadata = document.metadata['document']
+            seen.add(metadata['key'])
+            if known.get(metadata['key']) == metadata.get('updated_at'):
+                continue
+            pending.append(metadata)
+            if len(pending) >= batch_size:
+                flush()
+        flush()
+
+        removed = self.__remove(set(known) - seen)
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES '
+                "('last_synced_at', ?)", (time.time(), ))
+        return SyncResult(len(seen), changed, removed, timer() - start,
+                          errors)
+
+    def refresh(self, document: Union[Document, str]) -> Document:
+        """Fetch one document again and store it, Ex.: after a webhook event.
+
+        Args:
+            document (Union[Document, str]): The document, or its key
+
+        Raises:
+            NotFound: The document does not exist
+
+        Returns:
+            Document: The fresh Document
+        """
+        key = document if isinstance(document, str) else document.key
+        documents, errors = self.__details([{'key': key}])
+        if errors:
+            raise errors[key]
+        [metadata] = documents
+        self.__store([metadata])
+        return Document(self.click_sign, {'document': metadata})
+
+    #endregion
+
+    #region ### Queries ###
+    def __select(self, sql: str, params: Tuple) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute(sql, params)]
+
+    def documents(self,
+                  status: str = None,
+                  signer_key: str = None,
+                  signer_email: str = None,
+                  folder: str = None,
+                  deadline_after: Union[str, datetime] = None,
+                  deadline_before: Union[str, datetime] = None,
+                  limit: int = None) -> List[Document]:
+        """Query the mirrored documents, ordered by deadline.
+
+        Args:
+            status (str, optional): Only documents with this status (running, closed, canceled). Defaults to None.
+            signer_key (str, optional): Only documents with this signer. Defaults to None.
+            signer_email (str, optional): Only documents with a signer with this email. Defaults to None.
+            folder (str, optional): Only documents directly inside this folder, Ex.: "/contracts/2021". Defaults to None.
+            deadline_after (Union[str, datetime], optional): Only documents with a deadline at or after this date. Defaults to None.
+            deadline_before (Union[str, datetime], optional): Only documents with a deadline before this date. Defaults to None.
+            limit (int, optional): Max number of documents. Defaults to None.
+
+        Returns:
+            List[Document]: The matching Documents
+        """
+        sql = 'SELECT DISTINCT documents.payload FROM documents'
+        where = []
+        params = []
+        if signer_key is not None or signer_email is not None:
+            sql += ' JOIN lists ON lists.document_key = documents.key'
+        if signer_email is not None:
+            sql += ' JOIN signers ON signers.key = lists.signer_key'
+            where.append('signers.email = ?')
+            params.append(signer_email)
+        if signer_key is not None:
+            where.append('lists.signer_key = ?')
+            params.append(signer_key)
+        if status is not None:
+            where.append('documents.status = ?')
+            params.append(status)
+        if folder is not None:
+            where.append('documents.folder = ?')
+            params.append('/' + folder.strip('/'))
+        if deadline_after is not None:
+            where.append('documents.deadline_at >= ?')
+            params.append(_timestamp(deadline_after))
+        if deadline_before is not None:
+            where.append('documents.deadline_at < ?')
+            params.append(_timestamp(deadline_before))
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY documents.deadline_at, documents.key'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [
+            Document(self.click_sign, {'document': json.loads(payload)})
+            for payload in self.__select(sql, tuple(params))
+        ]
+
+    def get_document(self, document_key: str) -> Document:
+        """The mirrored document, `None` if it is not in the mirror.
+        """
+        payloads = self.__select(
+            'SELECT payload FROM documents WHERE key = ?', (document_key, ))
+        if not payloads:
+            return None
+        return Document(self.click_sign,
+                        {'document': json.loads(payloads[0])})
+
+    def signers(self, email: str = None, document_key: str = None
+                ) -> List[Signer]:
+        """Query the mirrored signers.
+
+        Args:
+            email (str, optional): Only signers with this email. Defaults to None.
+            document_key (str, optional): Only signers of this document. Defaults to None.
+
+        Returns:
+            List[Signer]: The matching Signers
+        """
+        sql = 'SELECT DISTINCT signers.payload FROM signers'
+        where = []
+        params = []
+        if document_key is not None:
+            sql += ' JOIN lists ON lists.signer_key = signers.key'
+            where.append('lists.document_key = ?')
+            params.append(document_key)
+        if email is not None:
+            where.append('signers.email = ?')
+            params.append(email)
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        return [
+            Signer(self.click_sign, {'signer': json.loads(payload)})
+            for payload in self.__select(sql, tuple(params))
+        ]
+
+    #endregion
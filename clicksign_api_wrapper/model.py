@@ -0,0 +1,74 @@
+from typing import Any, Dict
+
+
+class Field:
+    """Read only attribute backed by the raw API data of a `Model`.
+
+    Missing fields read as `Model._missing`, `None` by default.
+    """
+    __slots__ = ('name', )
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance: 'Model', owner=None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance._data[self.name]
+        except KeyError:
+            return instance._missing(self.name)
+
+
+class Model:
+    """Base class of the objects returned by the API.
+
+    The raw response dict is kept once and every field is read from it on
+    access, so instances have no per-instance `__dict__` and hold no copy of
+    the data. Fields without a declared `Field` are still reachable as
+    attributes through `__getattr__`.
+    """
+    __slots__ = ('_metadata', '_data')
+    #: Name of the key that wraps the object in the API responses.
+    root: str = None
+
+    def __init__(self, metadata: Dict):
+        self._metadata = metadata
+        self._data = metadata[self.root]
+
+    @property
+    def metadata(self) -> Dict:
+        """The raw response, Ex.: `{"document": {...}}`.
+        """
+        return self._metadata
+
+    def _missing(self, name: str) -> Any:
+        """Value of a declared field absent from the data, subclasses may load it.
+        """
+        return None
+
+    def _replace(self, metadata: Dict):
+        """Swap the raw response this object reads from, Ex.: after loading it.
+        """
+        self._metadata = metadata
+        self._data = metadata[self.root]
+
+    def to_dict(self) -> Dict:
+        """Return the raw response this object was built from.
+
+        Returns:
+            Dict: The raw response, Ex.: `{"document": {...}}`
+        """
+        return self._metadata
+
+    def __getattr__(self, name: str) -> Any:
+        if not name.startswith('_'):
+            try:
+                return self._data[name]
+            except KeyError:
+                pass
+        raise AttributeError(
+            f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(key={self._data.get("key")!r})'
@@ -0,0 +1,243 @@
+from __future__ import annotations
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from timeit import default_timer as timer
+from typing import Callable, Dict, Iterable, List
+
+from .batch import Batch
+from .document import Document
+from .list_class import ListClass
+from .signer import SignatureAsTypes, Signer
+
+
+class SignerSpec:
+    """One party of a contract.
+
+    Pass `signer_key` to use an existing signer, or the `ClickSign.create_new_signer`
+    arguments (auths, name, email, ...) as kwargs to create a new one.
+    """
+    def __init__(self,
+                 sign_as: SignatureAsTypes,
+                 signer_key: str = None,
+                 **signer_fields):
+        self.sign_as = sign_as
+        self.signer_key = signer_key
+        self.signer_fields = signer_fields
+
+
+class ContractSpec:
+    """Everything needed to set up one contract.
+
+    Args:
+        template_key (str): The template key used as base document.
+        doc_path (str): The new document path (folder location and file name)
+        data (Dict): A dict with all customizable fields in the template.
+        signers (List[SignerSpec]): The parties that must sign the document.
+        config (Dict, optional): kwargs for `ClickSign.config_doc`. Defaults to None.
+    """
+    def __init__(self,
+                 template_key: str,
+                 doc_path: str,
+                 data: Dict,
+                 signers: List[SignerSpec],
+                 config: Dict = None):
+        self.template_key = template_key
+        self.doc_path = doc_path
+        self.data = data
+        self.signers = signers
+        self.config = config
+
+
+class ContractResult:
+    """The objects created for one contract, or the error that stopped it.
+    """
+    def __init__(self, spec: ContractSpec):
+        self.spec = spec
+        self.document: Document = None
+        self.signers: List[Signer] = [None] * len(spec.signers)
+        self.lists: List[ListClass] = [None] * len(spec.signers)
+        self.error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class OnboardingReport:
+    """Per contract results and throughput of an onboarding run.
+    """
+    def __init__(self, results: List[ContractResult],
+                 batches: Dict[str, Batch], batch_errors: Dict[str, Exception],
+                 requests: int, elapsed: float):
+        self.results = results
+        self.batches = batches
+        self.batch_errors = batch_errors
+        self.requests = requests
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> List[ContractResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[ContractResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def contracts_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+
+class _Step:
+    """One API call of a contract and the steps it waits for.
+    """
+    def __init__(self, result: ContractResult, func: Callable,
+                 depends_on: List[_Step]):
+        self.result = result
+        self.func = func
+        self.waiting = len(depends_on)
+        self.dependents: List[_Step] = []
+        for step in depends_on:
+            step.dependents.append(self)
+
+
+def _contract_steps(click_sign: 'ClickSign',
+                    result: ContractResult) -> List[_Step]:
+    """Build the dependency graph of one contract.
+
+    The document and the new signers are created in parallel, each signer is
+    added to the document as soon as both exist and the configuration only
+    waits for the document.
+    """
+    spec = result.spec
+
+    def create_document():
+        result.document = click_sign.create_new_doc_from_template(
+            spec.template_key, spec.doc_path, spec.data)
+
+    document_step = _Step(result, create_document, [])
+    steps = [document_step]
+
+    for index, signer_spec in enumerate(spec.signers):
+        depends_on = [document_step]
+        if signer_spec.signer_key:
+            result.signers[index] = Signer(click_sign,
+                                           signer_key=signer_spec.signer_key)
+        else:
+
+            def create_signer(index=index, signer_spec=signer_spec):
+                result.signers[index] = click_sign.create_new_signer(
+                    **signer_spec.signer_fields)
+
+            signer_step = _Step(result, create_signer, [])
+            steps.append(signer_step)
+            depends_on.append(signer_step)
+
+        def add_signer(index=index, signer_spec=signer_spec):
+            result.lists[index] = click_sign.add_signer_to_document(
+                result.document.key, result.signers[index].key,
+                signer_spec.sign_as)
+
+        steps.append(_Step(result, add_signer, depends_on))
+
+    if spec.config:
+
+        def config_document():
+            result.document = click_sign.config_doc(result.document.key,
+                                                    **spec.config)
+
+        steps.append(_Step(result, config_document, [document_step]))
+    return steps
+
+
+def _run_steps(steps: Iterable[_Step], concurrency: int) -> int:
+    """Run the steps as soon as their dependencies finish.
+
+    A failed step records the error in its contract and the steps that depend
+    on it are never run. The other contracts are not affected.
+
+    Returns:
+        int: The number of steps that were run
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        running: Dict[Future, _Step] = {}
+        submitted = 0
+
+        def submit(step: _Step):
+            nonlocal submitted
+            if step.result.ok:
+                running[executor.submit(step.func)] = step
+                submitted += 1
+
+        for step in steps:
+            if step.waiting == 0:
+                submit(step)
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    if step.result.ok:
+                        step.result.error = error
+                    continue
+                for dependent in step.dependents:
+                    dependent.waiting -= 1
+                    if dependent.waiting == 0:
+                        submit(dependent)
+    return submitted
+
+
+def onboard_contracts(click_sign: 'ClickSign',
+                      specs: Iterable[ContractSpec],
+                      concurrency: int = 10,
+                      batch_signers: bool = False) -> OnboardingReport:
+    """Set up many contracts at once running independent calls in parallel.
+
+    Args:
+        click_sign (ClickSign): The client used for all calls.
+        specs (Iterable[ContractSpec]): The contracts to set up.
+        concurrency (int, optional): Max number of requests in flight. Defaults to 10.
+        batch_signers (bool, optional): Create a batch for each signer that was added to more than one of the new documents. Defaults to False.
+
+    Returns:
+        OnboardingReport: Results and failures of each contract and the throughput of the run.
+    """
+    start = timer()
+    results = [ContractResult(spec) for spec in specs]
+    steps = [
+        step for result in results
+        for step in _contract_steps(click_sign, result)
+    ]
+    requests = _run_steps(steps, concurrency)
+
+    batches: Dict[str, Batch] = {}
+    batch_errors: Dict[str, Exception] = {}
+    if batch_signers:
+        documents_by_signer = defaultdict(list)
+        for result in results:
+            if result.ok:
+                for signer in result.signers:
+                    documents_by_signer[signer.key].append(result.document.key)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                signer_key:
+                executor.submit(click_sign.create_new_batch, document_keys,
+                                signer_key)
+                for signer_key, document_keys in documents_by_signer.items()
+                if len(document_keys) > 1
+            }
+        for signer_key, future in futures.items():
+            if future.exception() is None:
+                batches[signer_key] = future.result()
+            else:
+                batch_errors[signer_key] = future.exception()
+        requests += len(futures)
+
+    return OnboardingReport(results, batches, batch_errors, requests,
+                            timer() - start)
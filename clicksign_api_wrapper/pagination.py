@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, Union
+
+
+def iter_pages(fetch_page: Callable[[int], Dict],
+               prefetch: bool = False) -> Iterator[Dict]:
+    """Walk the pages of a paginated listing, one page in memory at a time.
+
+    The next page is `page_infos.next_page` when the API sends it, otherwise
+    pages are requested in order until one comes back empty.
+
+    Args:
+        fetch_page (Callable[[int], Dict]): Returns the decoded body of a page number, starting at 1
+        prefetch (bool, optional): Fetch the next page in a background thread while the current one is consumed. Defaults to False.
+
+    Yields:
+        Dict: The decoded body of each page
+    """
+    def next_page_of(body: Dict, page: int) -> int:
+        page_infos = body.get('page_infos')
+        if page_infos is not None:
+            return page_infos.get('next_page')
+        return page + 1 if body.get('documents') else None
+
+    if not prefetch:
+        page = 1
+        while page:
+            body = fetch_page(page)
+            yield body
+            page = next_page_of(body, page)
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = 1
+        future = executor.submit(fetch_page, page)
+        while future is not None:
+            body = future.result()
+            page = next_page_of(body, page)
+            future = executor.submit(fetch_page, page) if page else None
+            yield body
+
+
+def _as_datetime(value: Union[str, datetime]) -> datetime:
+    """An aware datetime, naive dates are taken as UTC so they compare with the API ones.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def document_filter(status: str = None,
+                    folder: str = None,
+                    created_after: Union[str, datetime] = None,
+                    created_before: Union[str, datetime] = None
+                    ) -> Callable[[Dict], bool]:
+    """Build a predicate over the raw document metadata.
+
+    Documents have no creation date, the dates are compared with their
+    `uploaded_at`. Dates without an offset are taken as UTC.
+
+    Args:
+        status (str, optional): Keep documents with this status (running, closed, canceled). Defaults to None.
+        folder (str, optional): Keep documents whose path is inside this folder. Defaults to None.
+        created_after (Union[str, datetime], optional): Keep documents created at or after this date. Defaults to None.
+        created_before (Union[str, datetime], optional): Keep documents created before this date. Defaults to None.
+
+    Returns:
+        Callable[[Dict], bool]: `True` for the documents to keep
+    """
+    if folder is not None:
+        folder = '/' + folder.strip('/') + '/'
+        if folder == '//':
+            folder = '/'
+    after = _as_datetime(created_after) if created_after else None
+    before = _as_datetime(created_before) if created_before else None
+
+    def keep(metadata: Dict) -> bool:
+        if status is not None and metadata.get('status') != status:
+            return False
+        if folder is not None and not metadata.get('path',
+                                                   '').startswith(folder):
+            return False
+        if after or before:
+            uploaded_at = metadata.get('uploaded_at')
+            if not uploaded_at:
+                return False
+            uploaded_at = _as_datetime(uploaded_at)
+            if after and uploaded_at < after:
+                return False
+            if before and uploaded_at >= before:
+                return False
+        return True
+
+    return keep
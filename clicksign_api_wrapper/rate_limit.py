@@ -0,0 +1,98 @@
+import os
+import struct
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread safe token bucket rate limiter for one process.
+
+    Every request takes one token. Tokens refill at `rate` per second up to
+    `capacity`, so short bursts are allowed and the sustained rate never goes
+    above `rate`. Callers that find the bucket empty reserve a token and sleep
+    exactly until it is refilled, so concurrent callers are spread evenly
+    instead of waking up together.
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        """Class constructor
+
+        Args:
+            rate (float): Sustained requests per second.
+            capacity (float, optional): Max burst size. Defaults to `rate`.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._stamp = time.time()
+
+    def _take(self, tokens: float, stamp: float, now: float):
+        """Refill the bucket and take one token.
+
+        Args:
+            tokens (float): The tokens left at `stamp`, negative when reserved
+            stamp (float): When the bucket was last updated
+            now (float): The current time
+
+        Returns:
+            Tuple[float, float]: The tokens left and the seconds to wait for the taken token
+        """
+        tokens = min(self.capacity, tokens + (now - stamp) * self.rate) - 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, wait
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait for it.
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens, wait = self._take(self._tokens, self._stamp, now)
+            self._stamp = now
+        return wait
+
+    def acquire(self):
+        """Block until the next request is allowed.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket shared by every process on the host that uses the same file.
+
+    The bucket state lives in `path` and is updated under an exclusive
+    `fcntl` lock, so it is only available on POSIX systems. Threads of the
+    same process are serialized by an in-process lock as well.
+    """
+    _STATE = struct.Struct('<dd')
+
+    def __init__(self, path: str, rate: float, capacity: float = None):
+        """Class constructor
+
+        Args:
+            path (str): The file that holds the shared bucket, created if missing.
+            rate (float): Sustained requests per second across all processes.
+            capacity (float, optional): Max burst size. Defaults to `rate`.
+        """
+        super().__init__(rate, capacity)
+        self.path = path
+
+    def _reserve(self) -> float:
+        import fcntl
+
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                data = os.pread(fd, self._STATE.size, 0)
+                now = time.time()
+                if len(data) == self._STATE.size:
+                    tokens, stamp = self._STATE.unpack(data)
+                else:
+                    tokens, stamp = self.capacity, now
+                tokens, wait = self._take(tokens, stamp, now)
+                os.pwrite(fd, self._STATE.pack(tokens, now), 0)
+            finally:
+                os.close(fd)
+        return wait
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+from .document import Document
+
+RELATIONS = ('lists', 'signers')
+
+
+def _fetch_many(fetch: Callable[[str], object], keys: Iterable[str],
+                concurrency: int) -> Dict[str, object]:
+    """Fetch each distinct key once, in parallel.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    workers = min(concurrency, len(keys))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(keys, executor.map(fetch, keys)))
+
+
+def prefetch_related(documents: Iterable[Document],
+                     *relations: str,
+                     concurrency: int = 8) -> List[Document]:
+    """Load the relations of many documents with one request per distinct resource.
+
+    Documents built from a partial payload (Ex.: a listing) are fetched once
+    for their lists, then every distinct signer missing from the payloads is
+    fetched once, in parallel, and shared by all the documents it signs.
+    Accessing `document.lists` and `document.signers` afterwards makes no
+    request.
+
+    Args:
+        documents (Iterable[Document]): The documents, bound to a client
+        relations (str): "lists" and/or "signers". Defaults to both.
+        concurrency (int, optional): Max number of requests in flight. Defaults to 8.
+
+    Raises:
+        ValueError: Unknown relation
+
+    Returns:
+        List[Document]: The same documents
+    """
+    documents = list(documents)
+    relations = set(relations or RELATIONS)
+    unknown = relations - set(RELATIONS)
+    if unknown:
+        raise ValueError(
+            f'Unknown relations {sorted(unknown)}, use {list(RELATIONS)}')
+    if not documents:
+        return documents
+
+    # Lists are needed to know the signers of the documents without them
+    partial = [
+        document for document in documents
+        if document._data.get('lists') is None and (
+            'lists' in relations or document._data.get('signers') is None)
+    ]
+    partial_by_key = {document.key: document for document in partial}
+    fetched = _fetch_many(
+        lambda key: partial_by_key[key].click_sign.get_document(key),
+        partial_by_key, concurrency)
+    for document in partial:
+        document._replace(fetched[document.key].metadata)
+
+    if 'signers' not in relations:
+        return documents
+
+    missing = [
+        document for document in documents
+        if document._signers is None and document._data.get('signers') is None
+    ]
+    signer_owner = {}
+    for document in missing:
+        for item in document.lists:
+            signer_owner.setdefault(item.signer_key, document)
+    signers = _fetch_many(
+        lambda key: signer_owner[key].click_sign.get_signer(key),
+        signer_owner, concurrency)
+    for document in missing:
+        document._set_signers(
+            [signers[item.signer_key] for item in document.lists])
+    return documents
@@ -0,0 +1,161 @@
+import contextlib
+import contextvars
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable, Iterator
+
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+from urllib3.exceptions import ConnectTimeoutError
+
+from .exceptions import (BadGateway, GatewayTimeout, ServiceUnavailable,
+                         TooManyRequests, UnknownServerError)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+_SINGLE_ATTEMPT = contextvars.ContextVar('clicksign_single_attempt',
+                                         default=False)
+
+
+def was_not_sent(error: Exception) -> bool:
+    """Tell if a request failed before reaching the server: its connection was refused or timed out.
+    """
+    if isinstance(error, ConnectTimeout):
+        return True
+    if not isinstance(error, ConnectionError) or not error.args:
+        return False
+    # requests wraps the urllib3 MaxRetryError, whose reason is the cause
+    reason = getattr(error.args[0], 'reason', error.args[0])
+    return isinstance(reason, ConnectTimeoutError)
+
+
+@contextlib.contextmanager
+def single_attempt() -> Iterator[None]:
+    """Send the requests of the block once, for callers that retry on their own, Ex.: `WorkQueue`.
+    """
+    reset = _SINGLE_ATTEMPT.set(True)
+    try:
+        yield
+    finally:
+        _SINGLE_ATTEMPT.reset(reset)
+
+
+class RetryPolicy:
+    """Retry transient ClickSign failures with exponential backoff and jitter.
+
+    By default only idempotent methods are retried. Statuses in
+    `any_method_statuses` (429 by default) mean the request was not processed,
+    so they are retried for every method, like the connections refused or
+    timed out before the request was sent. When the server sends `Retry-After`
+    it is used instead of the computed backoff (still limited by `backoff_cap`).
+    """
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_cap: float = 30,
+                 jitter: bool = True,
+                 statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 any_method_statuses: Iterable[int] = (429, ),
+                 retry_connection_errors: bool = True,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Class constructor
+
+        Args:
+            max_attempts (int, optional): Total attempts per call, `1` disables retries. Defaults to 3.
+            backoff_base (float, optional): Delay in seconds before the first retry, doubled at each attempt. Defaults to 0.5.
+            backoff_cap (float, optional): Max delay in seconds between attempts. Defaults to 30.
+            jitter (bool, optional): Use a random delay between 0 and the backoff ("full jitter"). Defaults to True.
+            statuses (Iterable[int], optional): HTTP statuses that can be retried. Defaults to (429, 500, 502, 503, 504).
+            methods (Iterable[str], optional): HTTP methods that can be retried. Defaults to IDEMPOTENT_METHODS.
+            any_method_statuses (Iterable[int], optional): Statuses retried whatever the method. Defaults to (429, ).
+            retry_connection_errors (bool, optional): Retry connection errors and timeouts of the allowed methods. Defaults to True.
+            sleep (Callable[[float], None], optional): Function used to wait between attempts. Defaults to time.sleep.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.any_method_statuses = frozenset(any_method_statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.retries = Counter()
+        self.exhausted = Counter()
+
+    def is_retryable(self, method: str, error: Exception) -> bool:
+        """Check if a failed attempt can be retried.
+
+        Args:
+            method (str): The HTTP method of the request
+            error (Exception): The error raised by the attempt
+
+        Returns:
+            bool: `True` if the request can be sent again
+        """
+        status = getattr(error, 'status_code', None)
+        if status is not None:
+            if status not in self.statuses:
+                return False
+            return status in self.any_method_statuses or method.upper(
+            ) in self.methods
+        if isinstance(error, (ConnectionError, Timeout)):
+            return self.retry_connection_errors and (
+                method.upper() in self.methods or was_not_sent(error))
+        return False
+
+    def backoff(self, attempt: int, error: Exception = None) -> float:
+        """Delay before the next attempt.
+
+        Args:
+            attempt (int): The number of the attempt that failed, starting at 1
+            error (Exception, optional): The error of the failed attempt. Defaults to None.
+
+        Returns:
+            float: Seconds to wait
+        """
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        delay = min(self.backoff_cap, self.backoff_base * 2**(attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def call(self,
+             method: str,
+             request_func: Callable,
+             on_retry: Callable[[Exception, float], None] = None):
+        """Call `request_func` retrying the transient failures.
+
+        Args:
+            method (str): The HTTP method of the request
+            request_func (Callable): Sends the request and returns the checked response
+            on_retry (Callable[[Exception, float], None], optional): Called with the error and the delay before each retry. Defaults to None.
+
+        Returns:
+            The `request_func` result
+        """
+        single = _SINGLE_ATTEMPT.get()
+        attempt = 1
+        while True:
+            try:
+                return request_func()
+            except (TooManyRequests, UnknownServerError, BadGateway,
+                    ServiceUnavailable, GatewayTimeout, ConnectionError,
+                    Timeout) as error:
+                key = getattr(error, 'status_code', type(error).__name__)
+                if single or not self.is_retryable(method, error):
+                    raise
+                if attempt >= self.max_attempts:
+                    with self._lock:
+                        self.exhausted[key] += 1
+                    raise
+                with self._lock:
+                    self.retries[key] += 1
+                delay = self.backoff(attempt, error)
+                if on_retry is not None:
+                    on_retry(error, delay)
+                self.sleep(delay)
+                attempt += 1
@@ -0,0 +1,112 @@
+import json
+from typing import Any, Dict, List, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JSONSerializer:
+    """Encode request bodies and decode responses with the stdlib `json`.
+
+    Subclasses use faster libraries, see `get_serializer`.
+    """
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'),
+                          ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class OrjsonSerializer(JSONSerializer):
+    """Serializer backed by `orjson` (`pip install orjson`).
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson is not installed')
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecSerializer(JSONSerializer):
+    """Serializer backed by `msgspec` (`pip install msgspec`), reusing one encoder and decoder.
+    """
+    name = 'msgspec'
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError('msgspec is not installed')
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+#: Serializers by name, the fastest first.
+SERIALIZERS = {
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgspecSerializer.name: MsgspecSerializer,
+    JSONSerializer.name: JSONSerializer,
+}
+
+
+def available_serializers() -> List[str]:
+    """Names of the serializers whose library is installed, the fastest first.
+    """
+    installed = {'orjson': orjson, 'msgspec': msgspec, 'json': json}
+    return [name for name in SERIALIZERS if installed[name] is not None]
+
+
+def get_serializer(name: str = None) -> JSONSerializer:
+    """Build a serializer.
+
+    Args:
+        name (str, optional): One of SERIALIZERS. Defaults to the fastest installed one.
+
+    Raises:
+        ValueError: Unknown name
+        ImportError: The library of the serializer is not installed
+
+    Returns:
+        JSONSerializer: The serializer
+    """
+    if name is None:
+        name = available_serializers()[0]
+    if name not in SERIALIZERS:
+        raise ValueError(
+            f'Unknown serializer {name!r}, use one of {list(SERIALIZERS)}')
+    return SERIALIZERS[name]()
+
+
+#: Serializer used when a client is not given one.
+DEFAULT_SERIALIZER: JSONSerializer = get_serializer()
+
+
+def decode_response(resp, serializer: JSONSerializer = None) -> Dict:
+    """Decode a response body, an empty body decodes to an empty dict.
+    """
+    if not resp.content:
+        return {}
+    return (serializer or DEFAULT_SERIALIZER).loads(resp.content)
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, List
+
+from .model import Field, Model
 
 
 class SignatureAuthTypes():
@@ -69,14 +71,44 @@ class SignatureAsTypes():
     WITNESS = 'witness'
 
 
-class Signer:
+class Signer(Model):
+    __slots__ = ('click_sign', )
+    root = 'signer'
+
+    key: str = Field()
+    email: str = Field()
+    auths: List[str] = Field()
+    name: str = Field()
+    documentation: str = Field()
+    birthday: str = Field()
+    phone_number: str = Field()
+    has_documentation: bool = Field()
+    delivery: str = Field()
+    created_at: str = Field()
+
     def __init__(self,
                  click_sign: 'ClickSign',
                  metadata: Dict = None,
                  signer_key: str = None):
         self.click_sign = click_sign
-        if signer_key and not metadata:
-            self.key = signer_key
-        if metadata:
-            for key, item in metadata["signer"].items():
-                setattr(self, key, item)
+        if not metadata:
+            metadata = {'signer': {'key': signer_key} if signer_key else {}}
+        super().__init__(metadata)
+
+    @property
+    def is_deferred(self) -> bool:
+        """`True` while only the key is known, the other fields are loaded on first access.
+        """
+        return set(self._data) == {'key'}
+
+    def load(self) -> Signer:
+        """Fetch the signer fields now.
+        """
+        self._replace(self.click_sign.get_signer(self.key).metadata)
+        return self
+
+    def _missing(self, name: str):
+        if self.click_sign is not None and self.is_deferred:
+            self.load()
+            return self._data.get(name)
+        return None
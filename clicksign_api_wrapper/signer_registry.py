@@ -0,0 +1,200 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Union
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def _flatten(auths: Union[str, Iterable]) -> list:
+    if auths is None:
+        return []
+    if isinstance(auths, str):
+        return [auths]
+    return [auth for item in auths for auth in _flatten(item)]
+
+
+def signer_fingerprint(scope: str, signer: Dict) -> str:
+    """Identify a signer by its normalised contact and documentation.
+
+    The email is trimmed and lower cased, only the digits of the phone number
+    and of the CPF are kept and the auths are sorted, so `" Ana@X.com "` and
+    `"ana@x.com"` are the same signer.
+
+    Args:
+        scope (str): Separates the accounts sharing a store, Ex.: the token
+        signer (Dict): The signer fields sent to `signers`
+
+    Returns:
+        str: SHA256 hex digest
+    """
+    email = (signer.get('email') or '').strip().lower()
+    phone_number = _NON_DIGITS.sub('', signer.get('phone_number') or '')
+    documentation = _NON_DIGITS.sub('', signer.get('documentation') or '')
+    auths = sorted(set(_flatten(signer.get('auths'))))
+    canonical = json.dumps([scope, email, phone_number, documentation, auths],
+                           separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class SignerStore:
+    """Storage used by `SignerRegistry`. Subclass it to keep the signers elsewhere.
+    """
+    def get(self, fingerprint: str) -> Dict:
+        """Return the stored signer data or `None`.
+        """
+        raise NotImplementedError
+
+    def set(self, fingerprint: str, signer: Dict):
+        """Store the signer data created for a fingerprint.
+        """
+        raise NotImplementedError
+
+    def delete(self, fingerprint: str):
+        """Remove a signer, if present.
+        """
+        raise NotImplementedError
+
+
+class MemorySignerStore(SignerStore):
+    """Thread safe in-memory store, lost when the process exits.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signers: Dict[str, Dict] = {}
+
+    def get(self, fingerprint: str) -> Dict:
+        with self._lock:
+            return self._signers.get(fingerprint)
+
+    def set(self, fingerprint: str, signer: Dict):
+        with self._lock:
+            self._signers[fingerprint] = signer
+
+    def delete(self, fingerprint: str):
+        with self._lock:
+            self._signers.pop(fingerprint, None)
+
+    def __len__(self) -> int:
+        return len(self._signers)
+
+
+class SQLiteSignerStore(SignerStore):
+    """Store kept in a SQLite file, it survives restarts and can be shared by processes.
+    """
+    def __init__(self, path: str, timeout: float = 30):
+        """Class constructor
+
+        Args:
+            path (str): The database file, created if missing
+            timeout (float, optional): Seconds to wait for a lock held by another process. Defaults to 30.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path,
+                                   timeout=timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS signers ('
+                         'fingerprint TEXT PRIMARY KEY, '
+                         'key TEXT NOT NULL, '
+                         'payload TEXT NOT NULL)')
+
+    def get(self, fingerprint: str) -> Dict:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT payload FROM signers WHERE fingerprint = ?',
+                (fingerprint, )).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, fingerprint: str, signer: Dict):
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO signers VALUES (?, ?, ?)',
+                (fingerprint, signer.get('key'), json.dumps(signer)))
+
+    def delete(self, fingerprint: str):
+        with self._lock:
+            self._db.execute('DELETE FROM signers WHERE fingerprint = ?',
+                             (fingerprint, ))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SignerRegistry:
+    """Reuse the signers already created instead of creating duplicates.
+
+    `ClickSign.create_new_signer` looks the signer fingerprint up here first
+    (see `signer_fingerprint`) and only calls the API for unknown signers.
+    Concurrent creates of the same signer are merged into one request.
+    """
+    def __init__(self, store: SignerStore = None):
+        """Class constructor
+
+        Args:
+            store (SignerStore, optional): Where the created signers are kept. Defaults to MemorySignerStore().
+        """
+        self.store = store if store is not None else MemorySignerStore()
+        self._lock = threading.Lock()
+        self._creating: Dict[str, Future] = {}
+        self.hits = 0
+        self.created = 0
+
+    def get_or_create(self, scope: str, signer: Dict,
+                      create: Callable[[], Dict]) -> Dict:
+        """Return the known signer data, or create it once.
+
+        Args:
+            scope (str): Separates the accounts sharing a store, Ex.: the token
+            signer (Dict): The signer fields sent to `signers`
+            create (Callable[[], Dict]): Creates the signer and returns its data
+
+        Returns:
+            Dict: The signer data, Ex.: `{"key": ..., "email": ...}`
+        """
+        fingerprint = signer_fingerprint(scope, signer)
+        with self._lock:
+            future = self._creating.get(fingerprint)
+            owner = future is None
+            if owner:
+                future = self._creating[fingerprint] = Future()
+        if not owner:
+            # Another thread is creating the same signer
+            with self._lock:
+                self.hits += 1
+            return future.result()
+
+        try:
+            data = self.store.get(fingerprint)
+            if data is not None:
+                with self._lock:
+                    self.hits += 1
+            else:
+                data = create()
+                self.store.set(fingerprint, data)
+                with self._lock:
+                    self.created += 1
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._lock:
+                del self._creating[fingerprint]
+
+    def forget(self, scope: str, signer: Dict):
+        """Create the signer again on the next call, Ex.: after it was changed in ClickSign.
+
+        Args:
+            scope (str): The scope used when it was created
+            signer (Dict): The signer fields
+        """
+        self.store.delete(signer_fingerprint(scope, signer))
@@ -0,0 +1,245 @@
+from __future__ import annotations
+import csv
+import io
+import os
+import re
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Tuple,
+                    Union)
+
+from .bulk import iter_bulk
+from .exceptions import InvalidRow
+from .rate_limit import TokenBucket
+
+#: A doc path pattern filled with the row fields, or a function of the row.
+PathSpec = Union[str, Callable[[Dict], str]]
+
+
+def template_doc_path(doc_path: str) -> str:
+    """Add / to the begin of a template doc path and .docx to the end.
+    """
+    doc_path = doc_path if doc_path.startswith("/") else f'/{doc_path}'
+    return doc_path if doc_path.endswith(".docx") else f'{doc_path}.docx'
+
+
+class TemplateField:
+    """One customizable field of a template and the rules its value must follow.
+
+    Values are sent as strings, `None` and `""` count as missing.
+    """
+    __slots__ = ('name', 'required', 'max_length', 'pattern', 'choices')
+
+    def __init__(self,
+                 name: str,
+                 required: bool = True,
+                 max_length: int = None,
+                 pattern: str = None,
+                 choices: Iterable[str] = None):
+        """Class constructor
+
+        Args:
+            name (str): The field name in the template
+            required (bool, optional): The row must have a value. Defaults to True.
+            max_length (int, optional): Max number of characters. Defaults to None.
+            pattern (str, optional): Regular expression the whole value must match. Defaults to None.
+            choices (Iterable[str], optional): The accepted values. Defaults to None.
+        """
+        self.name = name
+        self.required = required
+        self.max_length = max_length
+        self.pattern = re.compile(pattern) if pattern else None
+        self.choices = frozenset(choices) if choices is not None else None
+
+    @classmethod
+    def from_metadata(cls, metadata: Union[str, Dict]) -> TemplateField:
+        """Build a field from the template metadata, a name or a dict with `name` and the rules.
+        """
+        if isinstance(metadata, str):
+            return cls(metadata)
+        return cls(metadata['name'],
+                   required=metadata.get('required', True),
+                   max_length=metadata.get('max_length'),
+                   pattern=metadata.get('pattern'),
+                   choices=metadata.get('choices'))
+
+    def compile(self) -> Callable[[Any], Tuple[str, str]]:
+        """Build the check of this field, it returns the value to send and the error, if any.
+        """
+        name, required = self.name, self.required
+        checks = []
+        if self.max_length is not None:
+            max_length = self.max_length
+            checks.append(lambda value: None if len(value) <= max_length else
+                          f'{name} is longer than {max_length} characters')
+        if self.pattern is not None:
+            fullmatch = self.pattern.fullmatch
+            checks.append(lambda value: None if fullmatch(value) else
+                          f'{name} does not match {self.pattern.pattern!r}')
+        if self.choices is not None:
+            choices = self.choices
+            checks.append(lambda value: None if value in choices else
+                          f'{name} must be one of {sorted(choices)}')
+
+        def check(value: Any) -> Tuple[str, str]:
+            if value is None or value == '':
+                return None, f'{name} is required' if required else None
+            value = value if isinstance(value, str) else str(value)
+            for rule in checks:
+                error = rule(value)
+                if error is not None:
+                    return value, error
+            return value, None
+
+        return check
+
+    def __repr__(self) -> str:
+        return f'TemplateField({self.name!r}, required={self.required})'
+
+
+def csv_rows(source: Union[str, os.PathLike, io.TextIOBase],
+             **fmtparams) -> Iterator[Dict[str, str]]:
+    """Stream the rows of a CSV file as dicts, the first line has the field names.
+
+    Args:
+        source (Union[str, os.PathLike, io.TextIOBase]): A file path, or a text file opened with `newline=''`
+        fmtparams: `csv.DictReader` options, Ex.: `delimiter=';'`
+
+    Yields:
+        Dict[str, str]: Each row
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='', encoding='utf-8-sig') as file:
+            yield from csv.DictReader(file, **fmtparams)
+    else:
+        yield from csv.DictReader(source, **fmtparams)
+
+
+class Template:
+    """Create many documents from one template, validating each row before it is sent.
+
+    The field schema is loaded once (or given) and compiled into one check per
+    field, so each row only costs its checks. Rows that break the schema are rejected locally with an
+    `InvalidRow`, without the request that would fail with
+    `UnProcessableEntity`. Columns that are not template fields are used to
+    fill the doc path but are not sent.
+    """
+    def __init__(self,
+                 click_sign: 'ClickSign',
+                 template_key: str,
+                 path: PathSpec,
+                 fields: Iterable[Union[str, Dict, TemplateField]] = None):
+        """Class constructor
+
+        Args:
+            click_sign (ClickSign): The client used to load the schema and create the documents
+            template_key (str): The template key used as base document
+            path (PathSpec): The doc path of each row, a pattern like "contracts/{name}" or a function of the row
+            fields (Iterable[Union[str, Dict, TemplateField]], optional): The template fields. Defaults to the fields in `ClickSign.get_template`.
+        """
+        self.click_sign = click_sign
+        self.template_key = template_key
+        if fields is None:
+            fields = click_sign.get_template(template_key).get('fields') or []
+        self.fields: List[TemplateField] = [
+            field if isinstance(field, TemplateField) else
+            TemplateField.from_metadata(field) for field in fields
+        ]
+        self.path = path
+        self.__checks = tuple((field.name, field.compile())
+                              for field in self.fields)
+        if callable(path):
+            self.__doc_path = lambda row: template_doc_path(path(row))
+        else:
+            self.__doc_path = lambda row: template_doc_path(
+                path.format_map(row))
+
+    def validate(self, row: Dict) -> Dict[str, str]:
+        """Check a row against the schema.
+
+        Returns:
+            Dict[str, str]: The error of each invalid field, empty if the row is valid
+        """
+        try:
+            self.build(row)
+        except InvalidRow as error:
+            return error.errors
+        return {}
+
+    def build(self, row: Dict) -> Tuple[str, Dict[str, str]]:
+        """Check a row and build what is sent for it.
+
+        Args:
+            row (Dict): The values of the fields, and of the path pattern columns
+
+        Raises:
+            InvalidRow: The row breaks the schema or misses a path column
+
+        Returns:
+            Tuple[str, Dict[str, str]]: The doc path and the template data
+        """
+        data = {}
+        errors = {}
+        get = row.get
+        for name, check in self.__checks:
+            value, error = check(get(name))
+            if error is not None:
+                errors[name] = error
+            elif value is not None:
+                data[name] = value
+        try:
+            doc_path = self.__doc_path(row)
+        except KeyError as error:
+            errors['path'] = f'{error.args[0]} is required by the path'
+        if errors:
+            raise InvalidRow(errors)
+        return doc_path, data
+
+    def create(self, row: Dict) -> 'Document':
+        """Check a row and create its document.
+
+        Raises:
+            InvalidRow: The row breaks the schema, nothing was sent
+
+        Returns:
+            Document: The new Document
+        """
+        doc_path, data = self.build(row)
+        return self.click_sign.create_new_doc_from_template(
+            self.template_key, doc_path, data)
+
+    def render(self,
+               rows: Iterable[Dict],
+               concurrency: int = 10,
+               rate: float = None) -> Iterator[Tuple[int, Any]]:
+        """Create a document for each row in parallel, yielding each result as it completes.
+
+        Rows are read and checked lazily, so a CSV file (see `csv_rows`) or a
+        generator of any size is processed in constant memory. Invalid rows are
+        yielded with their `InvalidRow` as soon as they are read and use no
+        request.
+
+        Args:
+            rows (Iterable[Dict]): The rows, Ex.: `csv_rows("contracts.csv")`
+            concurrency (int, optional): Max number of requests in flight. Set `pool_maxsize` to at least this value. Defaults to 10.
+            rate (float, optional): Max requests started per second, on top of the client `rate_limiter`. Defaults to None.
+
+        Yields:
+            Tuple[int, Any]: The index of each row with its Document, its `InvalidRow` or the raised exception
+        """
+        limiter = TokenBucket(rate, 1) if rate else None
+
+        def create(item: Tuple[int, Dict]) -> 'Document':
+            # Checked in the worker, so an invalid row is yielded as soon as
+            # it is read and takes no rate token
+            doc_path, data = self.build(item[1])
+            if limiter is not None:
+                limiter.acquire()
+            return self.click_sign.create_new_doc_from_template(
+                self.template_key, doc_path, data)
+
+        for (index, _), result in iter_bulk(create, enumerate(rows),
+                                            concurrency):
+            yield index, result
+
+    def __repr__(self) -> str:
+        return (f'Template({self.template_key!r}, '
+                f'fields={[field.name for field in self.fields]})')
@@ -0,0 +1,325 @@
+from __future__ import annotations
+import hashlib
+import http.cookiejar
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from .async_clicksign import AsyncClickSign
+from .cache import CacheBackend, ClientCache, MemoryCache
+from .circuit_breaker import CircuitBreaker
+from .clicksign import ApiEnv, ClickSign
+from .instrumentation import Hook, RequestEvent
+from .rate_limit import TokenBucket
+from .retry import RetryPolicy
+from .serialization import JSONSerializer, get_serializer
+from .timeouts import EndpointTimeouts
+
+
+class TenantMetrics(Hook):
+    """Request, error, retry and cache counters of one tenant.
+    """
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        self._lock = threading.Lock()
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_time = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def on_request_start(self, event: RequestEvent):
+        with self._lock:
+            self.in_flight += 1
+            self.last_used = time.monotonic()
+
+    def on_request_end(self, event: RequestEvent):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            if event.error is not None:
+                self.errors += 1
+            self.request_time += event.duration
+            self.bytes_sent += event.bytes_sent
+            self.bytes_received += event.bytes_received
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        with self._lock:
+            self.retries += 1
+
+    def on_cache(self, resource: str, hit: bool):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def snapshot(self) -> Dict:
+        """The counters, Ex.: `{"requests": 10, "errors": 1, ...}`.
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'retries': self.retries,
+                'in_flight': self.in_flight,
+                'mean_request_ms': (self.request_time / self.requests * 1000
+                                    if self.requests else 0.0),
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'idle_s': time.monotonic() - self.last_used,
+            }
+
+
+class _Tenant:
+    __slots__ = ('client', 'metrics', 'async_client')
+
+    def __init__(self, client: ClickSign, metrics: TenantMetrics):
+        self.client = client
+        self.metrics = metrics
+        self.async_client: AsyncClickSign = None
+
+
+class ClickSignPool:
+    """Hand out one client per ClickSign token, all sharing one connection pool.
+
+    Every tenant (token) gets its own rate limiter, cache namespace and
+    metrics, while the HTTP session, the retry policy, the cache storage and
+    the async worker threads are shared, so thousands of tenants fit in one
+    process. Tenants idle for `idle_timeout` seconds, or the least recently
+    used ones above `max_tenants`, are evicted.
+
+    Tenants are identified by a hash of their token, so tokens never show up
+    in cache keys or metrics.
+    """
+    def __init__(self,
+                 api_env=ApiEnv.SANDBOX,
+                 timeout: float = 10,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 50,
+                 keep_alive: bool = True,
+                 rate: float = None,
+                 capacity: float = None,
+                 cache: bool = True,
+                 cache_backend: CacheBackend = None,
+                 cache_ttl: Dict[str, float] = None,
+                 retry: RetryPolicy = None,
+                 hooks: List[Hook] = None,
+                 serializer: JSONSerializer = None,
+                 timeouts: EndpointTimeouts = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 idle_timeout: float = 600,
+                 max_tenants: int = 10000,
+                 max_concurrency: int = 100):
+        """Class constructor
+
+        Args:
+            api_env ([type], optional): Set the environment as ApiEnv.SANDBOX or ApiEnv.PROD. Defaults to ApiEnv.SANDBOX.
+            timeout (float, optional): Set a time out in seconds for all api requests. Defaults to 10.
+            pool_connections (int, optional): Number of host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Max number of connections kept open per host, for all tenants. Defaults to 50.
+            keep_alive (bool, optional): Reuse connections between requests. Defaults to True.
+            rate (float, optional): Requests per second allowed to each tenant, `None` for no limit. Defaults to None.
+            capacity (float, optional): Burst size of each tenant. Defaults to `rate`.
+            cache (bool, optional): Cache the GET responses of each tenant. Defaults to True.
+            cache_backend (CacheBackend, optional): Storage shared by the tenant caches. Defaults to MemoryCache(maxsize=10000).
+            cache_ttl (Dict[str, float], optional): Seconds to keep each resource. Defaults to ClientCache.DEFAULT_TTL.
+            retry (RetryPolicy, optional): Retry policy shared by the tenants. Defaults to RetryPolicy().
+            hooks (List[Hook], optional): Hooks added to every tenant client. Defaults to None.
+            serializer (JSONSerializer, optional): Serializer shared by the tenants. Defaults to the fastest installed one.
+            timeouts (EndpointTimeouts, optional): Endpoint timeouts shared by the tenants, adapted to the latency seen by all of them. Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): Breaker shared by the tenants, so they all stop calling a failing endpoint. Defaults to None.
+            idle_timeout (float, optional): Seconds without a request after which a tenant is evicted. Defaults to 600.
+            max_tenants (int, optional): Max number of tenants kept, the least recently used are evicted first. Defaults to 10000.
+            max_concurrency (int, optional): Worker threads shared by the async clients. Defaults to 100.
+        """
+        self.api_env = api_env
+        self.timeout = timeout
+        self.rate = rate
+        self.capacity = capacity
+        self.cache_backend = None
+        if cache:
+            self.cache_backend = (cache_backend if cache_backend is not None
+                                  else MemoryCache(maxsize=10000))
+        self.cache_ttl = cache_ttl
+        self.retry = retry or RetryPolicy()
+        self.hooks: List[Hook] = list(hooks or [])
+        self.serializer = serializer or get_serializer()
+        self.timeouts = timeouts
+        self.circuit_breaker = circuit_breaker
+        self.idle_timeout = idle_timeout
+        self.max_tenants = max_tenants
+        self.max_concurrency = max_concurrency
+        self.session = ClickSign.new_session(pool_connections, pool_maxsize,
+                                             keep_alive)
+        # Tenants share the session, never let a cookie cross from one to another
+        self.session.cookies.set_policy(
+            http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        self._lock = threading.Lock()
+        self._tenants: OrderedDict = OrderedDict()
+        self._executor: ThreadPoolExecutor = None
+        self._swept_at = time.monotonic()
+        self.evicted = 0
+
+    def __enter__(self) -> ClickSignPool:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def tenant_id(token: str) -> str:
+        """The id of a token in the cache keys and metrics.
+        """
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+
+    def __new_tenant(self, token: str, tenant_id: str) -> _Tenant:
+        metrics = TenantMetrics(tenant_id)
+        cache = None
+        if self.cache_backend is not None:
+            cache = ClientCache(self.cache_backend,
+                                ttl=self.cache_ttl,
+                                namespace=f'{tenant_id}:')
+        rate_limiter = None
+        if self.rate is not None:
+            rate_limiter = TokenBucket(self.rate, self.capacity)
+        client = ClickSign(token,
+                           api_env=self.api_env,
+                           timeout=self.timeout,
+                           session=self.session,
+                           retry=self.retry,
+                           rate_limiter=rate_limiter,
+                           cache=cache,
+                           hooks=[metrics] + self.hooks,
+                           serializer=self.serializer,
+                           timeouts=self.timeouts,
+                           circuit_breaker=self.circuit_breaker)
+        return _Tenant(client, metrics)
+
+    def __tenant(self, token: str) -> _Tenant:
+        tenant_id = self.tenant_id(token)
+        evicted = []
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is None:
+                tenant = self._tenants[tenant_id] = self.__new_tenant(
+                    token, tenant_id)
+            else:
+                self._tenants.move_to_end(tenant_id)
+            tenant.metrics.last_used = time.monotonic()
+            while len(self._tenants) > self.max_tenants:
+                evicted.append(self._tenants.popitem(last=False)[1])
+            evicted.extend(self.__pop_idle())
+        self.__close_tenants(evicted)
+        return tenant
+
+    def get(self, token: str) -> ClickSign:
+        """The client of a token, created on first use.
+
+        Args:
+            token (str): The ClickSign token of the tenant
+
+        Returns:
+            ClickSign: The tenant client, do not close it
+        """
+        return self.__tenant(token).client
+
+    def get_async(self, token: str) -> AsyncClickSign:
+        """The async client of a token, running in the worker threads shared by all tenants.
+
+        Args:
+            token (str): The ClickSign token of the tenant
+
+        Returns:
+            AsyncClickSign: The tenant async client, do not close it
+        """
+        tenant = self.__tenant(token)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix='ClickSignPool')
+            if tenant.async_client is None:
+                tenant.async_client = AsyncClickSign(
+                    None, click_sign=tenant.client, executor=self._executor)
+        return tenant.async_client
+
+    def __pop_idle(self) -> List[_Tenant]:
+        """Remove the idle tenants, at most every tenth of `idle_timeout`.
+        """
+        now = time.monotonic()
+        if now - self._swept_at < self.idle_timeout / 10:
+            return []
+        self._swept_at = now
+        idle = [
+            tenant_id for tenant_id, tenant in self._tenants.items()
+            if tenant.metrics.in_flight == 0
+            and now - tenant.metrics.last_used >= self.idle_timeout
+        ]
+        return [self._tenants.pop(tenant_id) for tenant_id in idle]
+
+    def __close_tenants(self, tenants: List[_Tenant]):
+        # The session is shared, closing a client only stops its watcher
+        for tenant in tenants:
+            tenant.client.close()
+        with self._lock:
+            self.evicted += len(tenants)
+
+    def evict(self, token: str) -> bool:
+        """Drop a tenant now, Ex.: when its token is revoked.
+
+        Returns:
+            bool: `True` if the tenant was in the pool
+        """
+        with self._lock:
+            tenant = self._tenants.pop(self.tenant_id(token), None)
+        if tenant is None:
+            return False
+        self.__close_tenants([tenant])
+        return True
+
+    def evict_idle(self) -> int:
+        """Drop the tenants idle for `idle_timeout` seconds now.
+
+        Returns:
+            int: The number of evicted tenants
+        """
+        with self._lock:
+            self._swept_at = float('-inf')
+            idle = self.__pop_idle()
+        self.__close_tenants(idle)
+        return len(idle)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Counters of every tenant in the pool, by tenant id.
+        """
+        with self._lock:
+            tenants = list(self._tenants.items())
+        return {
+            tenant_id: tenant.metrics.snapshot()
+            for tenant_id, tenant in tenants
+        }
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def close(self):
+        """Drop every tenant, stop the worker threads and close the shared connections.
+        """
+        with self._lock:
+            tenants = list(self._tenants.values())
+            self._tenants.clear()
+        self.__close_tenants(tenants)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
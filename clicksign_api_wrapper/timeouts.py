@@ -0,0 +1,142 @@
+import threading
+from collections import deque
+from typing import Dict, Tuple, Union
+
+#: A read timeout in seconds, or a (connect, read) pair.
+TimeoutSpec = Union[float, Tuple[float, float]]
+
+
+def _pair(timeout: TimeoutSpec, connect: float) -> Tuple[float, float]:
+    if isinstance(timeout, (tuple, list)):
+        return float(timeout[0]), float(timeout[1])
+    return connect, float(timeout)
+
+
+class _Latency:
+    __slots__ = ('samples', 'read', 'pending')
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)
+        self.read: float = None
+        self.pending = 0
+
+
+class EndpointTimeouts:
+    """Connect and read timeouts of each endpoint, optionally adapted to its observed latency.
+
+    Endpoints are named like the `RequestEvent.name`, Ex.: "GET documents",
+    or by url template alone, Ex.: "documents/{key}", for every method.
+
+    With `adaptive`, the read timeout of an endpoint becomes `multiplier`
+    times the `percentile` of its latest response times, between `min_read`
+    and its configured read timeout, so a quick endpoint stops waiting long
+    before a slow one when the API hangs. A read timeout counts as a
+    response at the limit in use, so an endpoint that got slower times out
+    a few times and its limit grows back towards the configured one. The
+    connect timeout is never adapted, it is short by itself.
+    """
+    def __init__(self,
+                 default: TimeoutSpec = (3.05, 10),
+                 endpoints: Dict[str, TimeoutSpec] = None,
+                 adaptive: bool = False,
+                 percentile: float = 99,
+                 multiplier: float = 3,
+                 min_read: float = 1,
+                 window: int = 200,
+                 min_samples: int = 20):
+        """Class constructor
+
+        Args:
+            default (TimeoutSpec, optional): Timeout of the endpoints not in `endpoints`. Defaults to (3.05, 10).
+            endpoints (Dict[str, TimeoutSpec], optional): Timeout by endpoint, Ex.: `{"GET documents": (3.05, 30)}`. Defaults to None.
+            adaptive (bool, optional): Adapt the read timeouts to the observed latency. Defaults to False.
+            percentile (float, optional): Latency percentile the adaptive timeout is based on, between 0 and 100. Defaults to 99.
+            multiplier (float, optional): Adaptive read timeout as a multiple of the percentile. Defaults to 3.
+            min_read (float, optional): Lowest adaptive read timeout. Defaults to 1.
+            window (int, optional): Latest response times kept per endpoint. Defaults to 200.
+            min_samples (int, optional): Responses needed before the read timeout adapts. Defaults to 20.
+        """
+        self.default = _pair(default, 3.05)
+        self.endpoints = {
+            name: _pair(timeout, self.default[0])
+            for name, timeout in (endpoints or {}).items()
+        }
+        self.adaptive = adaptive
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_read = min_read
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latency: Dict[str, _Latency] = {}
+
+    def configured(self, method: str, endpoint: str) -> Tuple[float, float]:
+        """The configured (connect, read) timeout of an endpoint.
+        """
+        timeout = self.endpoints.get(f'{method} {endpoint}')
+        if timeout is None:
+            timeout = self.endpoints.get(endpoint, self.default)
+        return timeout
+
+    def timeout(self, method: str, endpoint: str) -> Tuple[float, float]:
+        """The (connect, read) timeout to use for the next request to an endpoint.
+
+        Args:
+            method (str): The HTTP method
+            endpoint (str): The url template, Ex.: "documents/{key}"
+
+        Returns:
+            Tuple[float, float]: Seconds to connect and to wait for the response
+        """
+        connect, read = self.configured(method, endpoint)
+        if self.adaptive:
+            latency = self._latency.get(f'{method} {endpoint}')
+            if latency is not None and latency.read is not None:
+                read = min(read, latency.read)
+        return connect, read
+
+    def observe(self,
+                method: str,
+                endpoint: str,
+                duration: float,
+                timed_out: bool = False):
+        """Record the response time of a request that got a response or a read timeout.
+
+        Args:
+            method (str): The HTTP method
+            endpoint (str): The url template
+            duration (float): Seconds until the response, or until the timeout
+            timed_out (bool, optional): The request got no response before its read timeout. Defaults to False.
+        """
+        if not self.adaptive:
+            return
+        name = f'{method} {endpoint}'
+        with self._lock:
+            latency = self._latency.get(name)
+            if latency is None:
+                latency = self._latency[name] = _Latency(self.window)
+            if timed_out:
+                # The response would have taken at least the limit in use
+                duration = max(duration, self.timeout(method, endpoint)[1])
+            latency.samples.append(duration)
+            latency.pending += 1
+            # Sorting the window on every response would cost more than the
+            # request, but a timeout is rare and raises the limit at once
+            if (len(latency.samples) < self.min_samples
+                    or (latency.pending < max(1, self.window // 20)
+                        and not timed_out)):
+                return
+            latency.pending = 0
+            samples = sorted(latency.samples)
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        latency.read = max(self.min_read, samples[index] * self.multiplier)
+
+    def snapshot(self) -> Dict[str, Tuple[float, float]]:
+        """The (connect, read) timeout in use by each observed endpoint.
+        """
+        with self._lock:
+            names = list(self._latency)
+        return {
+            name: self.timeout(*name.split(' ', 1))
+            for name in names
+        }
@@ -0,0 +1,154 @@
+import base64
+import json
+import mmap
+import os
+from typing import Any, Dict, Union
+
+from .bulk import BulkReport
+
+#: Raw bytes encoded per step, a multiple of 3 so the chunks join without padding.
+CHUNK_SIZE = 3 * 64 * 1024
+
+UploadSource = Union[str, os.PathLike, bytes, bytearray, memoryview, Any]
+
+
+class Base64JSONBody:
+    """File-like JSON body that base64 encodes a file while it is being sent.
+
+    Only one chunk of the source is held in memory at a time. It has a known
+    length, so it is sent with `Content-Length`, and it can be rewound with
+    `seek(0)` to send it again.
+
+    The source can be a path, a binary file object (seekable) or any
+    bytes-like object such as an `mmap`.
+    """
+    def __init__(self,
+                 source: UploadSource,
+                 prefix: bytes,
+                 suffix: bytes,
+                 chunk_size: int = CHUNK_SIZE):
+        """Class constructor
+
+        Args:
+            source (UploadSource): The file to encode
+            prefix (bytes): JSON sent before the base64 content
+            suffix (bytes): JSON sent after the base64 content
+            chunk_size (int, optional): Raw bytes encoded at a time, rounded down to a multiple of 3. Defaults to CHUNK_SIZE.
+        """
+        self.prefix = prefix
+        self.suffix = suffix
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._owns_file = False
+        self._buffer = None
+        self._file = None
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, 'rb')
+            self._owns_file = True
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._buffer = memoryview(source).cast('B')
+        else:
+            self._file = source
+
+        if self._file is not None:
+            self._start = self._file.tell()
+            self.size = self._file.seek(0, os.SEEK_END) - self._start
+        else:
+            self._start = 0
+            self.size = len(self._buffer)
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return len(self.prefix) + -(-self.size // 3) * 4 + len(self.suffix)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if offset != 0 or whence != os.SEEK_SET:
+            raise ValueError('The body can only be rewound to the start')
+        self._sent = 0
+        self._buffer_position = 0
+        self._pending = self.prefix
+        self._pending_offset = 0
+        self._suffix_sent = False
+        if self._file is not None:
+            self._file.seek(self._start)
+        return 0
+
+    def tell(self) -> int:
+        return self._sent
+
+    def __read_raw(self) -> bytes:
+        if self._file is not None:
+            return self._file.read(self.chunk_size)
+        start = self._buffer_position
+        self._buffer_position = min(self.size, start + self.chunk_size)
+        return self._buffer[start:self._buffer_position].tobytes()
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes of the body, all the rest when `size` is negative.
+        """
+        output = []
+        wanted = size if size >= 0 else len(self) - self._sent
+        while wanted > 0:
+            if self._pending_offset >= len(self._pending):
+                raw = self.__read_raw()
+                if raw:
+                    self._pending = base64.b64encode(raw)
+                elif not self._suffix_sent:
+                    self._pending = self.suffix
+                    self._suffix_sent = True
+                else:
+                    break
+                self._pending_offset = 0
+            end = min(len(self._pending), self._pending_offset + wanted)
+            piece = self._pending[self._pending_offset:end]
+            self._pending_offset = end
+            output.append(piece)
+            wanted -= len(piece)
+        data = b''.join(output)
+        self._sent += len(data)
+        return data
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+
+def document_body(source: UploadSource,
+                  path: str,
+                  mimetype: str = 'application/pdf',
+                  chunk_size: int = CHUNK_SIZE,
+                  **options) -> Base64JSONBody:
+    """Build the streamed body of a `documents` upload.
+
+    Args:
+        source (UploadSource): The file to upload
+        path (str): The document path (folder location and file name)
+        mimetype (str, optional): The file mimetype. Defaults to 'application/pdf'.
+        chunk_size (int, optional): Raw bytes encoded at a time. Defaults to CHUNK_SIZE.
+        options: The other document fields [deadline_at, auto_close, locale, sequence_enabled, remind_interval], `None` values are not sent
+
+    Returns:
+        Base64JSONBody: The body to send
+    """
+    document: Dict[str, Any] = {'path': path}
+    document.update(
+        {name: value
+         for name, value in options.items() if value is not None})
+    fields = json.dumps(document)[1:-1]
+    prefix = ('{"document": {' + fields +
+              f', "content_base64": "data:{mimetype};base64,')
+    return Base64JSONBody(source, prefix.encode('utf-8'), b'"}}', chunk_size)
+
+
+class UploadReport(BulkReport):
+    """Per path results of a bulk upload and its throughput.
+    """
+    def __init__(self, results: Dict[str, Any], elapsed: float,
+                 bytes_sent: int):
+        super().__init__(results, elapsed)
+        self.bytes_sent = bytes_sent
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Encoded bytes sent per second.
+        """
+        return self.bytes_sent / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,296 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Iterable, List
+
+from .document import Document
+from .exceptions import NotFound
+
+FINAL_STATUSES = frozenset({'closed', 'canceled'})
+
+
+def _resolve(future: Future, document: Document = None,
+             error: Exception = None):
+    """Resolve a waiter unless it was cancelled.
+    """
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(document)
+
+
+class _Watch:
+    """The waiters of one document key and its polling schedule.
+    """
+    __slots__ = ('waiters', 'started_at', 'next_poll_at', 'document', 'error')
+
+    def __init__(self, now: float):
+        self.waiters: List[tuple] = []
+        self.started_at = now
+        self.next_poll_at = now
+        self.document: Document = None
+        self.error: Exception = None
+
+
+class DocumentWatcher:
+    """Wait for many documents to be finished or canceled with shared polling.
+
+    Concurrent waits on the same key are merged into one poll. The polling
+    interval of a key grows with the time it has been pending, between
+    `min_interval` and `max_interval`. When more than `sweep_threshold` keys
+    are due at once and the listing has fewer pages than due keys, a single
+    `iter_documents` sweep replaces the `get_document` calls. A sweep never
+    reads more pages than the requests it replaces, the keys it does not find
+    are fetched with `get_document`, and the keys that do not exist anymore
+    stop being watched.
+    """
+    def __init__(self,
+                 click_sign: 'ClickSign',
+                 min_interval: float = 2,
+                 max_interval: float = 60,
+                 backoff_factor: float = 0.1,
+                 sweep_threshold: int = 20,
+                 concurrency: int = 4,
+                 page_size: int = 20):
+        """Class constructor
+
+        Args:
+            click_sign (ClickSign): The client used to poll.
+            min_interval (float, optional): Min seconds between two polls of a key. Defaults to 2.
+            max_interval (float, optional): Max seconds between two polls of a key. Defaults to 60.
+            backoff_factor (float, optional): The interval is this fraction of the time the key has been pending. Defaults to 0.1.
+            sweep_threshold (int, optional): Due keys above which one listing sweep is used instead of a request per key. Defaults to 20.
+            concurrency (int, optional): Max number of `get_document` requests in flight. Defaults to 4.
+            page_size (int, optional): Documents per listing page, used to count the requests of a sweep. Defaults to 20.
+        """
+        self.click_sign = click_sign
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.sweep_threshold = sweep_threshold
+        self.concurrency = concurrency
+        self.page_size = page_size
+        # Documents in the listing, learnt by the sweeps that reach its end
+        self._listing_size: int = None
+        self._condition = threading.Condition()
+        self._watches: Dict[str, _Watch] = {}
+        self._thread: threading.Thread = None
+        self._stopped = False
+        self.polls = 0
+        self.sweeps = 0
+
+    def watch(self, document_key: str, timeout: float = None) -> Future:
+        """Start waiting for a document.
+
+        Args:
+            document_key (str): The key of the document to wait for
+            timeout (float, optional): Seconds to wait before giving up. Defaults to None.
+
+        Returns:
+            Future: Resolves to the finished or canceled `Document`, or raises `NotFound` if the document was deleted. At the deadline it resolves to the last `Document` seen, or raises `TimeoutError` if none was fetched.
+        """
+        future = Future()
+        now = time.monotonic()
+        deadline = now + timeout if timeout is not None else None
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError('The watcher is closed')
+            watch = self._watches.get(document_key)
+            if watch is None:
+                watch = self._watches[document_key] = _Watch(now)
+            watch.waiters.append((future, deadline))
+            future.add_done_callback(self.__on_done)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run,
+                                                name='DocumentWatcher',
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def wait(self,
+             document_keys: Iterable[str],
+             timeout: float = None) -> Dict[str, Document]:
+        """Block until every document is finished or canceled, or the timeout.
+
+        Args:
+            document_keys (Iterable[str]): The keys of the documents to wait for
+            timeout (float, optional): Seconds to wait before giving up. Defaults to None.
+
+        Raises:
+            TimeoutError: A document was never fetched before the timeout
+            NotFound: A document does not exist
+
+        Returns:
+            Dict[str, Document]: The last seen Document of each key
+        """
+        futures = {key: self.watch(key, timeout) for key in document_keys}
+        return {key: future.result() for key, future in futures.items()}
+
+    async def wait_async(self,
+                         document_keys: Iterable[str],
+                         timeout: float = None) -> Dict[str, Document]:
+        """Async version of `wait`.
+        """
+        keys = list(document_keys)
+        documents = await asyncio.gather(
+            *[asyncio.wrap_future(self.watch(key, timeout)) for key in keys])
+        return dict(zip(keys, documents))
+
+    def close(self):
+        """Stop polling. Pending waits raise `TimeoutError`.
+        """
+        with self._condition:
+            self._stopped = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._condition.notify()
+        for watch in watches:
+            for future, _ in watch.waiters:
+                _resolve(future, error=TimeoutError())
+
+    def __on_done(self, future: Future):
+        if future.cancelled():
+            # Wake the poller up to stop watching the keys nobody waits for
+            with self._condition:
+                self._condition.notify()
+
+    def __interval(self, watch: _Watch, now: float) -> float:
+        pending = now - watch.started_at
+        return min(self.max_interval,
+                   max(self.min_interval, pending * self.backoff_factor))
+
+    def __expire(self, now: float) -> float:
+        """Resolve the waiters past their deadline, forget the cancelled ones
+        and stop watching the keys left without waiters.
+
+        Returns:
+            float: The next time something is due
+        """
+        next_at = float('inf')
+        for key, watch in list(self._watches.items()):
+            waiters = []
+            for future, deadline in watch.waiters:
+                if future.done():
+                    continue
+                if deadline is not None and deadline <= now:
+                    if watch.document is not None:
+                        _resolve(future, watch.document)
+                    else:
+                        _resolve(future, error=watch.error or TimeoutError())
+                else:
+                    waiters.append((future, deadline))
+                    if deadline is not None:
+                        next_at = min(next_at, deadline)
+            watch.waiters = waiters
+            if not waiters:
+                del self._watches[key]
+            else:
+                next_at = min(next_at, watch.next_poll_at)
+        return next_at
+
+    def __sweep_pages(self, keys: List[str]) -> int:
+        """Max pages a sweep may read for the due keys, `0` when polling each key is cheaper.
+        """
+        if len(keys) <= self.sweep_threshold:
+            return 0
+        if self._listing_size is not None:
+            pages = -(-self._listing_size // self.page_size)
+            if pages >= len(keys):
+                return 0
+        return len(keys) - 1
+
+    def __fetch(self, keys: List[str]) -> Dict[str, Document]:
+        """Get the current state of the due documents.
+        """
+        max_pages = self.__sweep_pages(keys)
+        if not max_pages:
+            return self.__get_many(keys)
+
+        self.sweeps += 1
+        missing = set(keys)
+        documents = {}
+        seen = 0
+        for document in self.click_sign.iter_documents():
+            seen += 1
+            if document.key in missing:
+                documents[document.key] = document
+                missing.discard(document.key)
+                if not missing:
+                    break
+            if seen >= max_pages * self.page_size:
+                # Reading further would cost more than polling each key
+                self._listing_size = max(self._listing_size or 0, seen + 1)
+                break
+        else:
+            self._listing_size = seen
+        if missing:
+            documents.update(self.__get_many(list(missing)))
+        return documents
+
+    def __get_many(self, keys: List[str]) -> Dict[str, Document]:
+        cache = getattr(self.click_sign, 'cache', None)
+
+        def get_document(key: str):
+            if cache is not None:
+                cache.invalidate('documents', key)
+            try:
+                return self.click_sign.get_document(key)
+            except Exception as error:
+                return error
+
+        self.polls += len(keys)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return dict(zip(keys, executor.map(get_document, keys)))
+
+    def __run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                next_at = self.__expire(now)
+                due = [
+                    key for key, watch in self._watches.items()
+                    if watch.next_poll_at <= now
+                ]
+                if not due:
+                    wait = None if next_at == float('inf') else next_at - now
+                    self._condition.wait(wait)
+                    continue
+
+            try:
+                documents = self.__fetch(due)
+            except Exception as error:
+                documents = dict.fromkeys(due, error)
+
+            with self._condition:
+                now = time.monotonic()
+                for key in due:
+                    watch = self._watches.get(key)
+                    if watch is None:
+                        continue
+                    document = documents.get(key)
+                    if isinstance(document, NotFound):
+                        # Deleted, it will never be finished
+                        for future, _ in watch.waiters:
+                            _resolve(future, error=document)
+                        del self._watches[key]
+                        continue
+                    if isinstance(document, Exception):
+                        watch.error = document
+                    elif document is not None:
+                        watch.document = document
+                        if document.status in FINAL_STATUSES:
+                            for future, _ in watch.waiters:
+                                _resolve(future, document)
+                            del self._watches[key]
+                            continue
+                    watch.next_poll_at = now + self.__interval(watch, now)
+                # The fetch can outlast deadlines, give those waiters the
+                # documents just fetched
+                self.__expire(now)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List
+
+from .document import Document
+from .exceptions import InvalidPayload, InvalidSignature
+from .signer import Signer
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookEvent:
+    """One event delivered by a ClickSign webhook.
+    """
+    __slots__ = ('id', 'name', 'occurred_at', 'data', 'document', 'payload')
+
+    def __init__(self, click_sign: 'ClickSign', payload: Dict, event_id: str):
+        event = payload.get('event') or {}
+        self.id = event_id
+        self.name: str = event.get('name')
+        self.occurred_at: str = event.get('occurred_at')
+        self.data: Dict = event.get('data') or {}
+        self.document = Document(click_sign, {
+            'document': payload['document']
+        }) if payload.get('document') else None
+        self.payload = payload
+
+    @property
+    def signer(self) -> Signer:
+        """The signer of the event, for signer related events like `sign`.
+        """
+        signer = self.data.get('signer')
+        if not signer:
+            return None
+        return Signer(self.document.click_sign if self.document else None,
+                      {'signer': signer})
+
+    def __repr__(self) -> str:
+        return f'WebhookEvent(name={self.name!r}, id={self.id!r})'
+
+
+class WebhookReceiver:
+    """Verify, parse, deduplicate and dispatch ClickSign webhook deliveries.
+
+    Register handlers with `on`, then pass each delivery to `handle` (or
+    `handle_async`), or mount `wsgi_app`/`asgi_app` in your web server.
+    """
+    def __init__(self,
+                 secret: str,
+                 click_sign: 'ClickSign' = None,
+                 dedup_window: float = 3600,
+                 dedup_maxsize: int = 10000):
+        """Class constructor
+
+        Args:
+            secret (str): The HMAC SHA256 secret of the webhook, provide by ClickSign
+            click_sign (ClickSign, optional): Client bound to the `Document` objects of the events. Defaults to None.
+            dedup_window (float, optional): Seconds during which a redelivered event is ignored. Defaults to 3600.
+            dedup_maxsize (int, optional): Max number of event ids remembered. Defaults to 10000.
+        """
+        self._hmac = hmac.new(bytes(secret, 'utf-8'), digestmod=hashlib.sha256)
+        self.click_sign = click_sign
+        self.dedup_window = dedup_window
+        self.dedup_maxsize = dedup_maxsize
+        self.handlers: Dict[str, List[Callable]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._seen: OrderedDict = OrderedDict()
+
+    def on(self, event_name: str = '*') -> Callable:
+        """Decorator to register a handler, sync or async, for an event name.
+
+        Args:
+            event_name (str, optional): The event name, Ex.: "sign", "auto_close", "cancel". Use "*" for every event. Defaults to '*'.
+        """
+        def register(handler: Callable) -> Callable:
+            self.handlers[event_name].append(handler)
+            return handler
+
+        return register
+
+    def verify(self, body: bytes, signature: str) -> bool:
+        """Check the `Content-Hmac` header in constant time.
+
+        Args:
+            body (bytes): The raw request body
+            signature (str): The header value, Ex.: "sha256=..."
+
+        Returns:
+            bool: `True` if the body was signed with the webhook secret
+        """
+        if not signature:
+            return False
+        digest = self._hmac.copy()
+        digest.update(body)
+        expected = 'sha256=' + digest.hexdigest()
+        return hmac.compare_digest(expected, signature.strip())
+
+    def __first_delivery(self, event_id: str) -> bool:
+        """Remember the event id and tell if it was not seen in the window.
+        """
+        now = time.monotonic()
+        with self._lock:
+            # Ids are kept in arrival order, drop the expired and the excess
+            while self._seen:
+                oldest = next(iter(self._seen.values()))
+                if (len(self._seen) < self.dedup_maxsize
+                        and now - oldest < self.dedup_window):
+                    break
+                self._seen.popitem(last=False)
+            if event_id in self._seen:
+                return False
+            self._seen[event_id] = now
+            return True
+
+    def __forget(self, event_id: str):
+        """Accept a new delivery of an event whose handlers failed.
+        """
+        with self._lock:
+            self._seen.pop(event_id, None)
+
+    def parse(self, body: bytes, signature: str) -> WebhookEvent:
+        """Verify and parse a delivery.
+
+        Args:
+            body (bytes): The raw request body
+            signature (str): The `Content-Hmac` header value
+
+        Raises:
+            InvalidSignature: The signature does not match the body
+            InvalidPayload: The body is not a JSON object with an event
+
+        Returns:
+            WebhookEvent: The event, or `None` if it is a redelivery
+        """
+        if not self.verify(body, signature):
+            raise InvalidSignature()
+        try:
+            payload = json.loads(body)
+        except ValueError as error:
+            raise InvalidPayload(f'invalid JSON ({error})') from None
+        if not isinstance(payload, dict):
+            raise InvalidPayload('the JSON is not an object')
+        event = payload.get('event') or {}
+        if not isinstance(event, dict) or not isinstance(
+                payload.get('document') or {}, dict):
+            raise InvalidPayload('event and document must be objects')
+        event_id = event.get('id') or hashlib.sha256(body).hexdigest()
+        if not self.__first_delivery(event_id):
+            return None
+        return WebhookEvent(self.click_sign, payload, event_id)
+
+    def __handlers_for(self, event: WebhookEvent) -> List[Callable]:
+        return self.handlers.get(event.name, []) + self.handlers.get('*', [])
+
+    def handle(self, body: bytes, signature: str) -> WebhookEvent:
+        """Verify, parse and dispatch a delivery to the sync handlers.
+
+        Async handlers are run to completion with `asyncio.run`, use
+        `handle_async` inside an event loop. When a handler raises, the event
+        is not remembered, so the redelivery by ClickSign is dispatched again.
+
+        Args:
+            body (bytes): The raw request body
+            signature (str): The `Content-Hmac` header value
+
+        Raises:
+            InvalidSignature: The signature does not match the body
+            InvalidPayload: The body is not a JSON object with an event
+
+        Returns:
+            WebhookEvent: The dispatched event, or `None` if it is a redelivery
+        """
+        event = self.parse(body, signature)
+        if event is not None:
+            try:
+                for handler in self.__handlers_for(event):
+                    result = handler(event)
+                    if asyncio.iscoroutine(result):
+                        asyncio.run(result)
+            except Exception:
+                self.__forget(event.id)
+                raise
+        return event
+
+    async def handle_async(self, body: bytes,
+                           signature: str) -> WebhookEvent:
+        """Verify, parse and dispatch a delivery, awaiting async handlers.
+
+        Args:
+            body (bytes): The raw request body
+            signature (str): The `Content-Hmac` header value
+
+        Raises:
+            InvalidSignature: The signature does not match the body
+            InvalidPayload: The body is not a JSON object with an event
+
+        Returns:
+            WebhookEvent: The dispatched event, or `None` if it is a redelivery
+        """
+        event = self.parse(body, signature)
+        if event is not None:
+            try:
+                for handler in self.__handlers_for(event):
+                    result = handler(event)
+                    if asyncio.iscoroutine(result):
+                        await result
+            except Exception:
+                self.__forget(event.id)
+                raise
+        return event
+
+    def wsgi_app(self, environ: Dict, start_response: Callable) -> List[bytes]:
+        """WSGI application that receives the deliveries.
+        """
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        body = environ['wsgi.input'].read(length) if length else b''
+        try:
+            self.handle(body, environ.get('HTTP_CONTENT_HMAC'))
+            status = '200 OK'
+        except InvalidSignature:
+            status = '401 Unauthorized'
+        except InvalidPayload:
+            status = '400 Bad Request'
+        except Exception:
+            # A handler failed, ClickSign delivers the event again later
+            logger.exception('Webhook handler failed')
+            status = '500 Internal Server Error'
+        start_response(status, [('Content-Length', '0')])
+        return [b'']
+
+    async def asgi_app(self, scope: Dict, receive: Callable, send: Callable):
+        """ASGI application that receives the deliveries.
+        """
+        if scope['type'] != 'http':
+            return
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        signature = None
+        for name, value in scope.get('headers', []):
+            if name.lower() == b'content-hmac':
+                signature = value.decode('latin-1')
+        try:
+            await self.handle_async(b''.join(chunks), signature)
+            status = 200
+        except InvalidSignature:
+            status = 401
+        except InvalidPayload:
+            status = 400
+        except Exception:
+            # A handler failed, ClickSign delivers the event again later
+            logger.exception('Webhook handler failed')
+            status = 500
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-length', b'0')]
+        })
+        await send({'type': 'http.response.body', 'body': b''})
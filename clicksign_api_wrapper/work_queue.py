@@ -0,0 +1,474 @@
+from __future__ import annotations
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List
+
+from .batch import Batch
+from .document import Document
+from .exceptions import CircuitOpen, QueuedCallFailed
+from .idempotency import idempotency_token
+from .list_class import ListClass
+from .model import Model
+from .retry import IDEMPOTENT_METHODS, RetryPolicy, single_attempt
+from .signer import Signer
+
+
+class Queueable:
+    """How a `ClickSign` method is queued: its HTTP method, the argument that
+    orders it and how its stored result is turned back into an object.
+
+    A method with `ordering_required` has no document argument, its document
+    key must be passed to `WorkQueue.submit` as `ordering_key`.
+    """
+    __slots__ = ('http_method', 'ordering_arg', 'result', 'ordering_required')
+
+    def __init__(self,
+                 http_method: str,
+                 ordering_arg: str,
+                 result: Callable[['ClickSign', Any], Any],
+                 ordering_required: bool = False):
+        self.http_method = http_method
+        self.ordering_arg = ordering_arg
+        self.result = result
+        self.ordering_required = ordering_required
+
+
+def _document(click_sign, payload):
+    return Document(click_sign, payload)
+
+
+def _signer(click_sign, payload):
+    return Signer(click_sign, payload)
+
+
+def _list(click_sign, payload):
+    return ListClass(payload)
+
+
+def _batch(click_sign, payload):
+    return Batch(payload)
+
+
+def _value(click_sign, payload):
+    return payload
+
+
+#: The methods that can be queued, with JSON arguments and results.
+#: `sign_via_api` is left out: its arguments hold the signer secret, which
+#: must not be written to the queue file.
+QUEUEABLE = {
+    'create_new_doc_from_template': Queueable('POST', None, _document),
+    'config_doc': Queueable('PATCH', 'document_key', _document),
+    'finalize_doc': Queueable('PATCH', 'document_key', _document),
+    'cancel_doc': Queueable('PATCH', 'document_key', _document),
+    'delete_doc': Queueable('DELETE', 'document_key', _value),
+    'create_new_signer': Queueable('POST', None, _signer),
+    'add_signer_to_document': Queueable('POST', 'document_key', _list),
+    'remove_signer_from_document': Queueable('DELETE',
+                                             None,
+                                             _value,
+                                             ordering_required=True),
+    'create_new_batch': Queueable('POST', None, _batch),
+}
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS jobs ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, method TEXT NOT NULL, '
+    'args TEXT NOT NULL, ordering_key TEXT, status TEXT NOT NULL, '
+    'attempts INTEGER NOT NULL DEFAULT 0, run_at REAL NOT NULL, '
+    'lease_until REAL, result TEXT, error TEXT, '
+    'created_at REAL NOT NULL, finished_at REAL)',
+    'CREATE INDEX IF NOT EXISTS jobs_status_id ON jobs (status, id)',
+    'CREATE INDEX IF NOT EXISTS jobs_ordering_key ON jobs (ordering_key, id)',
+)
+
+# The oldest runnable job whose ordering key has no older unfinished job.
+# A running job whose lease expired was left by a dead worker and runs again.
+# The attempts include the one being claimed.
+_CLAIM = (
+    'SELECT id, method, args, attempts + 1 FROM jobs AS job '
+    "WHERE ((status = 'pending' AND run_at <= :now) "
+    "OR (status = 'running' AND lease_until < :now)) "
+    'AND (ordering_key IS NULL OR NOT EXISTS ('
+    'SELECT 1 FROM jobs AS older WHERE older.ordering_key = job.ordering_key '
+    "AND older.id < job.id AND older.status IN ('pending', 'running'))) "
+    'ORDER BY id LIMIT 1')
+
+
+class QueuedCall:
+    """Handle of a queued call, wait for its result with `result()`.
+    """
+    def __init__(self, queue: WorkQueue, job_id: int, future: Future):
+        self.queue = queue
+        self.job_id = job_id
+        self._future = future
+
+    def done(self) -> bool:
+        return self._future.done() or self.queue._resolve(self.job_id)
+
+    @property
+    def status(self) -> str:
+        """One of "pending", "running", "done" or "failed".
+        """
+        return self.queue.job(self.job_id)['status']
+
+    def result(self, timeout: float = None) -> Any:
+        """Wait for the call to run.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None.
+
+        Raises:
+            TimeoutError: The call did not run before the timeout
+            QueuedCallFailed: The call failed in a previous run of the queue
+            Exception: The error raised by the call, when it failed in this process
+
+        Returns:
+            Any: The value returned by the `ClickSign` method
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.queue.poll_interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                return self._future.result(wait)
+            except FutureTimeout:
+                # Jobs can be run by another process sharing the database
+                if self.queue._resolve(self.job_id):
+                    return self._future.result()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f'Queued call {self.job_id} did not run in {timeout}s'
+                    ) from None
+
+    def __repr__(self) -> str:
+        return f'QueuedCall({self.job_id})'
+
+
+class WorkQueue:
+    """Durable queue of `ClickSign` mutations, run by background workers.
+
+    `submit` stores the call in a SQLite file and returns at once, so the
+    ClickSign latency stays out of the caller path. Workers run the calls with
+    bounded concurrency; calls on the same document run one at a time, in
+    submit order. Transient failures (429, 5xx, connection errors) are retried
+    with backoff until `retry.max_attempts`, so an outage only delays them.
+    A call refused by an open `CircuitBreaker` waits for the circuit and keeps
+    its attempts. Each attempt sends its request once, the client `retry` is
+    not applied on top. Calls survive restarts: the ones pending or
+    interrupted are run by the next queue opened on the same file, which can
+    be shared by processes.
+
+    Each call runs under its own `idempotency_token`. Without an
+    `IdempotencyJournal` on the client, a POST or PATCH is only retried by
+    default when it was not sent (429, connection refused or timed out), as
+    one that reached ClickSign would be applied twice. With one, the
+    journaled methods are always retried and an interrupted call replays the
+    recorded response instead.
+    """
+    def __init__(self,
+                 click_sign: 'ClickSign',
+                 path: str,
+                 concurrency: int = 4,
+                 retry: RetryPolicy = None,
+                 poll_interval: float = 0.5,
+                 lease: float = 300,
+                 timeout: float = 30,
+                 start: bool = True):
+        """Class constructor
+
+        Args:
+            click_sign (ClickSign): The client that runs the calls and is bound to their results
+            path (str): The database file, created if missing
+            concurrency (int, optional): Number of worker threads, the max number of calls in flight. Defaults to 4.
+            retry (RetryPolicy, optional): Which failed calls are run again and after how long. Defaults to 20 attempts of the idempotent methods and of the ones in the client journal, with a backoff from 1 to 300 seconds.
+            poll_interval (float, optional): Seconds between checks for due calls when idle. Defaults to 0.5.
+            lease (float, optional): Seconds after which a call left running by a dead worker is run again. Defaults to 300.
+            timeout (float, optional): Seconds to wait for a lock held by another process. Defaults to 30.
+            start (bool, optional): Start the workers now, else call `start()`. Defaults to True.
+        """
+        self.click_sign = click_sign
+        self.path = path
+        self.concurrency = concurrency
+        journal = getattr(click_sign, 'journal', None)
+        self.retry = retry or RetryPolicy(
+            max_attempts=20,
+            backoff_base=1,
+            backoff_cap=300,
+            methods=(IDEMPOTENT_METHODS if journal is None else
+                     IDEMPOTENT_METHODS | journal.methods))
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._scope = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path,
+                                   timeout=timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._futures: Dict[int, Future] = {}
+        self._wakeup = threading.Condition()
+        self._stopped = threading.Event()
+        self._workers: List[threading.Thread] = []
+        if start:
+            self.start()
+
+    def __enter__(self) -> WorkQueue:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Start the worker threads.
+        """
+        if self._workers:
+            return
+        self._stopped.clear()
+        for index in range(self.concurrency):
+            worker = threading.Thread(target=self.__work,
+                                      name=f'WorkQueue-{index}',
+                                      daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def close(self):
+        """Stop the workers once their calls in flight finish, the calls not run yet stay in the file.
+        """
+        self._stopped.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        with self._lock:
+            self._db.close()
+
+    #region ### Submit ###
+    def submit(self,
+               method: str,
+               *args,
+               ordering_key: str = None,
+               **kwargs) -> QueuedCall:
+        """Queue a `ClickSign` method call.
+
+        Ex.: `queue.submit("add_signer_to_document", document_key, signer_key, SignatureAsTypes.SIGN)`
+        or `queue.submit("remove_signer_from_document", list_key, ordering_key=document_key)`
+
+        Args:
+            method (str): One of QUEUEABLE
+            args: The method arguments, JSON serializable
+            ordering_key (str, optional): The calls with the same key run one at a time, in submit order. Defaults to the document key argument of the method.
+            kwargs: The method keyword arguments, JSON serializable
+
+        Raises:
+            ValueError: The method can not be queued, or needs an `ordering_key`
+            TypeError: The arguments do not match the method or are not JSON serializable
+
+        Returns:
+            QueuedCall: The handle of the call
+        """
+        queueable = QUEUEABLE.get(method)
+        if queueable is None:
+            raise ValueError(
+                f'{method!r} can not be queued, use one of {list(QUEUEABLE)}')
+        bound = inspect.signature(getattr(self.click_sign, method)).bind(
+            *args, **kwargs)
+        if ordering_key is None and queueable.ordering_arg is not None:
+            ordering_key = bound.arguments.get(queueable.ordering_arg)
+        if ordering_key is None and queueable.ordering_required:
+            raise ValueError(
+                f'{method!r} needs the document key as ordering_key')
+        payload = json.dumps({'args': args, 'kwargs': kwargs})
+        now = time.time()
+        future = Future()
+        with self._lock:
+            job_id = self._db.execute(
+                'INSERT INTO jobs (method, args, ordering_key, status, '
+                "run_at, created_at) VALUES (?, ?, ?, 'pending', ?, ?)",
+                (method, payload, ordering_key, now, now)).lastrowid
+            self._futures[job_id] = future
+        with self._wakeup:
+            self._wakeup.notify()
+        return QueuedCall(self, job_id, future)
+
+    def call(self, job_id: int) -> QueuedCall:
+        """The handle of a call submitted before, Ex.: by a previous run of the process.
+
+        Args:
+            job_id (int): The `QueuedCall.job_id`
+
+        Raises:
+            KeyError: Unknown job id
+
+        Returns:
+            QueuedCall: The handle of the call
+        """
+        self.job(job_id)
+        with self._lock:
+            future = self._futures.setdefault(job_id, Future())
+        self._resolve(job_id)
+        return QueuedCall(self, job_id, future)
+
+    #endregion ### Submit ###
+
+    #region ### State ###
+    def job(self, job_id: int) -> Dict:
+        """The stored state of a call.
+
+        Raises:
+            KeyError: Unknown job id
+
+        Returns:
+            Dict: `{"id", "method", "status", "attempts", "error", ...}`
+        """
+        with self._lock:
+            cursor = self._db.execute('SELECT * FROM jobs WHERE id = ?',
+                                      (job_id, ))
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        if row is None:
+            raise KeyError(job_id)
+        return dict(zip(names, row))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of calls by status, Ex.: `{"pending": 10, "done": 90}`.
+        """
+        with self._lock:
+            return dict(
+                self._db.execute(
+                    'SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+
+    def purge(self, older_than: float = 86400) -> int:
+        """Delete the finished calls.
+
+        Args:
+            older_than (float, optional): Only the calls finished this many seconds ago. Defaults to 86400.
+
+        Returns:
+            int: The number of deleted calls
+        """
+        with self._lock:
+            return self._db.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') "
+                'AND finished_at < ?',
+                (time.time() - older_than, )).rowcount
+
+    def _resolve(self, job_id: int) -> bool:
+        """Complete the future of a call finished by another process.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+            row = self._db.execute(
+                'SELECT method, status, result, error FROM jobs WHERE id = ?',
+                (job_id, )).fetchone()
+        if row is None or row[1] not in ('done', 'failed'):
+            return False
+        method, status, result, error = row
+        if future is not None and not future.done():
+            if status == 'done':
+                future.set_result(QUEUEABLE[method].result(
+                    self.click_sign, json.loads(result)))
+            else:
+                future.set_exception(QueuedCallFailed(job_id, method, error))
+            with self._lock:
+                self._futures.pop(job_id, None)
+        return True
+
+    #endregion ### State ###
+
+    #region ### Workers ###
+    def __claim(self) -> tuple:
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute(_CLAIM, {'now': now}).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', lease_until = ?, "
+                        'attempts = attempts + 1 WHERE id = ?',
+                        (now + self.lease, row[0]))
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return row
+
+    def __finish(self,
+                 job_id: int,
+                 status: str,
+                 result: Any = None,
+                 error: Exception = None,
+                 run_at: float = None,
+                 attempts: int = None):
+        with self._lock:
+            self._db.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, '
+                'run_at = COALESCE(?, run_at), lease_until = NULL, '
+                'attempts = COALESCE(?, attempts), finished_at = ? '
+                'WHERE id = ?',
+                (status, None if result is None else json.dumps(result),
+                 None if error is None else f'{type(error).__name__}: {error}',
+                 run_at, attempts,
+                 None if run_at is not None else time.time(), job_id))
+            future = (self._futures.pop(job_id, None)
+                      if run_at is None else None)
+        return future
+
+    def __run(self, job_id: int, method: str, payload: str, attempts: int):
+        call = json.loads(payload)
+        try:
+            # The queue retries the call itself, a journal replays the
+            # attempts of the call that reached ClickSign
+            with single_attempt(), idempotency_token(
+                    f'work-queue:{self._scope}:{job_id}'):
+                value = getattr(self.click_sign,
+                                method)(*call['args'], **call['kwargs'])
+        except CircuitOpen as error:
+            # Nothing was sent, wait for the circuit without using an attempt
+            run_at = time.time() + max(error.retry_in, self.poll_interval)
+            self.__finish(job_id,
+                          'pending',
+                          error=error,
+                          run_at=run_at,
+                          attempts=attempts - 1)
+            return
+        except Exception as error:
+            http_method = QUEUEABLE[method].http_method
+            if (attempts < self.retry.max_attempts
+                    and self.retry.is_retryable(http_method, error)):
+                run_at = time.time() + self.retry.backoff(attempts, error)
+                self.__finish(job_id, 'pending', error=error, run_at=run_at)
+                return
+            future = self.__finish(job_id, 'failed', error=error)
+            if future is not None:
+                future.set_exception(error)
+            return
+        stored = value.metadata if isinstance(value, Model) else value
+        future = self.__finish(job_id, 'done', result=stored)
+        if future is not None:
+            future.set_result(value)
+
+    def __work(self):
+        while not self._stopped.is_set():
+            job = self.__claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            self.__run(*job)
+            # A finished call can unblock the next one of its document
+            with self._wakeup:
+                self._wakeup.notify()
+
+    #endregion ### Workers ###
@@ -15,6 +15,7 @@ LONG_DESCRIPTION = (HERE / "README.md").read_text()
 LONG_DESC_TYPE = "text/markdown"
 
 INSTALL_REQUIRES = ['requests']
+EXTRAS_REQUIRE = {'fast': ['orjson']}
 
 setup(name=PACKAGE_NAME,
       version=VERSION,
@@ -26,4 +27,5 @@ setup(name=PACKAGE_NAME,
       author_email=AUTHOR_EMAIL,
       url=URL,
       install_requires=INSTALL_REQUIRES,
-      packages=find_packages())
+      extras_require=EXTRAS_REQUIRE,
+      packages=find_packages(exclude=['tests', 'tests.*']))
@@ -0,0 +1,47 @@
+import socket
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from clicksign_api_wrapper.clicksign import ClickSign
+from clicksign_api_wrapper.retry import RetryPolicy
+
+
+@pytest.fixture
+def server():
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(server):
+    """Build clients of the stub server, closed at the end of the test.
+
+    Retries do not sleep unless the test passes its own `retry`.
+    """
+    clients = []
+
+    def make(**options) -> ClickSign:
+        options.setdefault('retry', RetryPolicy(sleep=lambda delay: None))
+        client = ClickSign('token', **options)
+        client._url = server.url
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def client(make_client) -> ClickSign:
+    return make_client()
+
+
+@pytest.fixture
+def refused_url() -> str:
+    """A base url whose connections are refused."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f'http://127.0.0.1:{port}/api/v1/'
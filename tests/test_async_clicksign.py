@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from clicksign_api_wrapper.async_clicksign import AsyncClickSign
+from clicksign_api_wrapper.cache import ClientCache
+from clicksign_api_wrapper.idempotency import (IdempotencyJournal,
+                                               idempotency_token)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_methods_mirror_the_sync_client(server, client):
+    async def main():
+        async with AsyncClickSign('token', click_sign=client) as async_client:
+            document = await async_client.get_document('doc')
+            signer = await async_client.create_new_signer('email',
+                                                          email='a@b.com')
+            return document, signer
+
+    document, signer = run(main())
+    assert document.key == 'doc'
+    assert signer.email == 'a@b.com'
+
+
+def test_iter_documents_is_an_async_iterator(server, client):
+    async def main():
+        async with AsyncClickSign('token', click_sign=client) as async_client:
+            keys = [document.key
+                    async for document in async_client.iter_documents()]
+            first = None
+            async for document in async_client.iter_documents(prefetch=True):
+                first = document.key
+                break
+            return keys, first
+
+    keys, first = run(main())
+    assert len(keys) == server.httpd.documents
+    assert first == keys[0]
+
+
+def test_bulk_operations_are_async_iterators(client):
+    async def main():
+        async with AsyncClickSign('token', click_sign=client) as async_client:
+            return {
+                key: result
+                async for key, result in async_client.finalize_docs(
+                    ['a', 'b', 'c'])
+            }
+
+    results = run(main())
+    assert {key: document.status
+            for key, document in results.items()} == dict.fromkeys(
+                'abc', 'closed')
+
+
+def test_sign_many_and_download_many(client, tmp_path):
+    async def main():
+        async with AsyncClickSign('token', click_sign=client) as async_client:
+            signed = await async_client.sign_many_via_api(['r1', 'r2'],
+                                                          'secret')
+            downloaded = await async_client.download_many(['doc'],
+                                                          str(tmp_path))
+            return signed, downloaded
+
+    signed, downloaded = run(main())
+    assert signed.results == {'r1': True, 'r2': True}
+    assert not downloaded.failed
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_client_options_are_passed_to_the_sync_client(server):
+    async_client = AsyncClickSign('token', cache=ClientCache())
+    try:
+        assert async_client.click_sign.cache is not None
+    finally:
+        async_client.close()
+    with pytest.raises(TypeError):
+        AsyncClickSign('token',
+                       click_sign=async_client.click_sign,
+                       cache=ClientCache())
+
+
+def test_idempotency_token_reaches_the_worker_threads(server, make_client):
+    client = make_client(journal=IdempotencyJournal())
+
+    async def main():
+        async with AsyncClickSign('token', click_sign=client) as async_client:
+            with idempotency_token('order-1'):
+                first = await async_client.create_new_signer('email',
+                                                             email='a@b.com')
+                second = await async_client.create_new_signer(
+                    'email', email='a@b.com')
+            return first, second
+
+    first, second = run(main())
+    assert first.key == second.key
+    assert server.mutations == 1
+
+
+def test_close_waits_for_the_calls_in_flight(server, client):
+    server.httpd.latency = 0.2
+
+    async def main():
+        async_client = AsyncClickSign('token',
+                                      click_sign=client,
+                                      max_concurrency=2)
+        calls = [
+            asyncio.ensure_future(async_client.get_document(f'doc-{index}'))
+            for index in range(6)
+        ]
+        await asyncio.sleep(0.05)
+        await asyncio.get_running_loop().run_in_executor(
+            None, async_client.close)
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await async_client.check_token()
+        return results
+
+    results = run(main())
+    cancelled = [
+        result for result in results
+        if isinstance(result, asyncio.CancelledError)
+    ]
+    # The two calls in flight finished, the queued ones were cancelled
+    assert [result.key for result in results[:2]] == ['doc-0', 'doc-1']
+    assert len(cancelled) == 4
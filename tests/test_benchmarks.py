@@ -0,0 +1,21 @@
+import json
+
+from benchmarks import suite
+
+
+def test_suite_runs_against_the_stub(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    results = suite.main([
+        '--calls', '2', '--contracts', '3', '--documents', '50',
+        '--concurrency', '2', '--output',
+        str(output)
+    ])
+    capsys.readouterr()
+
+    assert json.loads(output.read_text()) == json.loads(json.dumps(results))
+    assert results['onboarding']['failed'] == 0
+    assert results['onboarding']['contracts'] == 3
+    assert results['listing']['documents'] == 50
+    assert all(stats['count'] == 2 for stats in results['per_call'].values())
+    assert 'json' in results['serializers']
+
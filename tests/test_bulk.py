@@ -0,0 +1,103 @@
+import itertools
+import threading
+
+from clicksign_api_wrapper.bulk import (Checkpoint, DryRun, FileCheckpoint,
+                                        iter_bulk, run_bulk)
+from clicksign_api_wrapper.exceptions import NotFound
+
+
+def test_finalize_docs_yields_every_result(client, server):
+    server.start_outage('documents/missing/finish', status=404)
+    keys = ['first', 'missing', 'second']
+
+    results = dict(client.finalize_docs(keys, concurrency=2))
+    assert results['first'].status == 'closed'
+    assert results['second'].key == 'second'
+    assert isinstance(results['missing'], NotFound)
+
+
+def test_nothing_is_sent_before_iterating(client, server):
+    results = client.cancel_docs(['first'])
+    assert server.requests == 0
+    assert dict(results)['first'].status == 'canceled'
+    assert server.requests == 1
+
+
+def test_checkpoint_skips_the_keys_already_done(client, server, tmp_path):
+    path = str(tmp_path / 'checkpoint')
+    checkpoint = FileCheckpoint(path)
+    server.httpd.failures = [404]
+    results = dict(client.delete_docs(['first', 'second'],
+                                      concurrency=1,
+                                      checkpoint=checkpoint))
+    checkpoint.close()
+    assert isinstance(results['first'], NotFound)
+    assert results['second'] is True
+
+    checkpoint = FileCheckpoint(path)
+    results = dict(client.delete_docs(['first', 'second'],
+                                      checkpoint=checkpoint))
+    checkpoint.close()
+    assert results == {'first': True}
+    assert server.requests == 3
+
+
+def test_dry_run_sends_nothing(client, server):
+    checkpoint = Checkpoint()
+    checkpoint.add('done')
+
+    results = list(
+        client.config_docs(['done', 'first'],
+                           checkpoint=checkpoint,
+                           dry_run=True,
+                           locale='en-US'))
+    assert server.requests == 0
+    (key, dry_run), = results
+    assert key == 'first'
+    assert isinstance(dry_run, DryRun)
+    assert (dry_run.action, dry_run.options) == ('config', {
+        'locale': 'en-US'
+    })
+
+
+def test_config_docs(client):
+    results = dict(client.config_docs(['first', 'second'], locale='en-US'))
+    assert {document.locale for document in results.values()} == {'en-US'}
+
+
+def test_keys_are_read_lazily():
+    read = itertools.count()
+
+    def keys():
+        for key in range(1000):
+            next(read)
+            yield str(key)
+
+    results = iter_bulk(str.upper, keys(), concurrency=2)
+    next(results)
+    results.close()
+    assert next(read) <= 5
+
+
+def test_none_is_a_key_like_the_others():
+    report = run_bulk(lambda key: key is None, [None, 'key'])
+    assert report.results == {None: True, 'key': False}
+
+
+def test_concurrency_is_limited():
+    lock = threading.Lock()
+    running = []
+    peak = 0
+
+    def work(key):
+        nonlocal peak
+        with lock:
+            running.append(key)
+            peak = max(peak, len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.remove(key)
+
+    report = run_bulk(work, range(20), concurrency=3)
+    assert len(report.succeeded) == 20
+    assert peak <= 3
@@ -0,0 +1,66 @@
+import threading
+import time
+
+from clicksign_api_wrapper.cache import ClientCache, MemoryCache
+
+
+def test_documents_are_cached_until_changed(server, make_client):
+    client = make_client(cache=ClientCache())
+    client.get_document('doc')
+    client.get_document('doc')
+    assert server.requests == 1
+    client.finalize_doc('doc')
+    client.get_document('doc')
+    assert server.requests == 3
+    assert client.cache.stats()['documents'] == {'hits': 1, 'misses': 2}
+
+
+def test_memory_cache_expires_and_evicts():
+    backend = MemoryCache(maxsize=2)
+    backend.set('expired', 1, 0)
+    assert backend.get('expired') is None
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    assert backend.get('a') == 1
+    # "b" is now the least recently used
+    backend.set('c', 3, 60)
+    assert backend.get('b') is None
+    assert backend.get('a') == 1
+    assert backend.get('c') == 3
+
+
+def test_invalidation_during_the_fetch_is_not_cached():
+    cache = ClientCache()
+
+    def fetch():
+        cache.invalidate('documents', 'doc')
+        return 'old'
+
+    assert cache.get_or_fetch('documents', 'doc', fetch) == 'old'
+    assert cache.get_or_fetch('documents', 'doc', lambda: 'new') == 'new'
+
+
+def test_invalidation_while_storing_is_not_lost():
+    storing = threading.Event()
+
+    class SlowBackend(MemoryCache):
+        def set(self, key, value, ttl):
+            storing.set()
+            time.sleep(0.1)
+            super().set(key, value, ttl)
+
+    cache = ClientCache(SlowBackend())
+    fetching = threading.Thread(
+        target=cache.get_or_fetch, args=('documents', 'doc', lambda: 'old'))
+    fetching.start()
+    storing.wait(5)
+    cache.invalidate('documents', 'doc')
+    fetching.join()
+    assert cache.get_or_fetch('documents', 'doc', lambda: 'new') == 'new'
+
+
+def test_resource_invalidation_drops_every_key():
+    cache = ClientCache()
+    cache.get_or_fetch('signers', 'a', lambda: 'old')
+    cache.invalidate('signers')
+    assert cache.get_or_fetch('signers', 'a', lambda: 'new') == 'new'
@@ -0,0 +1,127 @@
+import pytest
+import requests
+
+from clicksign_api_wrapper.circuit_breaker import CircuitBreaker, CircuitState
+from clicksign_api_wrapper.exceptions import (CircuitOpen, NotFound,
+                                              ServiceUnavailable)
+from clicksign_api_wrapper.retry import RetryPolicy
+
+ENDPOINT = 'GET documents/{key}'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=2, recovery_time=10, clock=clock)
+
+
+@pytest.fixture
+def guarded(make_client, breaker):
+    return make_client(circuit_breaker=breaker,
+                       retry=RetryPolicy(max_attempts=1))
+
+
+def test_circuit_opens_and_fails_fast(guarded, breaker, server):
+    server.start_outage('documents/', status=503)
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailable):
+            guarded.get_document('doc')
+    assert breaker.state(ENDPOINT) == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpen) as raised:
+        guarded.get_document('doc')
+    assert raised.value.retry_in == 10
+    assert server.requests == 2
+    assert breaker.states()[ENDPOINT]['rejected'] == 1
+    # The other endpoints are not affected
+    guarded.check_token()
+
+
+def test_client_errors_mean_the_endpoint_is_up(guarded, breaker, server):
+    server.httpd.failures = [503, 404, 503]
+    for error in (ServiceUnavailable, NotFound, ServiceUnavailable):
+        with pytest.raises(error):
+            guarded.get_document('doc')
+    assert breaker.state(ENDPOINT) == CircuitState.CLOSED
+
+
+def test_refused_connections_open_the_circuit(make_client, breaker,
+                                              refused_url):
+    client = make_client(circuit_breaker=breaker,
+                         retry=RetryPolicy(max_attempts=1))
+    client._url = refused_url
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            client.get_document('doc')
+    assert breaker.state(ENDPOINT) == CircuitState.OPEN
+
+
+def test_probe_closes_or_opens_the_circuit_again(guarded, breaker, clock,
+                                                 server):
+    server.start_outage('documents/', status=503)
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailable):
+            guarded.get_document('doc')
+
+    clock.now = 10
+    with pytest.raises(ServiceUnavailable):
+        guarded.get_document('doc')
+    assert breaker.state(ENDPOINT) == CircuitState.OPEN
+    assert breaker.states()[ENDPOINT]['opened'] == 2
+
+    server.end_outages()
+    clock.now = 20
+    guarded.get_document('doc')
+    assert breaker.state(ENDPOINT) == CircuitState.CLOSED
+
+
+def test_half_open_lets_a_limited_number_of_probes(breaker, clock):
+    for _ in range(2):
+        breaker.record(ENDPOINT, ServiceUnavailable())
+    clock.now = 10
+
+    changed, probe = breaker.before(ENDPOINT)
+    assert changed == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before(ENDPOINT)
+    assert breaker.record(ENDPOINT, None, probe) == CircuitState.CLOSED
+
+
+def test_late_answers_do_not_change_an_open_circuit(breaker, clock):
+    _, sent_before = breaker.before(ENDPOINT)
+    for _ in range(2):
+        breaker.record(ENDPOINT, ServiceUnavailable())
+
+    # A request sent while the circuit was closed succeeds late
+    assert breaker.record(ENDPOINT, None, sent_before) is None
+    assert breaker.state(ENDPOINT) == CircuitState.OPEN
+
+    clock.now = 10
+    _, old_probe = breaker.before(ENDPOINT)
+    breaker.record(ENDPOINT, ServiceUnavailable(), old_probe)
+    clock.now = 20
+    _, probe = breaker.before(ENDPOINT)
+    # The probe of the previous opening is ignored, the current one counts
+    assert breaker.record(ENDPOINT, None, old_probe) is None
+    assert breaker.state(ENDPOINT) == CircuitState.HALF_OPEN
+    assert breaker.record(ENDPOINT, None, probe) == CircuitState.CLOSED
+
+
+def test_reset(breaker):
+    for _ in range(2):
+        breaker.record(ENDPOINT, ServiceUnavailable())
+    breaker.reset(ENDPOINT)
+    assert breaker.state(ENDPOINT) == CircuitState.CLOSED
+    assert breaker.states() == {}
@@ -0,0 +1,80 @@
+import pytest
+import requests
+
+from clicksign_api_wrapper.exceptions import (BadRequest, Forbidden, NotFound,
+                                              Unauthorized,
+                                              UnProcessableEntity)
+
+
+@pytest.fixture
+def connections(server, monkeypatch):
+    """Count the connections accepted by the stub server."""
+    accepted = []
+    process_request = server.httpd.process_request
+
+    def count(request, client_address):
+        accepted.append(client_address)
+        return process_request(request, client_address)
+
+    monkeypatch.setattr(server.httpd, 'process_request', count)
+    return accepted
+
+
+def test_requests_reuse_one_connection(client, connections):
+    for index in range(10):
+        assert client.get_document(f'doc-{index}').key == f'doc-{index}'
+    assert len(connections) == 1
+
+
+def test_keep_alive_can_be_disabled(make_client, connections):
+    client = make_client(keep_alive=False)
+    for index in range(3):
+        client.get_document(f'doc-{index}')
+    assert len(connections) == 3
+
+
+def test_shared_session_is_not_closed(make_client, monkeypatch):
+    session = requests.Session()
+    closed = []
+    monkeypatch.setattr(session, 'close', lambda: closed.append(session))
+    client = make_client(session=session)
+    client.get_document('doc')
+    client.close()
+    assert not closed
+    owner = make_client()
+    monkeypatch.setattr(owner.session, 'close',
+                        lambda: closed.append(owner.session))
+    owner.close()
+    assert closed == [owner.session]
+
+
+def test_close_closes_the_pooled_connections(make_client, connections):
+    client = make_client()
+    client.get_document('doc')
+    client.close()
+    client.session = client.new_session(1, 1, True)
+    client.get_document('doc')
+    assert len(connections) == 2
+
+
+@pytest.mark.parametrize('status, error', [(400, BadRequest),
+                                           (401, Unauthorized),
+                                           (403, Forbidden), (404, NotFound),
+                                           (422, UnProcessableEntity)])
+def test_error_statuses_raise(server, client, status, error):
+    server.start_outage('documents/doc', status=status)
+    with pytest.raises(error):
+        client.get_document('doc')
+
+
+def test_token_is_sent_in_the_query_string(server, client, monkeypatch):
+    sent = []
+    send = client.session.send
+
+    def spy(request, **kwargs):
+        sent.append(request.url)
+        return send(request, **kwargs)
+
+    monkeypatch.setattr(client.session, 'send', spy)
+    client.check_token()
+    assert sent == [f'{server.url}accounts?access_token=token']
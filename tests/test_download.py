@@ -0,0 +1,94 @@
+import hashlib
+import io
+
+import pytest
+
+from benchmarks.stub_server import file_content
+from clicksign_api_wrapper.document import Document
+from clicksign_api_wrapper.download import DownloadKinds
+from clicksign_api_wrapper.exceptions import ChecksumMismatch
+
+SIZE = 256 * 1024
+CONTENT = file_content('doc', DownloadKinds.SIGNED, SIZE)
+
+
+def test_download_to_a_path(client, tmp_path):
+    dest = tmp_path / 'doc.pdf'
+
+    result = client.download_document('doc', dest=str(dest), chunk_size=1000)
+    assert dest.read_bytes() == CONTENT
+    assert not (tmp_path / 'doc.pdf.part').exists()
+    assert result.size == SIZE
+    assert result.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert result.resumed_from == 0
+
+
+def test_download_to_a_writable_object(client):
+    dest = io.BytesIO()
+
+    client.download_document('doc', DownloadKinds.ORIGINAL, dest)
+    assert dest.getvalue() == file_content('doc', DownloadKinds.ORIGINAL,
+                                           SIZE)
+
+
+def test_partial_download_is_resumed(client, tmp_path):
+    dest = tmp_path / 'doc.pdf'
+    (tmp_path / 'doc.pdf.part').write_bytes(CONTENT[:1000])
+
+    result = client.download_document('doc', dest=dest)
+    assert result.resumed_from == 1000
+    assert dest.read_bytes() == CONTENT
+    assert result.sha256 == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_partial_download_longer_than_the_file_starts_over(client, tmp_path):
+    dest = tmp_path / 'doc.pdf'
+    (tmp_path / 'doc.pdf.part').write_bytes(CONTENT + b'extra')
+
+    result = client.download_document('doc', dest=dest)
+    assert result.resumed_from == 0
+    assert dest.read_bytes() == CONTENT
+
+
+def test_corrupted_partial_download_fails_the_checksum(client, tmp_path):
+    dest = tmp_path / 'doc.pdf'
+    (tmp_path / 'doc.pdf.part').write_bytes(b'x' * 1000)
+
+    with pytest.raises(ChecksumMismatch):
+        client.download_document('doc', dest=dest)
+    assert not dest.exists()
+    assert not (tmp_path / 'doc.pdf.part').exists()
+    # The next call downloads it again
+    assert client.download_document('doc', dest=dest).size == SIZE
+
+
+def test_expired_url_is_refreshed(client, server):
+    document = client.get_document('doc')
+    server.httpd.failures = [403]
+    requests = server.requests
+
+    dest = io.BytesIO()
+    client.download_document(document, dest=dest)
+    assert dest.getvalue() == CONTENT
+    # The failed download, the document and the download again
+    assert server.requests - requests == 3
+
+
+def test_missing_url_is_refreshed(client):
+    document = Document(client, {'document': {'key': 'doc', 'downloads': {}}})
+
+    dest = io.BytesIO()
+    client.download_document(document, dest=dest)
+    assert dest.getvalue() == CONTENT
+
+
+def test_download_many(client, tmp_path):
+    report = client.download_many(['first', 'second'],
+                                  str(tmp_path / 'files'),
+                                  concurrency=2)
+
+    assert report.failed == {}
+    for key in ('first', 'second'):
+        assert report.succeeded[key].size == SIZE
+        assert (tmp_path / 'files' / f'{key}-signed.pdf').read_bytes(
+        ) == file_content(key, DownloadKinds.SIGNED, SIZE)
@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from clicksign_api_wrapper.exceptions import UnProcessableEntity
+from clicksign_api_wrapper.idempotency import (IdempotencyJournal,
+                                               MemoryJournal, SQLiteJournal,
+                                               idempotency_token)
+
+SIGNER = dict(auths='email', email='signer@example.com')
+
+
+@pytest.fixture
+def journal() -> IdempotencyJournal:
+    return IdempotencyJournal()
+
+
+def test_request_is_replayed_under_the_same_token(make_client, server,
+                                                  journal):
+    client = make_client(journal=journal)
+
+    with idempotency_token('onboarding:1'):
+        first = client.create_new_signer(**SIGNER)
+        second = client.create_new_signer(**SIGNER)
+    with idempotency_token('onboarding:2'):
+        third = client.create_new_signer(**SIGNER)
+
+    assert second.key == first.key
+    assert third.key != first.key
+    assert server.mutations == server.requests == 2
+    assert (journal.sent, journal.replayed) == (2, 1)
+
+
+def test_nothing_is_deduplicated_without_a_token(make_client, server,
+                                                 journal):
+    client = make_client(journal=journal)
+
+    first = client.create_new_signer(**SIGNER)
+    second = client.create_new_signer(**SIGNER)
+    assert second.key != first.key
+    assert server.mutations == 2
+    assert len(journal.backend) == 0
+
+
+def test_ambiguous_failure_is_sent_again_with_the_same_key(
+        make_client, server, journal):
+    client = make_client(journal=journal, timeout=0.1)
+    server.httpd.latency = 0.3
+
+    with idempotency_token('onboarding:1'):
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.create_new_signer(**SIGNER)
+        server.httpd.latency = 0
+        client.create_new_signer(**SIGNER)
+
+    # The stub applied the first one and replayed it for the same key
+    assert server.requests == 2
+    assert server.mutations == 1
+
+
+def test_rejected_request_is_sent_again(make_client, server, journal):
+    client = make_client(journal=journal)
+    server.httpd.failures = [422]
+
+    with idempotency_token('onboarding:1'):
+        with pytest.raises(UnProcessableEntity):
+            client.create_new_signer(**SIGNER)
+        client.create_new_signer(**SIGNER)
+    assert journal.sent == 2
+    assert server.mutations == 1
+
+
+def test_concurrent_identical_requests_are_merged(make_client, server,
+                                                  journal):
+    client = make_client(journal=journal)
+    server.httpd.latency = 0.1
+
+    def create(_):
+        with idempotency_token('onboarding:1'):
+            return client.create_new_signer(**SIGNER).key
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        keys = set(executor.map(create, range(4)))
+    assert len(keys) == 1
+    assert server.requests == 1
+    assert (journal.sent, journal.replayed) == (1, 3)
+
+
+def test_sqlite_journal_survives_a_restart(make_client, server, tmp_path):
+    path = str(tmp_path / 'journal.db')
+    backend = SQLiteJournal(path)
+    client = make_client(journal=IdempotencyJournal(backend))
+    with idempotency_token('onboarding:1'):
+        first = client.create_new_signer(**SIGNER)
+    backend.close()
+
+    backend = SQLiteJournal(path)
+    client = make_client(journal=IdempotencyJournal(backend))
+    with idempotency_token('onboarding:1'):
+        assert client.create_new_signer(**SIGNER).key == first.key
+    backend.close()
+    assert server.requests == 1
+
+
+def test_expired_entries_are_sent_again(make_client, server):
+    backend = MemoryJournal()
+    client = make_client(journal=IdempotencyJournal(backend, ttl=-1))
+
+    with idempotency_token('onboarding:1'):
+        client.create_new_signer(**SIGNER)
+        client.create_new_signer(**SIGNER)
+    assert server.mutations == 2
+    assert len(backend) == 1
@@ -0,0 +1,123 @@
+import logging
+
+import pytest
+
+from clicksign_api_wrapper.cache import ClientCache
+from clicksign_api_wrapper.circuit_breaker import CircuitBreaker, CircuitState
+from clicksign_api_wrapper.exceptions import ServiceUnavailable
+from clicksign_api_wrapper.instrumentation import (Hook, LatencyRecorder,
+                                                   LoggingHook, TracingHook)
+
+
+class Recorder(Hook):
+    def __init__(self):
+        self.calls = []
+
+    def on_request_start(self, event):
+        self.calls.append(('start', event.name, event.attempt))
+
+    def on_request_end(self, event):
+        self.calls.append(('end', event.name, event.status))
+
+    def on_retry(self, event, delay):
+        self.calls.append(('retry', event.name, event.attempt))
+
+    def on_cache(self, resource, hit):
+        self.calls.append(('cache', resource, hit))
+
+    def on_circuit_change(self, endpoint, state):
+        self.calls.append(('circuit', endpoint, state))
+
+
+def test_hooks_see_every_attempt(make_client, server):
+    hook = Recorder()
+    client = make_client(hooks=[hook])
+    server.httpd.failures = [503]
+
+    client.get_document('doc')
+    assert hook.calls == [
+        ('start', 'GET documents/{key}', 1),
+        ('end', 'GET documents/{key}', 503),
+        ('retry', 'GET documents/{key}', 1),
+        ('start', 'GET documents/{key}', 2),
+        ('end', 'GET documents/{key}', 200),
+    ]
+
+
+def test_hooks_see_the_cache_lookups(make_client):
+    hook = Recorder()
+    client = make_client(hooks=[hook], cache=ClientCache())
+
+    client.get_signer('signer')
+    client.get_signer('signer')
+    assert [call for call in hook.calls if call[0] == 'cache'
+            ] == [('cache', 'signers', False), ('cache', 'signers', True)]
+
+
+def test_hooks_see_the_circuit_changes(make_client, server):
+    hook = Recorder()
+    client = make_client(hooks=[hook],
+                         circuit_breaker=CircuitBreaker(failure_threshold=1))
+    server.start_outage('documents', status=503)
+
+    with pytest.raises(ServiceUnavailable):
+        client.create_new_doc_from_template('template', 'doc.docx', {})
+    assert ('circuit', 'POST templates/{key}/documents',
+            CircuitState.OPEN) in hook.calls
+
+
+def test_latency_recorder_summary(make_client):
+    recorder = LatencyRecorder()
+    client = make_client(hooks=[recorder])
+
+    for _ in range(3):
+        client.check_token()
+    assert recorder.summary()['GET accounts']['count'] == 3
+    assert recorder.statuses['GET accounts'] == {200: 3}
+    assert recorder.percentile('GET accounts', 50) > 0
+    assert recorder.percentile('GET signers/{key}', 50) is None
+
+
+def test_logging_hook(make_client, server, caplog):
+    client = make_client(hooks=[LoggingHook()])
+    server.httpd.failures = [503]
+
+    with caplog.at_level(logging.DEBUG, logger='clicksign_api_wrapper'):
+        client.check_token()
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0].startswith('ClickSign GET accounts -> 503')
+    assert messages[1].startswith(
+        'ClickSign GET accounts attempt 1 failed (503)')
+    assert messages[2].startswith('ClickSign GET accounts -> 200')
+
+
+def test_tracing_hook_ends_a_span_per_attempt(make_client):
+    class Span:
+        def __init__(self, name, attributes):
+            self.name = name
+            self.attributes = dict(attributes)
+            self.ended = False
+
+        def set_attribute(self, key, value):
+            self.attributes[key] = value
+
+        def end(self):
+            self.ended = True
+
+    class Tracer:
+        def __init__(self):
+            self.spans = []
+
+        def start_span(self, name, attributes):
+            self.spans.append(Span(name, attributes))
+            return self.spans[-1]
+
+    tracer = Tracer()
+    client = make_client(hooks=[TracingHook(tracer)])
+
+    client.create_new_signer(auths='email', email='signer@example.com')
+    span, = tracer.spans
+    assert span.ended
+    assert span.name == 'ClickSign POST signers'
+    assert span.attributes['http.status_code'] == 201
+    assert span.attributes['http.request_content_length'] > 0
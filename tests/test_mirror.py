@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+
+from benchmarks import stub_server
+from clicksign_api_wrapper.mirror import DocumentMirror
+
+
+@pytest.fixture
+def mirror(client):
+    mirror = DocumentMirror(client, ':memory:')
+    yield mirror
+    mirror.close()
+
+
+@pytest.fixture
+def listing_without_details(monkeypatch):
+    """Make the listing omit signers and lists, like the real API does."""
+    routes = []
+    for method, pattern, func in stub_server.ROUTES:
+        if func is stub_server.list_documents:
+
+            def func(server, body, query, list_documents=func):
+                status, payload = list_documents(server, body, query)
+                for document in payload['documents']:
+                    document.pop('signers', None)
+                    document.pop('lists', None)
+                return status, payload
+
+        routes.append((method, pattern, func))
+    monkeypatch.setattr(stub_server, 'ROUTES', routes)
+
+
+def test_sync_is_incremental(server, mirror):
+    result = mirror.sync()
+    assert (result.seen, result.changed, result.removed) == (100, 100, 0)
+    assert mirror.last_synced_at is not None
+    requests = server.requests
+    result = mirror.sync()
+    assert (result.seen, result.changed, result.removed) == (100, 0, 0)
+    # Only the listing was read again
+    assert server.requests - requests == 5
+
+
+def test_sync_removes_the_documents_no_longer_listed(server, mirror):
+    mirror.sync()
+    server.httpd.documents = 60
+    assert mirror.sync().removed == 40
+    assert len(mirror.documents()) == 60
+
+
+def test_queries(mirror):
+    mirror.sync()
+    documents = mirror.documents(folder='contracts/01', status='running')
+    assert documents
+    assert {document.path.rsplit('/', 1)[0]
+            for document in documents} == {'/contracts/01'}
+    key = documents[0].key
+    assert mirror.get_document(key).key == key
+    assert mirror.get_document('missing') is None
+    signers = mirror.signers(document_key=key)
+    assert signers
+    assert mirror.documents(signer_email=signers[0].email)
+    assert len(mirror.documents(limit=3, deadline_after='2021-01-01')) == 3
+    assert not mirror.documents(deadline_before='2021-01-01')
+
+
+def test_failed_details_are_fetched_by_the_next_sync(server, mirror,
+                                                     listing_without_details):
+    server.start_outage('documents/document-0000000[0-4]$', status=500)
+    result = mirror.sync()
+    assert sorted(result.errors) == [f'document-0000000{index}'
+                                     for index in range(5)]
+    assert result.changed == 95
+    server.end_outages()
+    result = mirror.sync()
+    assert (result.changed, result.errors) == (5, {})
+    assert mirror.get_document('document-00000000').signers
+
+
+def test_refresh_raises_the_fetch_error(server, mirror):
+    server.start_outage('documents/gone', status=404)
+    with pytest.raises(Exception):
+        mirror.refresh('gone')
+    assert mirror.refresh('doc').key == 'doc'
+
+
+def test_failed_removal_is_rolled_back(server, mirror):
+    mirror.sync()
+    mirror._db.execute(
+        'CREATE TEMP TRIGGER keep BEFORE DELETE ON documents '
+        "BEGIN SELECT RAISE(ABORT, 'kept'); END")
+    server.httpd.documents = 60
+    with pytest.raises(sqlite3.IntegrityError):
+        mirror.sync()
+    assert not mirror._db.in_transaction
+    mirror._db.execute('DROP TRIGGER keep')
+    assert mirror.sync().removed == 40
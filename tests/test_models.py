@@ -0,0 +1,46 @@
+import pytest
+
+from clicksign_api_wrapper.document import Document
+from clicksign_api_wrapper.signer import Signer
+
+
+def test_fields_are_read_from_the_response(client):
+    document = client.get_document('doc')
+
+    assert not hasattr(document, '__dict__')
+    assert document.key == 'doc'
+    assert document.status == 'running'
+    assert document.to_dict()['document'] is document._data
+    # Fields without a declared `Field`
+    assert document.signers[0].documentation == '123.321.123-40'
+    with pytest.raises(AttributeError):
+        document.unknown
+
+
+def test_missing_fields_read_as_none():
+    document = Document(None, {'document': {'key': 'doc'}})
+
+    assert document.status is None
+    assert document.lists == []
+    assert repr(document) == "Document(key='doc')"
+
+
+def test_deferred_signer_is_loaded_once(client, server):
+    signer = Signer(client, signer_key='signer')
+    assert signer.is_deferred
+    assert server.requests == 0
+
+    assert signer.email == 'signer0@example.com'
+    assert signer.name == 'Signer 0'
+    assert not signer.is_deferred
+    assert server.requests == 1
+
+
+def test_partial_document_loads_its_lists(client, server):
+    document = Document(client, {'document': {'key': 'doc'}})
+
+    assert [item.signer_key for item in document.lists
+            ] == ['signer-00000000', 'signer-00000001']
+    assert [signer.key for signer in document.signers
+            ] == ['signer-00000000', 'signer-00000001']
+    assert server.requests == 1
@@ -0,0 +1,61 @@
+from clicksign_api_wrapper.exceptions import UnProcessableEntity
+from clicksign_api_wrapper.onboarding import ContractSpec, SignerSpec
+from clicksign_api_wrapper.signer import SignatureAsTypes, SignatureAuthTypes
+
+
+def contract(index: int, template_key: str = 'template') -> ContractSpec:
+    return ContractSpec(template_key,
+                        f'contracts/{index}.docx', {'name': f'Customer {index}'},
+                        [
+                            SignerSpec(SignatureAsTypes.PARTY,
+                                       auths=SignatureAuthTypes.EMAIL,
+                                       email=f'customer{index}@example.com'),
+                            SignerSpec(SignatureAsTypes.WITNESS,
+                                       signer_key='witness'),
+                        ],
+                        config={'locale': 'pt-BR'})
+
+
+def test_contracts_are_set_up(client, server):
+    report = client.onboard_contracts([contract(index) for index in range(3)],
+                                      concurrency=4)
+
+    assert report.failed == []
+    # Document, new signer, two lists and the configuration per contract
+    assert report.requests == server.requests == 15
+    for index, result in enumerate(report.results):
+        # The document as returned by the configuration
+        assert result.document.locale == 'pt-BR'
+        assert result.signers[0].email == f'customer{index}@example.com'
+        assert result.signers[1].key == 'witness'
+        assert [item.document_key for item in result.lists
+                ] == [result.document.key] * 2
+        assert result.lists[1].signer_key == 'witness'
+
+
+def test_a_failed_contract_does_not_stop_the_others(client, server):
+    server.start_outage('templates/broken/documents', status=422)
+
+    report = client.onboard_contracts(
+        [contract(0), contract(1, 'broken'),
+         contract(2)], concurrency=2)
+
+    assert [result.spec.doc_path for result in report.failed
+            ] == ['contracts/1.docx']
+    failed = report.failed[0]
+    assert isinstance(failed.error, UnProcessableEntity)
+    # Nothing that needs the document was run
+    assert failed.lists == [None, None]
+    assert len(report.succeeded) == 2
+
+
+def test_signers_of_many_documents_get_a_batch(client):
+    report = client.onboard_contracts([contract(index) for index in range(3)],
+                                      batch_signers=True)
+
+    assert list(report.batches) == ['witness']
+    batch = report.batches['witness']
+    assert batch.document_keys == [
+        result.document.key for result in report.results
+    ]
+    assert report.batch_errors == {}
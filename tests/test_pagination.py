@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+from clicksign_api_wrapper.pagination import document_filter, iter_pages
+
+
+def test_iter_documents_follows_every_page(server, client):
+    keys = [document.key for document in client.iter_documents()]
+    assert len(keys) == server.httpd.documents
+    assert len(set(keys)) == len(keys)
+
+
+def test_iter_documents_with_prefetch(server, client):
+    assert (len(list(client.iter_documents(prefetch=True))) ==
+            server.httpd.documents)
+
+
+def test_iter_documents_by_status_and_folder(client):
+    documents = list(client.iter_documents(status='running',
+                                           folder='contracts/01'))
+    assert documents
+    assert all(document.path.startswith('/contracts/01/')
+               for document in documents)
+    assert not list(client.iter_documents(status='closed'))
+
+
+def test_date_filter_uses_the_upload_date(server, client):
+    # The stub documents were uploaded at 2021-03-04T10:58:30.123-03:00
+    kept = list(client.iter_documents(
+        created_after='2020-01-01T00:00:00-03:00'))
+    assert len(kept) == server.httpd.documents
+    assert not list(client.iter_documents(
+        created_before='2021-03-04T13:58:30Z'))
+    assert len(list(client.iter_documents(
+        created_before='2021-03-04T13:58:31Z'))) == server.httpd.documents
+
+
+def test_naive_dates_are_utc():
+    uploaded = {'uploaded_at': '2021-03-04T10:58:30-03:00'}
+    assert document_filter(created_after=datetime(2020, 1, 1))(uploaded)
+    assert document_filter(created_after='2021-03-04')(uploaded)
+    assert not document_filter(
+        created_after=datetime(2021, 3, 4, 14))(uploaded)
+    assert document_filter(
+        created_before=datetime(2021, 3, 4, 14, tzinfo=timezone.utc))(uploaded)
+
+
+def test_iter_pages_stops_on_an_empty_page():
+    pages = {1: {'documents': [1]}, 2: {'documents': [2]}, 3: {'documents': []}}
+    assert [body['documents'] for body in iter_pages(pages.__getitem__)
+            ] == [[1], [2], []]
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from clicksign_api_wrapper.rate_limit import FileTokenBucket, TokenBucket
+
+
+def test_bucket_allows_a_burst_then_spreads_the_callers():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    waits = [bucket._reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_acquire_sleeps_until_the_token_is_refilled():
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_file_bucket_is_shared_by_its_instances(tmp_path):
+    path = str(tmp_path / 'bucket')
+    first = FileTokenBucket(path, rate=10, capacity=1)
+    second = FileTokenBucket(path, rate=10, capacity=1)
+
+    assert first._reserve() == 0.0
+    assert second._reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_client_waits_for_the_limiter_before_each_request(
+        make_client, server):
+    bucket = TokenBucket(rate=1000)
+    acquired = []
+    acquire = bucket.acquire
+
+    def count():
+        acquired.append(server.requests)
+        acquire()
+
+    bucket.acquire = count
+    client = make_client(rate_limiter=bucket)
+    server.httpd.failures = [503]
+
+    client.get_document('doc')
+    client.check_token()
+    # The retry waits for a token as well
+    assert acquired == [0, 1, 2]
@@ -0,0 +1,60 @@
+import pytest
+
+from clicksign_api_wrapper.document import Document
+from clicksign_api_wrapper.relations import prefetch_related
+
+
+def with_lists(client, key: str, signer_keys) -> Document:
+    """A document whose payload has its lists but not its signers."""
+    return Document(
+        client, {
+            'document': {
+                'key': key,
+                'lists': [{
+                    'document_key': key,
+                    'signer_key': signer_key
+                } for signer_key in signer_keys]
+            }
+        })
+
+
+def test_partial_documents_are_fetched_once(client, server):
+    documents = [
+        Document(client, {'document': {
+            'key': f'doc-{index}'
+        }}) for index in range(3)
+    ]
+
+    assert prefetch_related(documents + documents[:1], 'lists') == (
+        documents + documents[:1])
+    assert server.requests == 3
+    assert all(len(document.lists) == 2 for document in documents)
+    assert server.requests == 3
+
+
+def test_shared_signers_are_fetched_once(client, server):
+    documents = [
+        with_lists(client, 'first', ['ana', 'bob']),
+        with_lists(client, 'second', ['bob', 'carl']),
+    ]
+
+    prefetch_related(documents, concurrency=2)
+    assert server.requests == 3
+    assert [signer.key for signer in documents[1].signers] == ['bob', 'carl']
+    assert documents[0].signers[1] is documents[1].signers[0]
+    assert documents[0].signers[0].email == 'signer0@example.com'
+    assert server.requests == 3
+
+
+def test_documents_with_their_signers_make_no_request(client, server):
+    documents = [client.get_document('doc')]
+    requests = server.requests
+
+    prefetch_related(documents)
+    assert len(documents[0].signers) == 2
+    assert server.requests == requests
+
+
+def test_unknown_relation():
+    with pytest.raises(ValueError):
+        prefetch_related([], 'events')
@@ -0,0 +1,72 @@
+import pytest
+import requests
+from requests.exceptions import ConnectTimeout, ReadTimeout
+
+from clicksign_api_wrapper.exceptions import (ServiceUnavailable,
+                                              TooManyRequests)
+from clicksign_api_wrapper.retry import RetryPolicy, was_not_sent
+
+
+def test_refused_connection_was_not_sent(refused_url):
+    with pytest.raises(requests.ConnectionError) as raised:
+        requests.post(refused_url, timeout=1)
+    assert was_not_sent(raised.value)
+    assert RetryPolicy().is_retryable('POST', raised.value)
+
+
+def test_unsent_errors_are_retried_for_every_method():
+    policy = RetryPolicy()
+    assert policy.is_retryable('POST', ConnectTimeout())
+    assert not policy.is_retryable('POST', ReadTimeout())
+    assert not policy.is_retryable('POST', requests.ConnectionError())
+    assert policy.is_retryable('DELETE', ReadTimeout())
+    assert not RetryPolicy(retry_connection_errors=False).is_retryable(
+        'POST', ConnectTimeout())
+
+
+def test_server_errors_are_retried_for_idempotent_methods():
+    policy = RetryPolicy()
+    assert policy.is_retryable('GET', ServiceUnavailable())
+    assert not policy.is_retryable('POST', ServiceUnavailable())
+
+
+def test_get_is_retried_after_server_errors(make_client, server):
+    delays = []
+    client = make_client(retry=RetryPolicy(sleep=delays.append, jitter=False))
+    server.httpd.failures = [503, 502]
+
+    assert client.get_document('doc').key == 'doc'
+    assert server.requests == 3
+    assert delays == [0.5, 1.0]
+    assert client.retry.retries == {503: 1, 502: 1}
+
+
+def test_post_is_not_retried_after_server_errors(client, server):
+    server.httpd.failures = [503]
+
+    with pytest.raises(ServiceUnavailable):
+        client.create_new_doc_from_template('template', 'doc.docx', {})
+    assert server.requests == 1
+    assert server.mutations == 0
+
+
+def test_too_many_requests_waits_for_retry_after(make_client, server):
+    delays = []
+    client = make_client(retry=RetryPolicy(sleep=delays.append))
+    server.httpd.failures = [429]
+    server.httpd.retry_after = 2
+
+    client.create_new_doc_from_template('template', 'doc.docx', {})
+    assert delays == [2]
+    assert server.mutations == 1
+
+
+def test_attempts_are_limited(make_client, server):
+    client = make_client(
+        retry=RetryPolicy(max_attempts=2, sleep=lambda delay: None))
+    server.httpd.failures = [429, 429, 429]
+
+    with pytest.raises(TooManyRequests):
+        client.check_token()
+    assert server.requests == 2
+    assert client.retry.exhausted == {429: 1}
@@ -0,0 +1,44 @@
+import pytest
+import requests
+
+from clicksign_api_wrapper.serialization import (SERIALIZERS,
+                                                 available_serializers,
+                                                 decode_response,
+                                                 get_serializer)
+
+DATA = {'name': 'João Ñandú', 'amount': 1.5, 'items': [1, None, True]}
+
+
+@pytest.mark.parametrize('name', available_serializers())
+def test_round_trip(name):
+    serializer = get_serializer(name)
+    assert serializer.loads(serializer.dumps(DATA)) == DATA
+
+
+@pytest.mark.parametrize('name', available_serializers())
+def test_client_uses_its_serializer(make_client, name):
+    client = make_client(serializer=get_serializer(name))
+
+    document = client.create_new_doc_from_template('template', 'doc.docx',
+                                                   DATA)
+    assert document.template['data'] == DATA
+    assert client.get_document('doc').key == 'doc'
+
+
+def test_fastest_installed_is_the_default():
+    assert get_serializer().name == available_serializers()[0]
+    assert available_serializers()[-1] == 'json'
+
+
+def test_unknown_or_missing_serializers():
+    with pytest.raises(ValueError):
+        get_serializer('yaml')
+    for name in set(SERIALIZERS) - set(available_serializers()):
+        with pytest.raises(ImportError):
+            get_serializer(name)
+
+
+def test_empty_body_decodes_to_an_empty_dict():
+    resp = requests.Response()
+    resp._content = b''
+    assert decode_response(resp) == {}
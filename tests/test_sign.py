@@ -0,0 +1,58 @@
+import hashlib
+import hmac
+
+import pytest
+
+from benchmarks import stub_server
+from clicksign_api_wrapper.exceptions import UnProcessableEntity
+
+
+@pytest.fixture
+def signed(monkeypatch):
+    """Collect the bodies received by the `sign` route."""
+    bodies = []
+    routes = []
+    for method, pattern, func in stub_server.ROUTES:
+        if func is stub_server.sign:
+
+            def func(server, body, query, sign=func):
+                bodies.append(body)
+                return sign(server, body, query)
+
+        routes.append((method, pattern, func))
+    monkeypatch.setattr(stub_server, 'ROUTES', routes)
+    return bodies
+
+
+def expected_hmac(key: str, secret: str) -> str:
+    return hmac.new(secret.encode('utf-8'), key.encode('utf-8'),
+                    hashlib.sha256).hexdigest()
+
+
+def test_sign_many_sends_the_same_bodies_as_sign(client, signed):
+    keys = [f'request-{index}' for index in range(5)]
+
+    report = client.sign_many_via_api(keys, 'secret', concurrency=3)
+    assert report.succeeded == dict.fromkeys(keys, True)
+    assert report.per_second > 0
+    assert sorted(signed, key=lambda body: body['request_signature_key']) == [{
+        'request_signature_key': key,
+        'secret_hmac_sha256': expected_hmac(key, 'secret')
+    } for key in keys]
+
+    assert client.sign_via_api('request-0', 'secret')
+    assert signed[-1] == {
+        'request_signature_key': 'request-0',
+        'secret_hmac_sha256': expected_hmac('request-0', 'secret')
+    }
+
+
+def test_sign_many_reports_each_failure(client, server, signed):
+    server.httpd.failures = [422]
+
+    report = client.sign_many_via_api(['request-0', 'request-1'],
+                                      'secret',
+                                      concurrency=1)
+    assert list(report.failed) == ['request-0']
+    assert isinstance(report.failed['request-0'], UnProcessableEntity)
+    assert report.succeeded == {'request-1': True}
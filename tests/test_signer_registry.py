@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from clicksign_api_wrapper.exceptions import UnProcessableEntity
+from clicksign_api_wrapper.signer_registry import (SignerRegistry,
+                                                   SQLiteSignerStore,
+                                                   signer_fingerprint)
+
+
+def test_fingerprint_is_normalised():
+    assert signer_fingerprint(
+        'token', {
+            'email': ' Ana@Example.com ',
+            'phone_number': '(11) 98765-4321',
+            'documentation': '123.321.123-40',
+            'auths': [['sms', 'email']],
+        }) == signer_fingerprint(
+            'token', {
+                'email': 'ana@example.com',
+                'phone_number': '11987654321',
+                'documentation': '12332112340',
+                'auths': ['email', 'sms'],
+            })
+    assert signer_fingerprint('token', {'email': 'ana@example.com'
+                                        }) != signer_fingerprint(
+                                            'other',
+                                            {'email': 'ana@example.com'})
+
+
+def test_known_signers_are_reused(make_client, server):
+    registry = SignerRegistry()
+    client = make_client(signer_registry=registry)
+
+    first = client.create_new_signer(auths='email', email='ana@example.com')
+    second = client.create_new_signer(auths='email',
+                                      email=' ANA@example.com')
+    other = client.create_new_signer(auths='sms', email='ana@example.com')
+
+    assert second.key == first.key
+    assert other.key != first.key
+    assert server.requests == 2
+    assert (registry.created, registry.hits) == (2, 1)
+
+
+def test_concurrent_creates_are_merged(make_client, server):
+    client = make_client(signer_registry=SignerRegistry())
+    server.httpd.latency = 0.1
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        keys = set(
+            executor.map(
+                lambda _: client.create_new_signer(
+                    auths='email', email='ana@example.com').key, range(4)))
+    assert len(keys) == 1
+    assert server.requests == 1
+
+
+def test_failed_create_is_not_stored(make_client, server):
+    registry = SignerRegistry()
+    client = make_client(signer_registry=registry)
+    server.httpd.failures = [422]
+
+    with pytest.raises(UnProcessableEntity):
+        client.create_new_signer(auths='email', email='ana@example.com')
+    client.create_new_signer(auths='email', email='ana@example.com')
+    assert registry.created == 1
+
+
+def test_forgotten_signer_is_created_again(make_client, server):
+    registry = SignerRegistry()
+    client = make_client(signer_registry=registry)
+
+    first = client.create_new_signer(auths='email', email='ana@example.com')
+    registry.forget('token', {'auths': ['email'], 'email': 'ana@example.com'})
+    assert client.create_new_signer(auths='email',
+                                    email='ana@example.com').key != first.key
+
+
+def test_sqlite_store_survives_a_restart(make_client, server, tmp_path):
+    path = str(tmp_path / 'signers.db')
+    store = SQLiteSignerStore(path)
+    client = make_client(signer_registry=SignerRegistry(store))
+    first = client.create_new_signer(auths='email', email='ana@example.com')
+    store.close()
+
+    store = SQLiteSignerStore(path)
+    client = make_client(signer_registry=SignerRegistry(store))
+    second = client.create_new_signer(auths='email', email='ana@example.com')
+    store.close()
+    assert second.key == first.key
+    assert second.email == 'ana@example.com'
+    assert server.requests == 1
@@ -0,0 +1,76 @@
+from clicksign_api_wrapper.exceptions import InvalidRow
+from clicksign_api_wrapper.template import TemplateField, csv_rows
+
+ROW = {'name': 'Ana', 'cpf': '123.321.123-40', 'amount': 10, 'id': '7'}
+
+
+def test_fields_are_loaded_from_the_template(client, server):
+    template = client.template('template', 'contracts/{id}')
+
+    assert [field.name for field in template.fields
+            ] == ['name', 'cpf', 'amount']
+    assert server.requests == 1
+
+
+def test_create_sends_the_fields_as_strings(client):
+    template = client.template('template', 'contracts/{id}.docx')
+
+    document = template.create(ROW)
+    assert document.path == '/contracts/7.docx'
+    assert document.template['data'] == {
+        'name': 'Ana',
+        'cpf': '123.321.123-40',
+        'amount': '10'
+    }
+
+
+def test_path_can_be_a_function(client):
+    template = client.template('template',
+                               lambda row: f'{row["name"].lower()}/contract')
+    assert template.build(ROW)[0] == '/ana/contract.docx'
+
+
+def test_rules_of_the_fields(client, server):
+    template = client.template('template',
+                               'contracts/{id}',
+                               fields=[
+                                   TemplateField('name', max_length=3),
+                                   {
+                                       'name': 'cpf',
+                                       'pattern': r'\d{11}'
+                                   },
+                                   TemplateField('plan',
+                                                 choices=['basic', 'pro']),
+                                   TemplateField('note', required=False),
+                               ])
+    assert server.requests == 0
+
+    assert template.validate({
+        'name': 'Ana',
+        'cpf': '12332112340',
+        'plan': 'pro',
+        'id': 1
+    }) == {}
+    errors = template.validate({'name': 'Anabela', 'cpf': '123', 'plan': ''})
+    assert set(errors) == {'name', 'cpf', 'plan', 'path'}
+    assert errors['plan'] == 'plan is required'
+
+
+def test_render_rejects_invalid_rows_without_a_request(client, server,
+                                                       tmp_path):
+    path = tmp_path / 'contracts.csv'
+    path.write_text('id,name,cpf,amount\n'
+                    '1,Ana,123.321.123-40,10\n'
+                    '2,Bob,,20\n'
+                    '3,Carl,987.654.321-00,30\n',
+                    encoding='utf-8')
+    template = client.template('template', 'contracts/{id}')
+    requests = server.requests
+
+    results = dict(template.render(csv_rows(str(path)), concurrency=2))
+    assert sorted(results) == [0, 1, 2]
+    assert isinstance(results[1], InvalidRow)
+    assert results[1].errors == {'cpf': 'cpf is required'}
+    assert results[0].path == '/contracts/1.docx'
+    assert results[2].template['data']['name'] == 'Carl'
+    assert server.requests - requests == 2
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from clicksign_api_wrapper.retry import RetryPolicy
+from clicksign_api_wrapper.tenant_pool import ClickSignPool
+
+
+@pytest.fixture
+def make_pool(server):
+    pools = []
+
+    def make(**options) -> ClickSignPool:
+        options.setdefault('retry', RetryPolicy(sleep=lambda delay: None))
+        pools.append(ClickSignPool(**options))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+@pytest.fixture
+def tenant(server):
+    def tenant(pool: ClickSignPool, token: str):
+        client = pool.get(token)
+        client._url = server.url
+        return client
+
+    return tenant
+
+
+def test_one_client_per_token_sharing_the_session(make_pool, tenant):
+    pool = make_pool()
+    first = tenant(pool, 'first')
+
+    assert tenant(pool, 'first') is first
+    second = tenant(pool, 'second')
+    assert second is not first
+    assert second.session is first.session is pool.session
+    assert second.query_string == {'access_token': 'second'}
+    assert len(pool) == 2
+
+
+def test_caches_and_metrics_are_per_tenant(make_pool, tenant, server):
+    pool = make_pool()
+    first = tenant(pool, 'first')
+    second = tenant(pool, 'second')
+
+    first.get_document('doc')
+    first.get_document('doc')
+    second.get_document('doc')
+    assert server.requests == 2
+
+    metrics = pool.metrics()
+    first_metrics = metrics[pool.tenant_id('first')]
+    assert first_metrics['requests'] == 1
+    assert (first_metrics['cache_hits'], first_metrics['cache_misses']) == (1,
+                                                                            1)
+    assert metrics[pool.tenant_id('second')]['cache_hits'] == 0
+    assert 'first' not in metrics
+
+
+def test_errors_and_retries_are_counted(make_pool, tenant, server):
+    pool = make_pool()
+    client = tenant(pool, 'first')
+    server.httpd.failures = [503]
+
+    client.check_token()
+    metrics = pool.metrics()[pool.tenant_id('first')]
+    assert (metrics['requests'], metrics['errors'],
+            metrics['retries']) == (2, 1, 1)
+
+
+def test_least_recently_used_tenants_are_evicted(make_pool, tenant):
+    pool = make_pool(max_tenants=2)
+    first = tenant(pool, 'first')
+    tenant(pool, 'second')
+    tenant(pool, 'first')
+    tenant(pool, 'third')
+
+    assert pool.evicted == 1
+    assert set(pool.metrics()) == {
+        pool.tenant_id('first'), pool.tenant_id('third')
+    }
+    assert pool.get('first') is first
+
+
+def test_idle_tenants_are_evicted(make_pool, tenant):
+    pool = make_pool(idle_timeout=0.1)
+    tenant(pool, 'first')
+    tenant(pool, 'second')
+    time.sleep(0.1)
+
+    # Getting a tenant sweeps the idle ones
+    tenant(pool, 'second')
+    assert set(pool.metrics()) == {pool.tenant_id('second')}
+    time.sleep(0.1)
+    assert pool.evict_idle() == 1
+    assert len(pool) == 0
+    assert not pool.evict('second')
+
+
+def test_async_clients_share_the_workers(make_pool, tenant):
+    pool = make_pool(max_concurrency=2)
+    tenant(pool, 'first')
+    tenant(pool, 'second')
+
+    async def fetch():
+        return await asyncio.gather(
+            pool.get_async('first').get_document('doc'),
+            pool.get_async('second').get_document('doc'))
+
+    documents = asyncio.run(fetch())
+    assert [document.key for document in documents] == ['doc', 'doc']
+    assert pool.get_async('first') is pool.get_async('first')
@@ -0,0 +1,66 @@
+import pytest
+import requests
+
+from clicksign_api_wrapper.retry import RetryPolicy
+from clicksign_api_wrapper.timeouts import EndpointTimeouts
+
+
+def test_configured_timeouts():
+    timeouts = EndpointTimeouts(default=5,
+                                endpoints={
+                                    'GET documents': 30,
+                                    'documents/{key}': (1, 2),
+                                })
+
+    assert timeouts.timeout('POST', 'signers') == (3.05, 5.0)
+    assert timeouts.timeout('GET', 'documents') == (3.05, 30.0)
+    assert timeouts.timeout('POST', 'documents') == (3.05, 5.0)
+    assert timeouts.timeout('PATCH', 'documents/{key}') == (1.0, 2.0)
+
+
+def test_slow_endpoint_times_out(make_client, server):
+    client = make_client(
+        timeouts=EndpointTimeouts(endpoints={'GET documents/{key}': 0.1}),
+        retry=RetryPolicy(max_attempts=1))
+    server.httpd.latency = 0.3
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get_document('doc')
+    client.check_token()
+
+
+def test_adaptive_timeout_follows_the_latency(make_client):
+    timeouts = EndpointTimeouts(adaptive=True, min_read=0.5, min_samples=10)
+    client = make_client(timeouts=timeouts)
+
+    for _ in range(10):
+        client.get_document('doc')
+    assert timeouts.snapshot() == {'GET documents/{key}': (3.05, 0.5)}
+
+
+def test_timeouts_raise_the_adaptive_limit_at_once():
+    timeouts = EndpointTimeouts(default=10,
+                                adaptive=True,
+                                min_samples=10,
+                                min_read=1)
+    for _ in range(10):
+        timeouts.observe('GET', 'documents', 0.01)
+    assert timeouts.timeout('GET', 'documents')[1] == 1
+
+    timeouts.observe('GET', 'documents', 0.2, timed_out=True)
+    assert timeouts.timeout('GET', 'documents')[1] == 3
+    timeouts.observe('GET', 'documents', 0.2, timed_out=True)
+    assert timeouts.timeout('GET', 'documents')[1] == 9
+    timeouts.observe('GET', 'documents', 0.2, timed_out=True)
+    # Never above the configured timeout
+    assert timeouts.timeout('GET', 'documents')[1] == 10
+
+
+def test_connection_errors_are_not_observed(make_client, refused_url):
+    timeouts = EndpointTimeouts(adaptive=True)
+    client = make_client(timeouts=timeouts, retry=RetryPolicy(max_attempts=1))
+    client._url = refused_url
+
+    with pytest.raises(requests.ConnectionError):
+        client.get_document('doc')
+    assert timeouts.snapshot() == {}
@@ -0,0 +1,89 @@
+import base64
+import io
+import json
+import os
+
+import pytest
+
+from clicksign_api_wrapper.upload import document_body
+
+CONTENT = os.urandom(10_000)
+
+
+@pytest.mark.parametrize('chunk_size', [3, 100, 4096, 1 << 20])
+@pytest.mark.parametrize('read_size', [1, 7, 1000, -1])
+def test_body_is_the_json_of_the_encoded_file(chunk_size, read_size):
+    body = document_body(io.BytesIO(CONTENT),
+                         '/doc.pdf',
+                         chunk_size=chunk_size,
+                         locale='pt-BR',
+                         auto_close=None)
+
+    data = b''
+    while True:
+        piece = body.read(read_size)
+        if not piece:
+            break
+        data += piece
+    assert len(data) == len(body)
+    assert json.loads(data) == {
+        'document': {
+            'path': '/doc.pdf',
+            'locale': 'pt-BR',
+            'content_base64': 'data:application/pdf;base64,' +
+            base64.b64encode(CONTENT).decode('ascii'),
+        }
+    }
+
+
+def test_body_can_only_be_rewound():
+    body = document_body(CONTENT, '/doc.pdf')
+    first = body.read()
+    body.seek(0)
+    assert body.read() == first
+    with pytest.raises(ValueError):
+        body.seek(10)
+
+
+def test_upload_from_any_source(client, tmp_path):
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(CONTENT)
+
+    for source in (str(path), path, CONTENT, bytearray(CONTENT),
+                   io.BytesIO(CONTENT)):
+        document = client.upload_document(source, 'folder/doc.pdf')
+        assert document.path == '/folder/doc.pdf'
+        assert document.filename == 'doc.pdf'
+        assert document.size == len(CONTENT)
+
+
+def test_upload_starts_a_file_object_at_its_position(client):
+    source = io.BytesIO(b'header' + CONTENT)
+    source.read(6)
+
+    assert client.upload_document(source, '/doc.pdf').size == len(CONTENT)
+
+
+def test_retried_upload_sends_the_whole_file_again(client, server):
+    server.httpd.failures = [429]
+
+    document = client.upload_document(CONTENT, '/doc.pdf')
+    assert document.size == len(CONTENT)
+    assert server.mutations == 1
+
+
+def test_upload_many_documents(client, tmp_path):
+    report = client.upload_documents(
+        {
+            'first.pdf': CONTENT,
+            'second.pdf': CONTENT[:100],
+            'missing.pdf': str(tmp_path / 'missing.pdf'),
+        },
+        concurrency=2,
+        locale='pt-BR')
+
+    assert report.succeeded['first.pdf'].size == len(CONTENT)
+    assert report.succeeded['second.pdf'].locale == 'pt-BR'
+    assert isinstance(report.failed['missing.pdf'], FileNotFoundError)
+    assert report.bytes_sent > len(CONTENT) * 4 // 3
+    assert report.bytes_per_second > 0
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+
+from clicksign_api_wrapper.exceptions import NotFound
+from clicksign_api_wrapper.watcher import DocumentWatcher
+
+
+@pytest.fixture
+def watcher(client):
+    watcher = DocumentWatcher(client, min_interval=0.05, max_interval=0.05)
+    yield watcher
+    watcher.close()
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_concurrent_waits_share_one_poll(server, watcher):
+    first = watcher.watch('doc', timeout=0.3)
+    second = watcher.watch('doc', timeout=0.3)
+    assert first.result(5).key == second.result(5).key == 'doc'
+    # Polled every 50ms for 300ms, once for both waits
+    assert watcher.polls <= 8
+    assert server.requests == watcher.polls
+
+
+def test_deleted_document_raises_not_found(server, watcher):
+    server.start_outage('documents/gone', status=404)
+    with pytest.raises(NotFound):
+        watcher.watch('gone').result(5)
+    wait_for(lambda: not watcher._watches)
+
+
+def test_cancelled_wait_stops_the_polls(watcher):
+    async def give_up():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(watcher.wait_async(['a', 'b']), 0.1)
+
+    asyncio.run(give_up())
+    wait_for(lambda: not watcher._watches)
+    polls = watcher.polls
+    time.sleep(0.2)
+    assert watcher.polls == polls
+
+
+def test_deadline_during_a_slow_poll_gets_the_fetched_document(
+        server, watcher):
+    server.httpd.latency = 0.3
+    start = time.monotonic()
+    document = watcher.watch('doc', timeout=0.1).result(5)
+    assert document.key == 'doc'
+    assert time.monotonic() - start < 1
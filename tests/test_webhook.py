@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import logging
+
+import pytest
+
+from clicksign_api_wrapper.exceptions import InvalidPayload, InvalidSignature
+from clicksign_api_wrapper.webhook import WebhookReceiver
+
+SECRET = 'webhook-secret'
+
+
+def sign(body: bytes) -> str:
+    return 'sha256=' + hmac.new(SECRET.encode('utf-8'), body,
+                                hashlib.sha256).hexdigest()
+
+
+def delivery(event_id: str = 'event-1', name: str = 'sign') -> bytes:
+    return json.dumps({
+        'event': {
+            'id': event_id,
+            'name': name,
+            'data': {
+                'signer': {
+                    'key': 'signer-1',
+                    'email': 'a@b.com'
+                }
+            }
+        },
+        'document': {
+            'key': 'doc',
+            'status': 'running'
+        }
+    }).encode('utf-8')
+
+
+def call_wsgi(receiver: WebhookReceiver, body: bytes, signature: str) -> str:
+    statuses = []
+    environ = {
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'HTTP_CONTENT_HMAC': signature,
+    }
+    receiver.wsgi_app(environ, lambda status, headers: statuses.append(status))
+    return statuses[0]
+
+
+def call_asgi(receiver: WebhookReceiver, body: bytes, signature: str) -> int:
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'headers': [(b'content-hmac', signature.encode('latin-1'))]
+    }
+    asyncio.run(receiver.asgi_app(scope, receive, send))
+    return sent[0]['status']
+
+
+def test_dispatches_by_event_name_once():
+    receiver = WebhookReceiver(SECRET)
+    received = []
+    receiver.on('sign')(lambda event: received.append(
+        (event.name, event.document.key, event.signer.email)))
+    receiver.on('cancel')(lambda event: received.append('cancel'))
+    body = delivery()
+    assert receiver.handle(body, sign(body)).id == 'event-1'
+    # A redelivery is ignored
+    assert receiver.handle(body, sign(body)) is None
+    assert received == [('sign', 'doc', 'a@b.com')]
+
+
+def test_rejects_a_bad_signature():
+    receiver = WebhookReceiver(SECRET)
+    body = delivery()
+    with pytest.raises(InvalidSignature):
+        receiver.handle(body, sign(body + b' '))
+    with pytest.raises(InvalidSignature):
+        receiver.handle(body, None)
+
+
+@pytest.mark.parametrize('body', [b'not json', b'[1, 2]', b'{"event": 1}'])
+def test_rejects_a_body_that_is_not_an_event(body):
+    with pytest.raises(InvalidPayload):
+        WebhookReceiver(SECRET).handle(body, sign(body))
+
+
+def test_failed_handler_lets_the_redelivery_through():
+    receiver = WebhookReceiver(SECRET)
+    calls = []
+
+    @receiver.on()
+    def handler(event):
+        calls.append(event.id)
+        if len(calls) == 1:
+            raise RuntimeError('database down')
+
+    body = delivery()
+    with pytest.raises(RuntimeError):
+        receiver.handle(body, sign(body))
+    assert receiver.handle(body, sign(body)) is not None
+    assert calls == ['event-1', 'event-1']
+
+
+def test_async_handlers():
+    receiver = WebhookReceiver(SECRET)
+    received = []
+
+    @receiver.on('sign')
+    async def handler(event):
+        received.append(event.id)
+
+    body = delivery()
+    asyncio.run(receiver.handle_async(body, sign(body)))
+    receiver.handle(delivery('event-2'), sign(delivery('event-2')))
+    assert received == ['event-1', 'event-2']
+
+
+@pytest.mark.parametrize('call, ok, unauthorized, bad_request, failed', [
+    (call_wsgi, '200 OK', '401 Unauthorized', '400 Bad Request',
+     '500 Internal Server Error'),
+    (call_asgi, 200, 401, 400, 500),
+])
+def test_apps_answer_statuses(call, ok, unauthorized, bad_request, failed,
+                              caplog):
+    receiver = WebhookReceiver(SECRET)
+
+    @receiver.on('cancel')
+    def handler(event):
+        raise ValueError('handler bug')
+
+    body = delivery()
+    assert call(receiver, body, sign(body)) == ok
+    assert call(receiver, body, 'sha256=bad') == unauthorized
+    assert call(receiver, b'[]', sign(b'[]')) == bad_request
+    body = delivery('event-2', 'cancel')
+    with caplog.at_level(logging.ERROR, 'clicksign_api_wrapper.webhook'):
+        assert call(receiver, body, sign(body)) == failed
+    # The traceback of the handler is logged
+    [record] = caplog.records
+    assert record.exc_info[0] is ValueError
@@ -0,0 +1,154 @@
+import time
+
+import pytest
+
+from clicksign_api_wrapper.circuit_breaker import CircuitBreaker
+from clicksign_api_wrapper.document import Document
+from clicksign_api_wrapper.exceptions import (CircuitOpen, QueuedCallFailed,
+                                              ServiceUnavailable,
+                                              UnknownServerError)
+from clicksign_api_wrapper.idempotency import IdempotencyJournal
+from clicksign_api_wrapper.instrumentation import Hook
+from clicksign_api_wrapper.retry import RetryPolicy
+from clicksign_api_wrapper.work_queue import WorkQueue
+
+
+def test_job_waits_for_an_open_circuit(server, make_client, tmp_path):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0.3)
+    client = make_client(circuit_breaker=breaker)
+    server.start_outage('documents/', status=500)
+    with pytest.raises((UnknownServerError, CircuitOpen)):
+        client.delete_doc('doc')
+    assert breaker.state('DELETE documents/{key}') == 'open'
+    server.end_outages()
+
+    with WorkQueue(client,
+                   str(tmp_path / 'queue.db'),
+                   retry=RetryPolicy(max_attempts=1),
+                   poll_interval=0.05) as queue:
+        call = queue.submit('delete_doc', 'doc')
+        assert call.result(5) is True
+        job = queue.job(call.job_id)
+    assert job['status'] == 'done'
+    assert job['attempts'] == 1
+    assert breaker.state('DELETE documents/{key}') == 'closed'
+
+
+def test_sign_via_api_is_not_queueable(client, tmp_path):
+    with WorkQueue(client, str(tmp_path / 'queue.db')) as queue:
+        with pytest.raises(ValueError):
+            queue.submit('sign_via_api', 'secret', 'request')
+        assert queue.counts() == {}
+
+
+def test_post_retried_when_it_was_not_sent(server, client, refused_url,
+                                           tmp_path):
+    client._url = refused_url
+    retry = RetryPolicy(max_attempts=5, backoff_base=0.05, jitter=False)
+    with WorkQueue(client, str(tmp_path / 'queue.db'), retry=retry,
+                   poll_interval=0.05) as queue:
+        call = queue.submit('create_new_signer', 'email', email='a@b.com')
+        while queue.job(call.job_id)['attempts'] == 0:
+            time.sleep(0.01)
+        client._url = server.url
+        signer = call.result(5)
+    assert signer.email == 'a@b.com'
+    assert server.mutations == 1
+
+
+FAST_RETRY = RetryPolicy(backoff_base=0.01, jitter=False)
+
+
+def test_calls_survive_a_restart(client, server, tmp_path):
+    path = str(tmp_path / 'queue.db')
+    with WorkQueue(client, path, start=False) as queue:
+        job_id = queue.submit('finalize_doc', 'doc').job_id
+        assert queue.counts() == {'pending': 1}
+    assert server.requests == 0
+
+    with WorkQueue(client, path, poll_interval=0.05) as queue:
+        document = queue.call(job_id).result(5)
+    assert isinstance(document, Document)
+    assert document.status == 'closed'
+
+    # The result is rebuilt from the file by the next run
+    with WorkQueue(client, path, start=False) as queue:
+        assert queue.call(job_id).result(0).key == 'doc'
+        assert queue.purge(older_than=0) == 1
+
+
+def test_calls_of_a_document_run_in_submit_order(make_client, server,
+                                                 tmp_path):
+    class Paths(Hook):
+        def __init__(self):
+            self.paths = []
+
+        def on_request_start(self, event):
+            self.paths.append(event.url.rsplit('/api/v1/', 1)[1])
+
+    hook = Paths()
+    client = make_client(hooks=[hook])
+    server.httpd.latency = 0.02
+    with WorkQueue(client, str(tmp_path / 'queue.db'),
+                   concurrency=4) as queue:
+        calls = [
+            queue.submit('config_doc', 'doc', locale='en-US'),
+            queue.submit('finalize_doc', 'doc'),
+            queue.submit('delete_doc', 'doc'),
+        ]
+        for call in calls:
+            call.result(5)
+        assert [call.status for call in calls] == ['done'] * 3
+    assert hook.paths == ['documents/doc', 'documents/doc/finish',
+                          'documents/doc']
+
+
+def test_idempotent_calls_are_retried(client, server, tmp_path):
+    server.httpd.failures = [503]
+    with WorkQueue(client, str(tmp_path / 'queue.db'), retry=FAST_RETRY,
+                   poll_interval=0.05) as queue:
+        call = queue.submit('delete_doc', 'doc')
+        assert call.result(5) is True
+        assert queue.job(call.job_id)['attempts'] == 2
+    assert server.requests == 2
+
+
+def test_sent_post_is_not_retried_without_a_journal(client, server,
+                                                    tmp_path):
+    path = str(tmp_path / 'queue.db')
+    server.httpd.failures = [503]
+    with WorkQueue(client, path, retry=FAST_RETRY,
+                   poll_interval=0.05) as queue:
+        call = queue.submit('create_new_signer', 'email', email='a@b.com')
+        with pytest.raises(ServiceUnavailable):
+            call.result(5)
+        job = queue.job(call.job_id)
+    assert (job['status'], job['attempts']) == ('failed', 1)
+    assert server.requests == 1
+
+    with WorkQueue(client, path, start=False) as queue:
+        with pytest.raises(QueuedCallFailed):
+            queue.call(call.job_id).result(0)
+
+
+def test_journaled_post_is_retried(make_client, server, tmp_path):
+    client = make_client(journal=IdempotencyJournal())
+    server.httpd.failures = [503]
+    with WorkQueue(client, str(tmp_path / 'queue.db'),
+                   poll_interval=0.05) as queue:
+        queue.retry.backoff_base = 0.01
+        call = queue.submit('create_new_signer', 'email', email='a@b.com')
+        assert call.result(5).email == 'a@b.com'
+    assert server.mutations == 1
+
+
+def test_invalid_submits(client, tmp_path):
+    with WorkQueue(client, str(tmp_path / 'queue.db'), start=False) as queue:
+        with pytest.raises(ValueError):
+            queue.submit('remove_signer_from_document', 'list')
+        with pytest.raises(TypeError):
+            queue.submit('finalize_doc', 'doc', 'extra')
+        queue.submit('remove_signer_from_document',
+                     'list',
+                     ordering_key='doc')
+        assert queue.counts() == {'pending': 1}